@@ -196,6 +196,21 @@ class Future(six.with_metaclass(abc.ABCMeta)):
         raise NotImplementedError()
 
 
+@enum.unique
+class FutureWaitCondition(enum.Enum):
+    """The conditions upon which wait returns.
+
+  Attributes:
+    FIRST_COMPLETED: Return when any of the Futures completes or is cancelled.
+    FIRST_EXCEPTION: Return when any of the Futures completes with an
+      exception, or else when all of them have completed.
+    ALL_COMPLETED: Return when all of the Futures have completed.
+  """
+    FIRST_COMPLETED = 'first completed'
+    FIRST_EXCEPTION = 'first exception'
+    ALL_COMPLETED = 'all completed'
+
+
 ################################  gRPC Enums  ##################################
 
 
@@ -493,6 +508,35 @@ class UnaryUnaryMultiCallable(six.with_metaclass(abc.ABCMeta)):
     """
         raise NotImplementedError()
 
+    def batch(self, requests, timeout=None, metadata=None, credentials=None):
+        """Asynchronously invokes the underlying RPC once for each of requests.
+
+    Every RPC is started before this method returns.
+
+    Args:
+      requests: A sequence of request values, one for each RPC.
+      timeout: An optional duration of time in seconds to allow for all of
+        the RPCs.
+      metadata: An optional :term:`metadata` to be transmitted to the
+        service-side of each RPC.
+      credentials: An optional CallCredentials for the RPCs.
+
+    Returns:
+      An iterator that yields a pair for each RPC in the order in which the
+        RPCs terminate: the index in requests of the RPC's request and either
+        the response message of the RPC or, should the RPC terminate with
+        non-OK status, an RpcError that is also a Call for the RPC. RPCs not
+        yet terminated are cancelled when the iterator is garbage collected.
+    """
+        from grpc import _utilities  # pylint: disable=cyclic-import
+        return _utilities.completion_ordered_outcomes(
+            tuple(
+                self.future(
+                    request,
+                    timeout=timeout,
+                    metadata=metadata,
+                    credentials=credentials) for request in requests))
+
 
 class UnaryStreamMultiCallable(six.with_metaclass(abc.ABCMeta)):
     """Affords invoking a unary-stream RPC."""
@@ -743,6 +787,19 @@ class ServicerContext(six.with_metaclass(abc.ABCMeta, RpcContext)):
     """
         raise NotImplementedError()
 
+    def invocation_metadata_dict(self):
+        """Accesses the metadata from the invocation-side of the RPC by key.
+
+    Returns:
+      A dict from each key of the invocation :term:`metadata` to the value of
+        its first occurrence in the metadata. The returned dict may be shared
+        by all calls of this method and must not be modified.
+    """
+        invocation_metadata_dict = {}
+        for key, value in self.invocation_metadata():
+            invocation_metadata_dict.setdefault(key, value)
+        return invocation_metadata_dict
+
     @abc.abstractmethod
     def peer(self):
         """Identifies the peer that invoked the RPC being serviced.
@@ -838,6 +895,18 @@ class RpcMethodHandler(six.with_metaclass(abc.ABCMeta)):
       callable value that takes an iterator of request values and a
       ServicerContext object and returns an iterator of response values. Only
       non-None if request_streaming and response_streaming are both True.
+    inline: Whether unary_unary is to be called directly on the thread that
+      received the request rather than in the server's thread pool. Only
+      appropriate for business logic that completes quickly and never blocks,
+      since no other RPC of the server's completion queue is serviced while it
+      runs. Only True if both request_streaming and response_streaming are
+      False. Implementations need not define this attribute, which is taken to
+      be False when absent.
+    write_window: For methods with streaming responses, the number of
+      serialized responses that may be queued for transmission while the
+      business logic produces further responses, or None to transmit each
+      response before taking the next from the business logic. Implementations
+      need not define this attribute, which is taken to be None when absent.
   """
 
 
@@ -991,7 +1060,8 @@ class Server(six.with_metaclass(abc.ABCMeta)):
 
 def unary_unary_rpc_method_handler(behavior,
                                    request_deserializer=None,
-                                   response_serializer=None):
+                                   response_serializer=None,
+                                   inline=False):
     """Creates an RpcMethodHandler for a unary-unary RPC method.
 
   Args:
@@ -999,6 +1069,10 @@ def unary_unary_rpc_method_handler(behavior,
       a single request value and returning a single response value.
     request_deserializer: An optional request deserialization behavior.
     response_serializer: An optional response serialization behavior.
+    inline: Whether to call behavior directly on the server thread that
+      received the request rather than in the server's thread pool. This
+      avoids a thread handoff per RPC and should only be used for behaviors
+      that complete quickly and never block.
 
   Returns:
     An RpcMethodHandler for a unary-unary RPC method constructed from the given
@@ -1007,12 +1081,13 @@ def unary_unary_rpc_method_handler(behavior,
     from grpc import _utilities  # pylint: disable=cyclic-import
     return _utilities.RpcMethodHandler(False, False, request_deserializer,
                                        response_serializer, behavior, None,
-                                       None, None)
+                                       None, None, bool(inline), None)
 
 
 def unary_stream_rpc_method_handler(behavior,
                                     request_deserializer=None,
-                                    response_serializer=None):
+                                    response_serializer=None,
+                                    write_window=None):
     """Creates an RpcMethodHandler for a unary-stream RPC method.
 
   Args:
@@ -1020,15 +1095,22 @@ def unary_stream_rpc_method_handler(behavior,
       a single request value and returning an iterator of response values.
     request_deserializer: An optional request deserialization behavior.
     response_serializer: An optional response serialization behavior.
+    write_window: The number of serialized responses that may be queued for
+      transmission while behavior produces further responses, or None to
+      transmit each response before taking the next from behavior. Queued
+      responses are written with a buffer hint so that the gRPC runtime may
+      coalesce them.
 
   Returns:
     An RpcMethodHandler for a unary-stream RPC method constructed from the
       given parameters.
   """
+    if write_window is not None and write_window < 1:
+        raise ValueError('write_window must be None or positive!')
     from grpc import _utilities  # pylint: disable=cyclic-import
     return _utilities.RpcMethodHandler(False, True, request_deserializer,
                                        response_serializer, None, behavior,
-                                       None, None)
+                                       None, None, False, write_window)
 
 
 def stream_unary_rpc_method_handler(behavior,
@@ -1049,12 +1131,13 @@ def stream_unary_rpc_method_handler(behavior,
     from grpc import _utilities  # pylint: disable=cyclic-import
     return _utilities.RpcMethodHandler(True, False, request_deserializer,
                                        response_serializer, None, None,
-                                       behavior, None)
+                                       behavior, None, False, None)
 
 
 def stream_stream_rpc_method_handler(behavior,
                                      request_deserializer=None,
-                                     response_serializer=None):
+                                     response_serializer=None,
+                                     write_window=None):
     """Creates an RpcMethodHandler for a stream-stream RPC method.
 
   Args:
@@ -1063,15 +1146,63 @@ def stream_stream_rpc_method_handler(behavior,
       values.
     request_deserializer: An optional request deserialization behavior.
     response_serializer: An optional response serialization behavior.
+    write_window: The number of serialized responses that may be queued for
+      transmission while behavior produces further responses, or None to
+      transmit each response before taking the next from behavior. Queued
+      responses are written with a buffer hint so that the gRPC runtime may
+      coalesce them.
 
   Returns:
     An RpcMethodHandler for a stream-stream RPC method constructed from the
       given parameters.
   """
+    if write_window is not None and write_window < 1:
+        raise ValueError('write_window must be None or positive!')
     from grpc import _utilities  # pylint: disable=cyclic-import
     return _utilities.RpcMethodHandler(True, True, request_deserializer,
                                        response_serializer, None, None, None,
-                                       behavior)
+                                       behavior, False, write_window)
+
+
+def precompiled_metadata(metadata):
+    """Converts metadata once for transmission with any number of RPCs.
+
+  The returned value may be passed wherever :term:`metadata` is to be
+  transmitted (as the metadata of an RPC invocation or as the initial or
+  trailing metadata of an RPC being serviced) and costs much less to transmit
+  than the metadata from which it was created. It is immutable and may be
+  shared among threads.
+
+  Args:
+    metadata: The :term:`metadata` to precompile.
+
+  Returns:
+    A sequence of the given metadata's key-value pairs that is efficiently
+      transmissible.
+  """
+    from grpc import _common  # pylint: disable=cyclic-import
+    return _common.PrecompiledMetadata(metadata)
+
+
+def raw_frame_deserializer(raw_frame):
+    """A deserializer that passes messages through as opaque raw frames.
+
+  When given as the request deserializer of an RpcMethodHandler or as the
+  response deserializer of a multi-callable, received messages are passed to
+  the application as opaque raw frames wrapping the messages as they were
+  received, without the messages first being copied into byte strings. A raw
+  frame supports len() and conversion to a byte string with bytes() (str() on
+  Python 2). A raw frame given as a request or response of an RPC without a
+  serializer is transmitted without its contents being copied, which allows
+  messages to be forwarded from one RPC to another.
+
+  Args:
+    raw_frame: A raw frame.
+
+  Returns:
+    The given raw frame.
+  """
+    return raw_frame
 
 
 def method_handlers_generic_handler(service, method_handlers):
@@ -1241,22 +1372,75 @@ def channel_ready_future(channel):
     return _utilities.channel_ready_future(channel)
 
 
-def insecure_channel(target, options=None):
+def as_completed(futures, timeout=None):
+    """Iterates over Futures in the order in which they complete.
+
+  Futures already complete are yielded first. Waiting costs one wakeup per
+  completion: no polling is done and no threads are created.
+
+  Args:
+    futures: An iterable of Futures, such as the Call-Futures of RPCs.
+      Duplicates are yielded only once.
+    timeout: A duration of time in seconds, measured from the call to
+      as_completed, within which all the Futures must complete, or None to
+      wait indefinitely.
+
+  Returns:
+    An iterator that yields each of the given Futures once it has completed and
+      raises FutureTimeoutError if any of them has not completed within the
+      allotted time.
+  """
+    from grpc import _utilities  # pylint: disable=cyclic-import
+    return _utilities.as_completed(futures, timeout)
+
+
+def wait(futures, timeout=None, return_when=FutureWaitCondition.ALL_COMPLETED):
+    """Waits for Futures to complete.
+
+  Waiting costs one wakeup per completion: no polling is done and no threads
+  are created.
+
+  Args:
+    futures: An iterable of Futures, such as the Call-Futures of RPCs.
+    timeout: A duration of time in seconds to wait, or None to wait
+      indefinitely.
+    return_when: A FutureWaitCondition describing when to return.
+
+  Returns:
+    A pair of sets, the first of the given Futures that have completed and the
+      second of those that have not.
+  """
+    from grpc import _utilities  # pylint: disable=cyclic-import
+    return _utilities.wait(futures, timeout, return_when)
+
+
+def insecure_channel(target, options=None, shared_completion_queue_count=None):
     """Creates an insecure Channel to a server.
 
   Args:
     target: The target to which to connect.
     options: A sequence of string-value pairs according to which to configure
       the created channel.
+    shared_completion_queue_count: The number of process-wide completion
+      queues, each drained by its own thread and shared with every other
+      channel created with this option, across which the RPCs of the created
+      channel are spread round-robin, or None to drive the RPCs of the created
+      channel with a completion queue and thread of its own. Sharing
+      completion queues bounds the number of threads driving RPCs
+      independently of the number of channels.
 
   Returns:
     A Channel to the target through which RPCs may be conducted.
   """
     from grpc import _channel  # pylint: disable=cyclic-import
-    return _channel.Channel(target, () if options is None else options, None)
+    return _channel.Channel(target, () if options is None else options, None,
+                            shared_completion_queue_count)
 
 
-def secure_channel(target, credentials, options=None):
+def secure_channel(target,
+                   credentials,
+                   options=None,
+                   shared_completion_queue_count=None):
     """Creates a secure Channel to a server.
 
   Args:
@@ -1264,19 +1448,56 @@ def secure_channel(target, credentials, options=None):
     credentials: A ChannelCredentials instance.
     options: A sequence of string-value pairs according to which to configure
       the created channel.
+    shared_completion_queue_count: The number of process-wide completion
+      queues, each drained by its own thread and shared with every other
+      channel created with this option, across which the RPCs of the created
+      channel are spread round-robin, or None to drive the RPCs of the created
+      channel with a completion queue and thread of its own. Sharing
+      completion queues bounds the number of threads driving RPCs
+      independently of the number of channels.
 
   Returns:
     A Channel to the target through which RPCs may be conducted.
   """
     from grpc import _channel  # pylint: disable=cyclic-import
     return _channel.Channel(target, () if options is None else options,
-                            credentials._credentials)
+                            credentials._credentials,
+                            shared_completion_queue_count)
+
+
+def channel_pool(target, size, credentials=None, options=None):
+    """Creates a Channel that spreads its RPCs across a pool of channels.
+
+  Each channel of the pool has its own connection to the target, and each RPC
+  is conducted on the channel of the pool with the fewest RPCs in flight. The
+  connectivity of the returned Channel is the best connectivity of any channel
+  of the pool.
+
+  Args:
+    target: The target to which to connect.
+    size: The number of channels in the pool.
+    credentials: A ChannelCredentials instance, or None for insecure channels.
+    options: A sequence of string-value pairs according to which to configure
+      the channels of the pool.
+
+  Returns:
+    A Channel to the target through which RPCs may be conducted.
+  """
+    from grpc import _channel_pool  # pylint: disable=cyclic-import
+    if credentials is None:
+        cygrpc_credentials = None
+    else:
+        cygrpc_credentials = credentials._credentials
+    return _channel_pool.ChannelPool(target, size, () if options is None else
+                                     options, cygrpc_credentials)
 
 
 def server(thread_pool,
            handlers=None,
            options=None,
-           maximum_concurrent_rpcs=None):
+           maximum_concurrent_rpcs=None,
+           pending_request_calls=None,
+           completion_queue_count=None):
     """Creates a Server with which RPCs can be serviced.
 
   Args:
@@ -1292,6 +1513,13 @@ def server(thread_pool,
     maximum_concurrent_rpcs: The maximum number of concurrent RPCs this server
       will service before returning status RESOURCE_EXHAUSTED, or None to
       indicate no limit.
+    pending_request_calls: The number of requests for new RPCs the returned
+      Server keeps outstanding with the gRPC runtime while it is serving, or
+      None to keep a single request outstanding. Larger values allow the
+      Server to accept bursts of incoming RPCs at a higher rate.
+    completion_queue_count: The number of completion queues, each drained by
+      its own thread, across which the returned Server spreads the RPCs it
+      services, or None to use a single completion queue.
 
   Returns:
     A Server with which RPCs can be serviced.
@@ -1299,27 +1527,29 @@ def server(thread_pool,
     from grpc import _server  # pylint: disable=cyclic-import
     return _server.Server(thread_pool, () if handlers is None else handlers, ()
                           if options is None else options,
-                          maximum_concurrent_rpcs)
+                          maximum_concurrent_rpcs, pending_request_calls,
+                          completion_queue_count)
 
 
 ###################################  __all__  #################################
 
-__all__ = ('FutureTimeoutError', 'FutureCancelledError', 'Future',
-           'ChannelConnectivity', 'StatusCode', 'RpcError', 'RpcContext',
-           'Call', 'ChannelCredentials', 'CallCredentials',
-           'AuthMetadataContext', 'AuthMetadataPluginCallback',
-           'AuthMetadataPlugin', 'ServerCredentials', 'UnaryUnaryMultiCallable',
-           'UnaryStreamMultiCallable', 'StreamUnaryMultiCallable',
-           'StreamStreamMultiCallable', 'Channel', 'ServicerContext',
-           'RpcMethodHandler', 'HandlerCallDetails', 'GenericRpcHandler',
-           'ServiceRpcHandler', 'Server', 'unary_unary_rpc_method_handler',
-           'unary_stream_rpc_method_handler', 'stream_unary_rpc_method_handler',
-           'stream_stream_rpc_method_handler',
-           'method_handlers_generic_handler', 'ssl_channel_credentials',
-           'metadata_call_credentials', 'access_token_call_credentials',
-           'composite_call_credentials', 'composite_channel_credentials',
-           'ssl_server_credentials', 'channel_ready_future', 'insecure_channel',
-           'secure_channel', 'server',)
+__all__ = (
+    'FutureTimeoutError', 'FutureCancelledError', 'Future',
+    'FutureWaitCondition', 'ChannelConnectivity', 'StatusCode', 'RpcError',
+    'RpcContext', 'Call', 'ChannelCredentials', 'CallCredentials',
+    'AuthMetadataContext', 'AuthMetadataPluginCallback', 'AuthMetadataPlugin',
+    'ServerCredentials', 'UnaryUnaryMultiCallable', 'UnaryStreamMultiCallable',
+    'StreamUnaryMultiCallable', 'StreamStreamMultiCallable', 'Channel',
+    'ServicerContext', 'RpcMethodHandler', 'HandlerCallDetails',
+    'GenericRpcHandler', 'ServiceRpcHandler', 'Server',
+    'unary_unary_rpc_method_handler', 'unary_stream_rpc_method_handler',
+    'stream_unary_rpc_method_handler', 'stream_stream_rpc_method_handler',
+    'precompiled_metadata', 'raw_frame_deserializer',
+    'method_handlers_generic_handler', 'ssl_channel_credentials',
+    'metadata_call_credentials', 'access_token_call_credentials',
+    'composite_call_credentials', 'composite_channel_credentials',
+    'ssl_server_credentials', 'channel_ready_future', 'as_completed', 'wait',
+    'insecure_channel', 'secure_channel', 'channel_pool', 'server',)
 
 ############################### Extension Shims ################################
 
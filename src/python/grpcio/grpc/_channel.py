@@ -28,10 +28,12 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 """Invocation-side implementation of gRPC Python."""
 
+import collections
 import sys
 import threading
 import time
 import logging
+import weakref
 
 import grpc
 from grpc import _common
@@ -43,29 +45,49 @@ _USER_AGENT = 'grpc-python/{}'.format(_grpcio_metadata.__version__)
 
 _EMPTY_FLAGS = 0
 _INFINITE_FUTURE = cygrpc.Timespec(float('+inf'))
-
-_UNARY_UNARY_INITIAL_DUE = (cygrpc.OperationType.send_initial_metadata,
-                            cygrpc.OperationType.send_message,
-                            cygrpc.OperationType.send_close_from_client,
-                            cygrpc.OperationType.receive_initial_metadata,
-                            cygrpc.OperationType.receive_message,
-                            cygrpc.OperationType.receive_status_on_client,)
-_UNARY_STREAM_INITIAL_DUE = (cygrpc.OperationType.send_initial_metadata,
-                             cygrpc.OperationType.send_message,
-                             cygrpc.OperationType.send_close_from_client,
-                             cygrpc.OperationType.receive_initial_metadata,
-                             cygrpc.OperationType.receive_status_on_client,)
-_STREAM_UNARY_INITIAL_DUE = (cygrpc.OperationType.send_initial_metadata,
-                             cygrpc.OperationType.receive_initial_metadata,
-                             cygrpc.OperationType.receive_message,
-                             cygrpc.OperationType.receive_status_on_client,)
-_STREAM_STREAM_INITIAL_DUE = (cygrpc.OperationType.send_initial_metadata,
-                              cygrpc.OperationType.receive_initial_metadata,
-                              cygrpc.OperationType.receive_status_on_client,)
+_MAXIMUM_EVENTS_PER_POLL = 64
+
+
+def _due(*operation_types):
+    """Returns the bitmask of the events due for the given operation types."""
+    due = 0
+    for operation_type in operation_types:
+        due |= 1 << operation_type
+    return due
+
+
+_SEND_MESSAGE_DUE = _due(cygrpc.OperationType.send_message)
+_SEND_CLOSE_FROM_CLIENT_DUE = _due(cygrpc.OperationType.send_close_from_client)
+_RECEIVE_MESSAGE_DUE = _due(cygrpc.OperationType.receive_message)
+_UNARY_UNARY_INITIAL_DUE = _due(cygrpc.OperationType.send_initial_metadata,
+                                cygrpc.OperationType.send_message,
+                                cygrpc.OperationType.send_close_from_client,
+                                cygrpc.OperationType.receive_initial_metadata,
+                                cygrpc.OperationType.receive_message,
+                                cygrpc.OperationType.receive_status_on_client)
+_UNARY_STREAM_INITIAL_DUE = _due(cygrpc.OperationType.send_initial_metadata,
+                                 cygrpc.OperationType.send_message,
+                                 cygrpc.OperationType.send_close_from_client,
+                                 cygrpc.OperationType.receive_initial_metadata,
+                                 cygrpc.OperationType.receive_status_on_client)
+_STREAM_UNARY_INITIAL_DUE = _due(cygrpc.OperationType.send_initial_metadata,
+                                 cygrpc.OperationType.receive_initial_metadata,
+                                 cygrpc.OperationType.receive_message,
+                                 cygrpc.OperationType.receive_status_on_client)
+_STREAM_STREAM_INITIAL_DUE = _due(cygrpc.OperationType.send_initial_metadata,
+                                  cygrpc.OperationType.receive_initial_metadata,
+                                  cygrpc.OperationType.receive_status_on_client)
 
 _CHANNEL_SUBSCRIPTION_CALLBACK_ERROR_LOG_MESSAGE = (
     'Exception calling channel subscription callback!')
 
+_SHARED_COMPLETION_QUEUE_EVENT_EXCEPTION_LOG_MESSAGE = (
+    'Exception handling event from shared completion queue!')
+
+# Completion queues reused from one blocking unary-unary call to the next on
+# the same thread.
+_BLOCKING_COMPLETION_QUEUES = threading.local()
+
 
 def _deadline(timeout):
     if timeout is None:
@@ -112,13 +134,35 @@ def _call_error_set_RPCstate(state, call_error, metadata):
                _INTERNAL_CALL_ERROR_MESSAGE_FORMAT % call_error)
 
 
+def _take_blocking_completion_queue():
+    completion_queue = getattr(_BLOCKING_COMPLETION_QUEUES, 'completion_queue',
+                               None)
+    if completion_queue is None:
+        return cygrpc.CompletionQueue()
+    else:
+        _BLOCKING_COMPLETION_QUEUES.completion_queue = None
+        return completion_queue
+
+
+def _return_blocking_completion_queue(completion_queue):
+    """Makes a completion queue available to later calls on this thread.
+
+    Must only be called once no events remain due from the completion queue.
+    """
+    _BLOCKING_COMPLETION_QUEUES.completion_queue = completion_queue
+
+
 class _RPCState(object):
 
+    __slots__ = ('condition', 'due', 'initial_metadata', 'response',
+                 'trailing_metadata', 'code', 'details', 'cancelled',
+                 'callbacks', 'queued_requests', 'responses',)
+
     def __init__(self, due, initial_metadata, trailing_metadata, code, details):
         self.condition = threading.Condition()
-        # The cygrpc.OperationType objects representing events due from the RPC's
-        # completion queue.
-        self.due = set(due)
+        # The bitmask (as made by _due) of the cygrpc.OperationTypes of the
+        # events due from the RPC's completion queue.
+        self.due = due
         self.initial_metadata = initial_metadata
         self.response = None
         self.trailing_metadata = trailing_metadata
@@ -130,6 +174,13 @@ class _RPCState(object):
         # prior to termination of the RPC.
         self.cancelled = False
         self.callbacks = []
+        # Serialized requests awaiting transmission behind the one being sent
+        # for RPCs with a write window.
+        self.queued_requests = collections.deque()
+        # Deserialized responses received ahead of their consumption for RPCs
+        # with a read-ahead depth, the last of them None once the response
+        # stream has ended.
+        self.responses = None
 
 
 def _abort(state, code, details):
@@ -141,38 +192,80 @@ def _abort(state, code, details):
         state.trailing_metadata = _common.EMPTY_METADATA
 
 
+def _handle_received_message(state, operation, response_deserializer):
+    serialized_response = _common.received_message(operation,
+                                                   response_deserializer)
+    if serialized_response is not None:
+        response = _common.deserialize(serialized_response,
+                                       response_deserializer)
+        if response is None:
+            details = 'Exception deserializing response!'
+            _abort(state, grpc.StatusCode.INTERNAL, details)
+        else:
+            state.response = response
+
+
+def _fail_deserialization(state, call):
+    details = 'Exception deserializing response!'
+    if state.code is None:
+        call.cancel()
+        _abort(state, grpc.StatusCode.INTERNAL, details)
+    else:
+        state.code = grpc.StatusCode.INTERNAL
+        state.details = details
+    if state.responses is not None:
+        # Responses received ahead of the failed one are not to be yielded.
+        state.responses.clear()
+        state.responses.append(None)
+    state.condition.notify_all()
+
+
+def _handle_received_status(state, trailing_metadata, received_status_code,
+                            received_status_details):
+    state.trailing_metadata = trailing_metadata
+    if state.code is None:
+        code = _common.CYGRPC_STATUS_CODE_TO_STATUS_CODE.get(
+            received_status_code)
+        if code is None:
+            state.code = grpc.StatusCode.UNKNOWN
+            state.details = _unknown_code_details(received_status_code,
+                                                  received_status_details)
+        else:
+            state.code = code
+            state.details = received_status_details
+    callbacks = state.callbacks
+    state.callbacks = None
+    return callbacks
+
+
+def _handle_unary_unary_batch(batch, state, response_deserializer):
+    state.due &= ~_UNARY_UNARY_INITIAL_DUE
+    state.initial_metadata = batch.received_initial_metadata
+    _handle_received_message(state, batch, response_deserializer)
+    return _handle_received_status(state, batch.received_trailing_metadata,
+                                   batch.received_status_code,
+                                   batch.received_status_details)
+
+
 def _handle_event(event, state, response_deserializer):
+    if event.unary_unary_batch is not None:
+        return _handle_unary_unary_batch(event.unary_unary_batch, state,
+                                         response_deserializer)
     callbacks = []
     for batch_operation in event.batch_operations:
         operation_type = batch_operation.type
-        state.due.remove(operation_type)
+        state.due &= ~(1 << operation_type)
         if operation_type == cygrpc.OperationType.receive_initial_metadata:
             state.initial_metadata = batch_operation.received_metadata
         elif operation_type == cygrpc.OperationType.receive_message:
-            serialized_response = batch_operation.received_message.bytes()
-            if serialized_response is not None:
-                response = _common.deserialize(serialized_response,
-                                               response_deserializer)
-                if response is None:
-                    details = 'Exception deserializing response!'
-                    _abort(state, grpc.StatusCode.INTERNAL, details)
-                else:
-                    state.response = response
+            _handle_received_message(state, batch_operation,
+                                     response_deserializer)
         elif operation_type == cygrpc.OperationType.receive_status_on_client:
-            state.trailing_metadata = batch_operation.received_metadata
-            if state.code is None:
-                code = _common.CYGRPC_STATUS_CODE_TO_STATUS_CODE.get(
-                    batch_operation.received_status_code)
-                if code is None:
-                    state.code = grpc.StatusCode.UNKNOWN
-                    state.details = _unknown_code_details(
-                        batch_operation.received_status_code,
-                        batch_operation.received_status_details)
-                else:
-                    state.code = code
-                    state.details = batch_operation.received_status_details
-            callbacks.extend(state.callbacks)
-            state.callbacks = None
+            callbacks.extend(
+                _handle_received_status(
+                    state, batch_operation.received_metadata,
+                    batch_operation.received_status_code,
+                    batch_operation.received_status_details))
     return callbacks
 
 
@@ -190,8 +283,124 @@ def _event_handler(state, call, response_deserializer):
     return handle_event
 
 
-def _consume_request_iterator(request_iterator, state, call,
-                              request_serializer):
+def _send_queued_request(state, call):
+    serialized_request = state.queued_requests.popleft()
+    if state.queued_requests:
+        # Another request will soon follow, so this one may be buffered.
+        flags = cygrpc.WriteFlag.buffer_hint
+    else:
+        flags = _EMPTY_FLAGS
+    operations = (cygrpc.operation_send_message(serialized_request, flags),)
+    call.start_client_batch(
+        cygrpc.Operations(operations), _send_queued_request_handler(state,
+                                                                    call))
+    state.due |= _SEND_MESSAGE_DUE
+
+
+def _send_queued_request_handler(state, call):
+
+    def handle_event(event):
+        with state.condition:
+            _handle_event(event, state, None)
+            state.condition.notify_all()
+            if state.code is None and state.queued_requests:
+                _send_queued_request(state, call)
+            else:
+                state.queued_requests.clear()
+            return call if not state.due else None
+
+    return handle_event
+
+
+def _queue_request(state, call, serialized_request, write_window):
+    while True:
+        if state.code is not None:
+            return False
+        elif len(state.queued_requests) < write_window:
+            break
+        else:
+            state.condition.wait()
+    state.queued_requests.append(serialized_request)
+    if not state.due & _SEND_MESSAGE_DUE:
+        _send_queued_request(state, call)
+    return True
+
+
+def _send_request(state, call, serialized_request, event_handler):
+    operations = (cygrpc.operation_send_message(serialized_request,
+                                                _EMPTY_FLAGS),)
+    call.start_client_batch(cygrpc.Operations(operations), event_handler)
+    state.due |= _SEND_MESSAGE_DUE
+    while True:
+        state.condition.wait()
+        if state.code is None:
+            if not state.due & _SEND_MESSAGE_DUE:
+                return True
+        else:
+            return False
+
+
+def _drain_queued_requests(state):
+    while True:
+        if state.code is not None:
+            return False
+        elif (not state.queued_requests and not state.due & _SEND_MESSAGE_DUE):
+            return True
+        else:
+            state.condition.wait()
+
+
+class _ReadAheadEventHandler(object):
+    """Keeps a receive-message batch outstanding until responses are buffered.
+
+    The gRPC Core permits only one receive-message batch in flight per call,
+    so messages are received ahead of their consumption one after another
+    until read_ahead responses are buffered in the RPC state.
+    """
+
+    __slots__ = ('_state', '_call', '_response_deserializer', '_read_ahead',)
+
+    def __init__(self, state, call, response_deserializer, read_ahead):
+        self._state = state
+        self._call = call
+        self._response_deserializer = response_deserializer
+        self._read_ahead = read_ahead
+
+    def receive(self):
+        """Starts a receive-message batch if one is wanted.
+
+    Must be called with the RPC state's condition held.
+    """
+        receiving = self._state.due & _RECEIVE_MESSAGE_DUE
+        if self._state.code is not None or receiving:
+            return
+        responses = self._state.responses
+        stream_ended = responses and responses[-1] is None
+        if not stream_ended and len(responses) < self._read_ahead:
+            self._call.start_client_batch(
+                cygrpc.Operations(
+                    (cygrpc.operation_receive_message(_EMPTY_FLAGS),)), self)
+            self._state.due |= _RECEIVE_MESSAGE_DUE
+
+    def __call__(self, event):
+        with self._state.condition:
+            callbacks = _handle_event(event, self._state,
+                                      self._response_deserializer)
+            self._state.responses.append(self._state.response)
+            self._state.response = None
+            self.receive()
+            self._state.condition.notify_all()
+            done = not self._state.due
+        for callback in callbacks:
+            callback()
+        return self._call if done else None
+
+
+def _consume_request_iterator(request_iterator,
+                              state,
+                              call,
+                              request_serializer,
+                              write_window=None):
     event_handler = _event_handler(state, call, None)
 
     def consume_request_iterator():
@@ -214,28 +423,22 @@ def _consume_request_iterator(request_iterator, state, call,
                         details = 'Exception serializing request!'
                         _abort(state, grpc.StatusCode.INTERNAL, details)
                         return
-                    else:
-                        operations = (cygrpc.operation_send_message(
-                            serialized_request, _EMPTY_FLAGS),)
-                        call.start_client_batch(
-                            cygrpc.Operations(operations), event_handler)
-                        state.due.add(cygrpc.OperationType.send_message)
-                        while True:
-                            state.condition.wait()
-                            if state.code is None:
-                                if cygrpc.OperationType.send_message not in state.due:
-                                    break
-                            else:
-                                return
+                    elif write_window is None:
+                        if not _send_request(state, call, serialized_request,
+                                             event_handler):
+                            return
+                    elif not _queue_request(state, call, serialized_request,
+                                            write_window):
+                        return
                 else:
                     return
         with state.condition:
-            if state.code is None:
+            if write_window is None or _drain_queued_requests(state):
                 operations = (
                     cygrpc.operation_send_close_from_client(_EMPTY_FLAGS),)
                 call.start_client_batch(
                     cygrpc.Operations(operations), event_handler)
-                state.due.add(cygrpc.OperationType.send_close_from_client)
+                state.due |= _SEND_CLOSE_FROM_CLIENT_DUE
 
     def stop_consumption_thread(timeout):  # pylint: disable=unused-argument
         with state.condition:
@@ -252,12 +455,30 @@ def _consume_request_iterator(request_iterator, state, call,
 
 class _Rendezvous(grpc.RpcError, grpc.Future, grpc.Call):
 
-    def __init__(self, state, call, response_deserializer, deadline):
+    def __init__(self,
+                 state,
+                 call,
+                 response_deserializer,
+                 deadline,
+                 read_ahead=None,
+                 deferred_deserializer=None):
         super(_Rendezvous, self).__init__()
         self._state = state
         self._call = call
         self._response_deserializer = response_deserializer
         self._deadline = deadline
+        # Applied in the application's thread to responses handed over
+        # serialized by the thread driving the RPC.
+        self._deferred_deserializer = deferred_deserializer
+        self._response_deserialized = deferred_deserializer is None
+        if read_ahead is None:
+            self._read_ahead_event_handler = None
+        else:
+            self._read_ahead_event_handler = _ReadAheadEventHandler(
+                state, call, response_deserializer, read_ahead)
+            with state.condition:
+                state.responses = collections.deque()
+                self._read_ahead_event_handler.receive()
 
     def cancel(self):
         with self._state.condition:
@@ -287,11 +508,15 @@ class _Rendezvous(grpc.RpcError, grpc.Future, grpc.Call):
                 if self._state.code is None:
                     _wait_once_until(self._state.condition, until)
                 elif self._state.code is grpc.StatusCode.OK:
-                    return self._state.response
+                    if self._response_deserialized:
+                        return self._state.response
+                    serialized_response = self._state.response
+                    break
                 elif self._state.cancelled:
                     raise grpc.FutureCancelledError()
                 else:
                     raise self
+        return self._deferred_response(serialized_response)
 
     def exception(self, timeout=None):
         until = None if timeout is None else time.time() + timeout
@@ -330,7 +555,60 @@ class _Rendezvous(grpc.RpcError, grpc.Future, grpc.Call):
 
         fn(self)
 
+    def _deserialize(self, serialized_response):
+        """Applies the deferred deserializer to a response.
+
+    Must be called without the RPC state's condition held so that other
+    threads serving RPCs of the channel are not held up by deserialization.
+    """
+        if self._deferred_deserializer is None:
+            return serialized_response
+        response = _common.deserialize(serialized_response,
+                                       self._deferred_deserializer)
+        if response is None:
+            with self._state.condition:
+                _fail_deserialization(self._state, self._call)
+            raise self
+        else:
+            return response
+
+    def _deferred_response(self, serialized_response):
+        if serialized_response is None:
+            response = None
+        else:
+            response = self._deserialize(serialized_response)
+        with self._state.condition:
+            if not self._response_deserialized:
+                self._state.response = response
+                self._response_deserialized = True
+            return self._state.response
+
+    def _next_read_ahead(self):
+        with self._state.condition:
+            while True:
+                if self._state.cancelled:
+                    raise self
+                elif self._state.responses:
+                    response = self._state.responses[0]
+                    if response is not None:
+                        self._state.responses.popleft()
+                        self._read_ahead_event_handler.receive()
+                        break
+                    elif self._state.code is grpc.StatusCode.OK:
+                        raise StopIteration()
+                    elif self._state.code is not None:
+                        raise self
+                elif self._state.code is grpc.StatusCode.OK:
+                    raise StopIteration()
+                elif (self._state.code is not None and
+                      not self._state.due & _RECEIVE_MESSAGE_DUE):
+                    raise self
+                self._state.condition.wait()
+        return self._deserialize(response)
+
     def _next(self):
+        if self._read_ahead_event_handler is not None:
+            return self._next_read_ahead()
         with self._state.condition:
             if self._state.code is None:
                 event_handler = _event_handler(self._state, self._call,
@@ -339,7 +617,7 @@ class _Rendezvous(grpc.RpcError, grpc.Future, grpc.Call):
                     cygrpc.Operations(
                         (cygrpc.operation_receive_message(_EMPTY_FLAGS),)),
                     event_handler)
-                self._state.due.add(cygrpc.OperationType.receive_message)
+                self._state.due |= _RECEIVE_MESSAGE_DUE
             elif self._state.code is grpc.StatusCode.OK:
                 raise StopIteration()
             else:
@@ -349,12 +627,13 @@ class _Rendezvous(grpc.RpcError, grpc.Future, grpc.Call):
                 if self._state.response is not None:
                     response = self._state.response
                     self._state.response = None
-                    return response
-                elif cygrpc.OperationType.receive_message not in self._state.due:
+                    break
+                elif not self._state.due & _RECEIVE_MESSAGE_DUE:
                     if self._state.code is grpc.StatusCode.OK:
                         raise StopIteration()
                     elif self._state.code is not None:
                         raise self
+        return self._deserialize(response)
 
     def __iter__(self):
         return self
@@ -435,7 +714,7 @@ def _start_unary_request(request, timeout, request_serializer):
     deadline, deadline_timespec = _deadline(timeout)
     serialized_request = _common.serialize(request, request_serializer)
     if serialized_request is None:
-        state = _RPCState((), _common.EMPTY_METADATA, _common.EMPTY_METADATA,
+        state = _RPCState(0, _common.EMPTY_METADATA, _common.EMPTY_METADATA,
                           grpc.StatusCode.INTERNAL,
                           'Exception serializing request!')
         rendezvous = _Rendezvous(state, None, None, deadline)
@@ -444,6 +723,15 @@ def _start_unary_request(request, timeout, request_serializer):
         return deadline, deadline_timespec, serialized_request, None
 
 
+def _split_deserialization(response_deserializer, defer_deserialization):
+    """Returns the deserializers to apply on receipt and on consumption."""
+    if (defer_deserialization and
+            response_deserializer is not grpc.raw_frame_deserializer):
+        return None, response_deserializer
+    else:
+        return response_deserializer, None
+
+
 def _end_unary_response_blocking(state, call, with_call, deadline):
     if state.code is grpc.StatusCode.OK:
         if with_call:
@@ -455,50 +743,145 @@ def _end_unary_response_blocking(state, call, with_call, deadline):
         raise _Rendezvous(state, None, None, deadline)
 
 
+def _batch_outcome(batch, response_deserializer, deadline):
+    if batch.received_status_code == cygrpc.StatusCode.ok:
+        serialized_response = _common.received_message(batch,
+                                                       response_deserializer)
+        if serialized_response is None:
+            return None
+        response = _common.deserialize(serialized_response,
+                                       response_deserializer)
+        if response is not None:
+            return response
+        state = _RPCState(0, batch.received_initial_metadata,
+                          batch.received_trailing_metadata,
+                          grpc.StatusCode.INTERNAL,
+                          'Exception deserializing response!')
+    else:
+        state = _RPCState(0, batch.received_initial_metadata, None, None, None)
+        _handle_received_status(state, batch.received_trailing_metadata,
+                                batch.received_status_code,
+                                batch.received_status_details)
+    return _Rendezvous(state, None, None, deadline)
+
+
+class _BatchState(object):
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        # The cygrpc.Calls of the RPCs not yet terminated by request index.
+        self.calls = {}
+        # The (index, unary-unary batch) pairs of terminated RPCs not yet
+        # drawn.
+        self.batches = collections.deque()
+
+
+def _batch_event_handler(state, call, index):
+
+    def handle_event(event):
+        with state.condition:
+            del state.calls[index]
+            state.batches.append((index, event.unary_unary_batch))
+            state.condition.notify_all()
+        return call
+
+    return handle_event
+
+
+class _BatchOutcomes(object):
+    """The outcomes of a batch of unary-unary RPCs.
+
+    The RPCs are driven by the channel like any other, but no per-RPC state is
+    kept for them and their responses are deserialized only when drawn.
+    """
+
+    def __init__(self, state, failures, response_deserializer, deadline):
+        self._state = state
+        # The outcomes of the RPCs that failed to start, in request order.
+        self._failures = failures
+        self._response_deserializer = response_deserializer
+        self._deadline = deadline
+
+    def _next(self):
+        if self._failures:
+            return self._failures.popleft()
+        with self._state.condition:
+            while not self._state.batches:
+                if not self._state.calls:
+                    raise StopIteration()
+                self._state.condition.wait()
+            index, batch = self._state.batches.popleft()
+        return index, _batch_outcome(batch, self._response_deserializer,
+                                     self._deadline)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self._next()
+
+    def next(self):
+        return self._next()
+
+    def __del__(self):
+        with self._state.condition:
+            for call in self._state.calls.values():
+                call.cancel()
+
+
 class _UnaryUnaryMultiCallable(grpc.UnaryUnaryMultiCallable):
 
-    def __init__(self, channel, managed_call, method, request_serializer,
-                 response_deserializer):
+    def __init__(self, channel, managed_call, blocking_call, method,
+                 request_serializer, response_deserializer,
+                 defer_deserialization):
         self._channel = channel
         self._managed_call = managed_call
+        self._blocking_call = blocking_call
         self._method = method
         self._request_serializer = request_serializer
         self._response_deserializer = response_deserializer
+        # Blocking calls and batches deserialize responses in the application's
+        # thread regardless; futures are driven by another thread.
+        self._received_deserializer, self._deferred_deserializer = (
+            _split_deserialization(response_deserializer,
+                                   defer_deserialization))
 
     def _prepare(self, request, timeout, metadata):
         deadline, deadline_timespec, serialized_request, rendezvous = (
             _start_unary_request(request, timeout, self._request_serializer))
         if serialized_request is None:
-            return None, None, None, None, rendezvous
+            return None, None, None, None, None, rendezvous
         else:
             state = _RPCState(_UNARY_UNARY_INITIAL_DUE, None, None, None, None)
-            operations = (
-                cygrpc.operation_send_initial_metadata(
-                    _common.to_cygrpc_metadata(metadata), _EMPTY_FLAGS),
-                cygrpc.operation_send_message(serialized_request, _EMPTY_FLAGS),
-                cygrpc.operation_send_close_from_client(_EMPTY_FLAGS),
-                cygrpc.operation_receive_initial_metadata(_EMPTY_FLAGS),
-                cygrpc.operation_receive_message(_EMPTY_FLAGS),
-                cygrpc.operation_receive_status_on_client(_EMPTY_FLAGS),)
-            return state, operations, deadline, deadline_timespec, None
+            return (state, _common.to_cygrpc_metadata(metadata),
+                    serialized_request, deadline, deadline_timespec, None)
 
     def _blocking(self, request, timeout, metadata, credentials):
-        state, operations, deadline, deadline_timespec, rendezvous = self._prepare(
-            request, timeout, metadata)
+        (state, cygrpc_metadata, serialized_request, deadline,
+         deadline_timespec, rendezvous) = self._prepare(request, timeout,
+                                                        metadata)
         if rendezvous:
             raise rendezvous
         else:
-            completion_queue = cygrpc.CompletionQueue()
-            call = self._channel.create_call(None, 0, completion_queue,
-                                             self._method, None,
-                                             deadline_timespec)
-            if credentials is not None:
-                call.set_credentials(credentials._credentials)
-            call_error = call.start_client_batch(
-                cygrpc.Operations(operations), None)
-            _check_call_error(call_error, metadata)
-            _handle_event(completion_queue.poll(), state,
-                          self._response_deserializer)
+            completion_queue = _take_blocking_completion_queue()
+            call, end_call = self._blocking_call(None, 0, completion_queue,
+                                                 self._method, None,
+                                                 deadline_timespec)
+            try:
+                if credentials is not None:
+                    call.set_credentials(credentials._credentials)
+                call_error = call.start_unary_unary(cygrpc_metadata,
+                                                    serialized_request, None)
+                if call_error != cygrpc.CallError.ok:
+                    _return_blocking_completion_queue(completion_queue)
+                    _check_call_error(call_error, metadata)
+                # If polling is interrupted the batch's event remains due from
+                # the completion queue, which must then not be reused.
+                event = completion_queue.poll()
+            finally:
+                end_call()
+            _return_blocking_completion_queue(completion_queue)
+            _handle_event(event, state, self._response_deserializer)
             return state, call, deadline
 
     def __call__(self, request, timeout=None, metadata=None, credentials=None):
@@ -512,8 +895,9 @@ class _UnaryUnaryMultiCallable(grpc.UnaryUnaryMultiCallable):
         return _end_unary_response_blocking(state, call, True, deadline)
 
     def future(self, request, timeout=None, metadata=None, credentials=None):
-        state, operations, deadline, deadline_timespec, rendezvous = self._prepare(
-            request, timeout, metadata)
+        (state, cygrpc_metadata, serialized_request, deadline,
+         deadline_timespec, rendezvous) = self._prepare(request, timeout,
+                                                        metadata)
         if rendezvous:
             return rendezvous
         else:
@@ -522,27 +906,71 @@ class _UnaryUnaryMultiCallable(grpc.UnaryUnaryMultiCallable):
             if credentials is not None:
                 call.set_credentials(credentials._credentials)
             event_handler = _event_handler(state, call,
-                                           self._response_deserializer)
+                                           self._received_deserializer)
             with state.condition:
-                call_error = call.start_client_batch(
-                    cygrpc.Operations(operations), event_handler)
+                call_error = call.start_unary_unary(
+                    cygrpc_metadata, serialized_request, event_handler)
                 if call_error != cygrpc.CallError.ok:
                     _call_error_set_RPCstate(state, call_error, metadata)
                     return _Rendezvous(state, None, None, deadline)
                 drive_call()
-            return _Rendezvous(state, call, self._response_deserializer,
-                               deadline)
+            return _Rendezvous(
+                state,
+                call,
+                None,
+                deadline,
+                deferred_deserializer=self._deferred_deserializer)
+
+    def batch(self, requests, timeout=None, metadata=None, credentials=None):
+        deadline, deadline_timespec = _deadline(timeout)
+        if metadata is not None and not isinstance(metadata,
+                                                   _common.PrecompiledMetadata):
+            metadata = _common.PrecompiledMetadata(metadata)
+        cygrpc_metadata = _common.to_cygrpc_metadata(metadata)
+        state = _BatchState()
+        failures = collections.deque()
+        for index, request in enumerate(requests):
+            serialized_request = _common.serialize(request,
+                                                   self._request_serializer)
+            if serialized_request is None:
+                rpc_state = _RPCState(
+                    0, _common.EMPTY_METADATA, _common.EMPTY_METADATA,
+                    grpc.StatusCode.INTERNAL, 'Exception serializing request!')
+                failures.append((index, _Rendezvous(rpc_state, None, None,
+                                                    deadline)))
+                continue
+            call, drive_call = self._managed_call(None, 0, self._method, None,
+                                                  deadline_timespec)
+            if credentials is not None:
+                call.set_credentials(credentials._credentials)
+            with state.condition:
+                call_error = call.start_unary_unary(
+                    cygrpc_metadata, serialized_request,
+                    _batch_event_handler(state, call, index))
+                if call_error == cygrpc.CallError.ok:
+                    state.calls[index] = call
+                    drive_call()
+            if call_error != cygrpc.CallError.ok:
+                rpc_state = _RPCState(0, None, None, None, None)
+                _call_error_set_RPCstate(rpc_state, call_error, metadata)
+                failures.append((index, _Rendezvous(rpc_state, None, None,
+                                                    deadline)))
+        return _BatchOutcomes(state, failures, self._response_deserializer,
+                              deadline)
 
 
 class _UnaryStreamMultiCallable(grpc.UnaryStreamMultiCallable):
 
     def __init__(self, channel, managed_call, method, request_serializer,
-                 response_deserializer):
+                 response_deserializer, read_ahead, defer_deserialization):
         self._channel = channel
         self._managed_call = managed_call
         self._method = method
         self._request_serializer = request_serializer
-        self._response_deserializer = response_deserializer
+        self._response_deserializer, self._deferred_deserializer = (
+            _split_deserialization(response_deserializer,
+                                   defer_deserialization))
+        self._read_ahead = read_ahead
 
     def __call__(self, request, timeout=None, metadata=None, credentials=None):
         deadline, deadline_timespec, serialized_request, rendezvous = (
@@ -576,49 +1004,70 @@ class _UnaryStreamMultiCallable(grpc.UnaryStreamMultiCallable):
                     return _Rendezvous(state, None, None, deadline)
                 drive_call()
             return _Rendezvous(state, call, self._response_deserializer,
-                               deadline)
+                               deadline, self._read_ahead,
+                               self._deferred_deserializer)
 
 
 class _StreamUnaryMultiCallable(grpc.StreamUnaryMultiCallable):
 
-    def __init__(self, channel, managed_call, method, request_serializer,
-                 response_deserializer):
+    def __init__(self, channel, managed_call, blocking_call, method,
+                 request_serializer, response_deserializer, write_window,
+                 defer_deserialization):
         self._channel = channel
         self._managed_call = managed_call
+        self._blocking_call = blocking_call
         self._method = method
         self._request_serializer = request_serializer
         self._response_deserializer = response_deserializer
+        self._write_window = write_window
+        # Blocking calls deserialize responses in the application's thread
+        # regardless; futures are driven by another thread.
+        self._received_deserializer, self._deferred_deserializer = (
+            _split_deserialization(response_deserializer,
+                                   defer_deserialization))
 
     def _blocking(self, request_iterator, timeout, metadata, credentials):
         deadline, deadline_timespec = _deadline(timeout)
         state = _RPCState(_STREAM_UNARY_INITIAL_DUE, None, None, None, None)
         completion_queue = cygrpc.CompletionQueue()
-        call = self._channel.create_call(None, 0, completion_queue,
-                                         self._method, None, deadline_timespec)
-        if credentials is not None:
-            call.set_credentials(credentials._credentials)
-        with state.condition:
-            call.start_client_batch(
-                cygrpc.Operations(
-                    (cygrpc.operation_receive_initial_metadata(_EMPTY_FLAGS),)),
-                None)
-            operations = (
-                cygrpc.operation_send_initial_metadata(
-                    _common.to_cygrpc_metadata(metadata), _EMPTY_FLAGS),
-                cygrpc.operation_receive_message(_EMPTY_FLAGS),
-                cygrpc.operation_receive_status_on_client(_EMPTY_FLAGS),)
-            call_error = call.start_client_batch(
-                cygrpc.Operations(operations), None)
-            _check_call_error(call_error, metadata)
-            _consume_request_iterator(request_iterator, state, call,
-                                      self._request_serializer)
-        while True:
-            event = completion_queue.poll()
+        call, end_call = self._blocking_call(
+            None, 0, completion_queue, self._method, None, deadline_timespec)
+        try:
+            if credentials is not None:
+                call.set_credentials(credentials._credentials)
             with state.condition:
-                _handle_event(event, state, self._response_deserializer)
-                state.condition.notify_all()
-                if not state.due:
-                    break
+                call.start_client_batch(
+                    cygrpc.Operations((
+                        cygrpc.operation_receive_initial_metadata(_EMPTY_FLAGS),
+                    )), None)
+                operations = (
+                    cygrpc.operation_send_initial_metadata(
+                        _common.to_cygrpc_metadata(metadata), _EMPTY_FLAGS),
+                    cygrpc.operation_receive_message(_EMPTY_FLAGS),
+                    cygrpc.operation_receive_status_on_client(_EMPTY_FLAGS),)
+                call_error = call.start_client_batch(
+                    cygrpc.Operations(operations), None)
+                _check_call_error(call_error, metadata)
+                _consume_request_iterator(request_iterator, state, call,
+                                          self._request_serializer,
+                                          self._write_window)
+            while True:
+                event = completion_queue.poll()
+                if event.tag is None:
+                    with state.condition:
+                        _handle_event(event, state, self._response_deserializer)
+                        state.condition.notify_all()
+                        if not state.due:
+                            break
+                else:
+                    # Batches started while consuming requests carry handlers
+                    # that may start further batches.
+                    event.tag(event)
+                    with state.condition:
+                        if not state.due:
+                            break
+        finally:
+            end_call()
         return state, call, deadline
 
     def __call__(self,
@@ -650,7 +1099,7 @@ class _StreamUnaryMultiCallable(grpc.StreamUnaryMultiCallable):
                                               deadline_timespec)
         if credentials is not None:
             call.set_credentials(credentials._credentials)
-        event_handler = _event_handler(state, call, self._response_deserializer)
+        event_handler = _event_handler(state, call, self._received_deserializer)
         with state.condition:
             call.start_client_batch(
                 cygrpc.Operations(
@@ -668,19 +1117,30 @@ class _StreamUnaryMultiCallable(grpc.StreamUnaryMultiCallable):
                 return _Rendezvous(state, None, None, deadline)
             drive_call()
             _consume_request_iterator(request_iterator, state, call,
-                                      self._request_serializer)
-        return _Rendezvous(state, call, self._response_deserializer, deadline)
+                                      self._request_serializer,
+                                      self._write_window)
+        return _Rendezvous(
+            state,
+            call,
+            None,
+            deadline,
+            deferred_deserializer=self._deferred_deserializer)
 
 
 class _StreamStreamMultiCallable(grpc.StreamStreamMultiCallable):
 
     def __init__(self, channel, managed_call, method, request_serializer,
-                 response_deserializer):
+                 response_deserializer, write_window, read_ahead,
+                 defer_deserialization):
         self._channel = channel
         self._managed_call = managed_call
         self._method = method
         self._request_serializer = request_serializer
-        self._response_deserializer = response_deserializer
+        self._response_deserializer, self._deferred_deserializer = (
+            _split_deserialization(response_deserializer,
+                                   defer_deserialization))
+        self._write_window = write_window
+        self._read_ahead = read_ahead
 
     def __call__(self,
                  request_iterator,
@@ -710,31 +1170,89 @@ class _StreamStreamMultiCallable(grpc.StreamStreamMultiCallable):
                 return _Rendezvous(state, None, None, deadline)
             drive_call()
             _consume_request_iterator(request_iterator, state, call,
-                                      self._request_serializer)
-        return _Rendezvous(state, call, self._response_deserializer, deadline)
+                                      self._request_serializer,
+                                      self._write_window)
+        return _Rendezvous(state, call, self._response_deserializer, deadline,
+                           self._read_ahead, self._deferred_deserializer)
+
+
+class _SharedCompletionQueues(object):
+    """A process-wide pool of completion queues each drained by its own thread.
+
+    Queues and their threads are created as they are first needed and are
+    never destroyed, so the number of threads spinning on behalf of channels
+    sharing the pool is independent of the number of those channels.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._completion_queues = []
+        # A process-wide round-robin cursor, so that channels making few calls
+        # do not all start their calls on the first completion queue.
+        self._cursor = 0
+
+    def reserve(self, count):
+        """Creates the first count completion queues of the pool."""
+        with self._lock:
+            while len(self._completion_queues) < count:
+                completion_queue = cygrpc.CompletionQueue()
+                spin_thread = threading.Thread(
+                    target=_spin_shared_completion_queue,
+                    args=(completion_queue,))
+                spin_thread.daemon = True
+                spin_thread.start()
+                self._completion_queues.append(completion_queue)
+
+    def next(self, count):
+        """Returns the next of the first count (reserved) completion queues."""
+        with self._lock:
+            self._cursor += 1
+            return self._completion_queues[self._cursor % count]
+
+
+_SHARED_COMPLETION_QUEUES = _SharedCompletionQueues()
+
+
+def _do_nothing():
+    pass
+
+
+def _spin_shared_completion_queue(completion_queue):
+    while True:
+        for event in completion_queue.poll_many(_MAXIMUM_EVENTS_PER_POLL):
+            callable_util.call_logging_exceptions(
+                event.tag, _SHARED_COMPLETION_QUEUE_EVENT_EXCEPTION_LOG_MESSAGE,
+                event)
 
 
 class _ChannelCallState(object):
 
-    def __init__(self, channel):
+    def __init__(self, channel, shared_completion_queue_count):
         self.lock = threading.Lock()
         self.channel = channel
-        self.completion_queue = cygrpc.CompletionQueue()
+        if shared_completion_queue_count is None:
+            self.completion_queue = cygrpc.CompletionQueue()
+        else:
+            self.completion_queue = None
+            _SHARED_COMPLETION_QUEUES.reserve(shared_completion_queue_count)
+        self.shared_completion_queue_count = shared_completion_queue_count
         self.managed_calls = None
+        self.blocking_call_count = 0
 
 
 def _run_channel_spin_thread(state):
 
     def channel_spin():
         while True:
-            event = state.completion_queue.poll()
-            completed_call = event.tag(event)
-            if completed_call is not None:
-                with state.lock:
-                    state.managed_calls.remove(completed_call)
-                    if not state.managed_calls:
-                        state.managed_calls = None
-                        return
+            for event in state.completion_queue.poll_many(
+                    _MAXIMUM_EVENTS_PER_POLL):
+                completed_call = event.tag(event)
+                if completed_call is not None:
+                    with state.lock:
+                        state.managed_calls.remove(completed_call)
+                        if not state.managed_calls:
+                            state.managed_calls = None
+                            return
 
     def stop_channel_spin(timeout):  # pylint: disable=unused-argument
         with state.lock:
@@ -747,6 +1265,16 @@ def _run_channel_spin_thread(state):
     channel_spin_thread.start()
 
 
+def _call_count(state):
+    """Returns the number of calls in flight on a channel.
+
+    Calls made on a shared completion queue are not counted.
+    """
+    managed_calls = state.managed_calls
+    managed_call_count = 0 if managed_calls is None else len(managed_calls)
+    return managed_call_count + state.blocking_call_count
+
+
 def _channel_managed_call_management(state):
 
     def create(parent, flags, method, host, deadline):
@@ -767,6 +1295,15 @@ def _channel_managed_call_management(state):
       A cygrpc.Call with which to conduct an RPC and a function to call if
         operations are successfully started on the call.
     """
+        if state.shared_completion_queue_count is not None:
+            completion_queue = _SHARED_COMPLETION_QUEUES.next(
+                state.shared_completion_queue_count)
+            call = state.channel.create_call(parent, flags, completion_queue,
+                                             method, host, deadline)
+            # Calls on shared completion queues are driven by the queues'
+            # threads and are not tracked in (or counted from) managed_calls.
+            return call, _do_nothing
+
         call = state.channel.create_call(parent, flags, state.completion_queue,
                                          method, host, deadline)
 
@@ -783,14 +1320,50 @@ def _channel_managed_call_management(state):
     return create
 
 
+def _channel_blocking_call_management(state):
+
+    def create(parent, flags, completion_queue, method, host, deadline):
+        """Creates a cygrpc.Call polled by the calling thread.
+
+    The call is counted as in flight on the channel until the returned function
+    is called, which must be done once no more events of the call are to be
+    polled from completion_queue.
+
+    Args:
+      parent: A cygrpc.Call to be used as the parent of the created call.
+      flags: An integer bitfield of call flags.
+      completion_queue: The cygrpc.CompletionQueue to be polled for the events
+        of the created call.
+      method: The RPC method.
+      host: A host string for the created call.
+      deadline: A cygrpc.Timespec to be the deadline of the created call.
+
+    Returns:
+      A cygrpc.Call with which to conduct an RPC and a function to call once
+        the RPC has been conducted.
+    """
+        call = state.channel.create_call(parent, flags, completion_queue,
+                                         method, host, deadline)
+        with state.lock:
+            state.blocking_call_count += 1
+
+        def end():
+            with state.lock:
+                state.blocking_call_count -= 1
+
+        return call, end
+
+    return create
+
+
 class _ChannelConnectivityState(object):
 
     def __init__(self, channel):
         self.lock = threading.Lock()
         self.channel = channel
+        # Whether a watch of the channel's connectivity is outstanding.
         self.polling = False
         self.connectivity = None
-        self.try_to_connect = False
         self.callbacks_and_connectivities = []
         self.delivering = False
 
@@ -829,44 +1402,80 @@ def _spawn_delivery(state, callbacks):
     state.delivering = True
 
 
-# NOTE(https://github.com/grpc/grpc/issues/3064): We'd rather not poll.
-def _poll_connectivity(state, channel, initial_try_to_connect):
-    try_to_connect = initial_try_to_connect
-    connectivity = channel.check_connectivity_state(try_to_connect)
-    with state.lock:
-        state.connectivity = (
-            _common.CYGRPC_CONNECTIVITY_STATE_TO_CHANNEL_CONNECTIVITY[
-                connectivity])
-        callbacks = tuple(callback
-                          for callback, unused_but_known_to_be_none_connectivity
-                          in state.callbacks_and_connectivities)
-        for callback_and_connectivity in state.callbacks_and_connectivities:
-            callback_and_connectivity[1] = state.connectivity
+class _ConnectivityWatcher(object):
+    """Watches the connectivity of any number of channels with one thread.
+
+    Watches are made with infinite deadlines, so the watching thread wakes
+    only when the connectivity of some watched channel changes (including
+    when a channel is destroyed and so shuts down).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._completion_queue = None
+
+    def _completion_queue_locked(self):
+        if self._completion_queue is None:
+            self._completion_queue = cygrpc.CompletionQueue()
+            watching_thread = threading.Thread(
+                target=_watch_connectivity, args=(self._completion_queue,))
+            watching_thread.daemon = True
+            watching_thread.start()
+        return self._completion_queue
+
+    def watch(self, channel, connectivity, tag):
+        with self._lock:
+            completion_queue = self._completion_queue_locked()
+        channel.watch_connectivity_state(connectivity, _INFINITE_FUTURE,
+                                         completion_queue, tag)
+
+
+_CONNECTIVITY_WATCHER = _ConnectivityWatcher()
+
+
+def _watch_connectivity(completion_queue):
+    while True:
+        for event in completion_queue.poll_many(_MAXIMUM_EVENTS_PER_POLL):
+            callable_util.call_logging_exceptions(
+                event.tag, 'Exception watching channel connectivity!', event)
+
+
+def _update_connectivity(state, connectivity):
+    state.connectivity = (
+        _common.CYGRPC_CONNECTIVITY_STATE_TO_CHANNEL_CONNECTIVITY[connectivity])
+    if not state.delivering:
+        callbacks = _deliveries(state)
         if callbacks:
             _spawn_delivery(state, callbacks)
-    completion_queue = cygrpc.CompletionQueue()
-    while True:
-        channel.watch_connectivity_state(connectivity,
-                                         cygrpc.Timespec(time.time() + 0.2),
-                                         completion_queue, None)
-        event = completion_queue.poll()
-        with state.lock:
-            if not state.callbacks_and_connectivities and not state.try_to_connect:
-                state.polling = False
-                state.connectivity = None
-                break
-            try_to_connect = state.try_to_connect
-            state.try_to_connect = False
-        if event.success or try_to_connect:
-            connectivity = channel.check_connectivity_state(try_to_connect)
-            with state.lock:
-                state.connectivity = (
-                    _common.CYGRPC_CONNECTIVITY_STATE_TO_CHANNEL_CONNECTIVITY[
-                        connectivity])
-                if not state.delivering:
-                    callbacks = _deliveries(state)
-                    if callbacks:
-                        _spawn_delivery(state, callbacks)
+
+
+def _watch(state, connectivity):
+    # The watch refers to the connectivity state only weakly so that the
+    # channel may be destroyed (completing the watch) once unreferenced.
+    state_reference = weakref.ref(state)
+
+    def on_connectivity_event(event):
+        watched_state = state_reference()
+        if watched_state is not None:
+            _on_connectivity_event(watched_state, event)
+
+    _CONNECTIVITY_WATCHER.watch(state.channel, connectivity,
+                                on_connectivity_event)
+
+
+def _on_connectivity_event(state, event):
+    with state.lock:
+        if not state.callbacks_and_connectivities or not event.success:
+            state.polling = False
+            state.connectivity = None
+            return
+    connectivity = state.channel.check_connectivity_state(False)
+    with state.lock:
+        _update_connectivity(state, connectivity)
+        if connectivity == cygrpc.ConnectivityState.shutdown:
+            state.polling = False
+            return
+    _watch(state, connectivity)
 
 
 def _moot(state):
@@ -877,21 +1486,26 @@ def _moot(state):
 def _subscribe(state, callback, try_to_connect):
     with state.lock:
         if not state.callbacks_and_connectivities and not state.polling:
-            polling_thread = _common.CleanupThread(
-                lambda timeout: _moot(state),
-                target=_poll_connectivity,
-                args=(state, state.channel, bool(try_to_connect)))
-            polling_thread.start()
             state.polling = True
             state.callbacks_and_connectivities.append([callback, None])
+            start_watching = True
         elif not state.delivering and state.connectivity is not None:
             _spawn_delivery(state, (callback,))
-            state.try_to_connect |= bool(try_to_connect)
             state.callbacks_and_connectivities.append(
                 [callback, state.connectivity])
+            start_watching = False
         else:
-            state.try_to_connect |= bool(try_to_connect)
             state.callbacks_and_connectivities.append([callback, None])
+            start_watching = False
+    if start_watching:
+        connectivity = state.channel.check_connectivity_state(
+            bool(try_to_connect))
+        with state.lock:
+            _update_connectivity(state, connectivity)
+        _watch(state, connectivity)
+    elif try_to_connect:
+        # Any resulting change of connectivity completes the outstanding watch.
+        state.channel.check_connectivity_state(True)
 
 
 def _unsubscribe(state, callback):
@@ -909,21 +1523,64 @@ def _options(options):
     ]
 
 
+def _check_write_window(write_window):
+    if write_window is not None and write_window < 1:
+        raise ValueError('write_window must be None or positive!')
+
+
+def _check_read_ahead(read_ahead):
+    if read_ahead is not None and read_ahead < 1:
+        raise ValueError('read_ahead must be None or positive!')
+
+
 class Channel(grpc.Channel):
-    """A cygrpc.Channel-backed implementation of grpc.Channel."""
+    """A cygrpc.Channel-backed implementation of grpc.Channel.
+
+    Beyond the grpc.Channel interface, which other implementations of it need
+    not support, the multi-callable factories of this class accept the
+    following keyword options:
+
+      write_window: For stream_unary and stream_stream, an optional number of
+        serialized request messages that may be queued for transmission while
+        further requests are taken from the request iterator. Queued requests
+        are written with a buffer hint so that the gRPC runtime may coalesce
+        them. In case None is passed each request is transmitted before the
+        next is taken from the iterator.
+      read_ahead: For unary_stream and stream_stream, an optional number of
+        response messages that may be received and buffered ahead of their
+        being taken from the response iterator. In case None is passed each
+        response is received only once it is asked for.
+      defer_deserialization: For all four factories, whether responses are to
+        be deserialized in the thread that takes them from the returned Future
+        or response iterator rather than in the thread driving the RPC, so
+        that deserializing large responses does not delay the delivery of
+        other RPCs' events.
+    """
 
-    def __init__(self, target, options, credentials):
+    def __init__(self,
+                 target,
+                 options,
+                 credentials,
+                 shared_completion_queue_count=None):
         """Constructor.
 
     Args:
       target: The target to which to connect.
       options: Configuration options for the channel.
       credentials: A cygrpc.ChannelCredentials or None.
+      shared_completion_queue_count: The number of process-wide shared
+        completion queues across which to spread the RPCs of this channel, or
+        None to drive them on a completion queue owned by this channel.
     """
+        if (shared_completion_queue_count is not None and
+                shared_completion_queue_count < 1):
+            raise ValueError(
+                'shared_completion_queue_count must be None or positive!')
         self._channel = cygrpc.Channel(
             _common.encode(target),
             _common.channel_args(_options(options)), credentials)
-        self._call_state = _ChannelCallState(self._channel)
+        self._call_state = _ChannelCallState(self._channel,
+                                             shared_completion_queue_count)
         self._connectivity_state = _ChannelConnectivityState(self._channel)
 
     def subscribe(self, callback, try_to_connect=None):
@@ -935,38 +1592,56 @@ class Channel(grpc.Channel):
     def unary_unary(self,
                     method,
                     request_serializer=None,
-                    response_deserializer=None):
+                    response_deserializer=None,
+                    defer_deserialization=False):
         return _UnaryUnaryMultiCallable(
             self._channel,
             _channel_managed_call_management(self._call_state),
-            _common.encode(method), request_serializer, response_deserializer)
+            _channel_blocking_call_management(self._call_state),
+            _common.encode(method), request_serializer, response_deserializer,
+            defer_deserialization)
 
     def unary_stream(self,
                      method,
                      request_serializer=None,
-                     response_deserializer=None):
+                     response_deserializer=None,
+                     read_ahead=None,
+                     defer_deserialization=False):
+        _check_read_ahead(read_ahead)
         return _UnaryStreamMultiCallable(
             self._channel,
             _channel_managed_call_management(self._call_state),
-            _common.encode(method), request_serializer, response_deserializer)
+            _common.encode(method), request_serializer, response_deserializer,
+            read_ahead, defer_deserialization)
 
     def stream_unary(self,
                      method,
                      request_serializer=None,
-                     response_deserializer=None):
+                     response_deserializer=None,
+                     write_window=None,
+                     defer_deserialization=False):
+        _check_write_window(write_window)
         return _StreamUnaryMultiCallable(
             self._channel,
             _channel_managed_call_management(self._call_state),
-            _common.encode(method), request_serializer, response_deserializer)
+            _channel_blocking_call_management(self._call_state),
+            _common.encode(method), request_serializer, response_deserializer,
+            write_window, defer_deserialization)
 
     def stream_stream(self,
                       method,
                       request_serializer=None,
-                      response_deserializer=None):
+                      response_deserializer=None,
+                      write_window=None,
+                      read_ahead=None,
+                      defer_deserialization=False):
+        _check_write_window(write_window)
+        _check_read_ahead(read_ahead)
         return _StreamStreamMultiCallable(
             self._channel,
             _channel_managed_call_management(self._call_state),
-            _common.encode(method), request_serializer, response_deserializer)
+            _common.encode(method), request_serializer, response_deserializer,
+            write_window, read_ahead, defer_deserialization)
 
     def __del__(self):
         _moot(self._connectivity_state)
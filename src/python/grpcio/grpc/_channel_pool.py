@@ -0,0 +1,352 @@
+# Copyright 2017, Google Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#     * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+#     * Neither the name of Google Inc. nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""A grpc.Channel implementation spreading RPCs across several channels."""
+
+import itertools
+import threading
+
+import grpc
+from grpc import _channel
+
+# Channels with distinct arguments do not share subchannels (and so do not
+# share connections), so each channel of a pool is given its index.
+_CHANNEL_POOL_INDEX_KEY = 'grpc.python.channel_pool_index'
+
+# The connectivities of the channels of a pool in order of preference for
+# the connectivity of the pool as a whole.
+_CONNECTIVITY_PREFERENCE = (
+    grpc.ChannelConnectivity.READY, grpc.ChannelConnectivity.CONNECTING,
+    grpc.ChannelConnectivity.IDLE, grpc.ChannelConnectivity.TRANSIENT_FAILURE,
+    grpc.ChannelConnectivity.SHUTDOWN,)
+
+
+class _Picker(object):
+
+    def __init__(self, call_states):
+        self._call_states = tuple(call_states)
+        self._offsets = itertools.count()
+
+    def pick(self):
+        """Returns the index of the channel with the fewest calls in flight.
+
+        Ties are broken round-robin.
+        """
+        count = len(self._call_states)
+        offset = next(self._offsets)
+        picked_index, picked_load = None, None
+        for step in range(count):
+            index = (offset + step) % count
+            load = _channel._call_count(self._call_states[index])
+            if picked_load is None or load < picked_load:
+                picked_index, picked_load = index, load
+                if not load:
+                    break
+        return picked_index
+
+
+class _UnaryUnaryMultiCallable(grpc.UnaryUnaryMultiCallable):
+
+    def __init__(self, picker, multi_callables):
+        self._picker = picker
+        self._multi_callables = multi_callables
+
+    def __call__(self, request, timeout=None, metadata=None, credentials=None):
+        return self._multi_callables[self._picker.pick()](
+            request,
+            timeout=timeout,
+            metadata=metadata,
+            credentials=credentials)
+
+    def with_call(self, request, timeout=None, metadata=None, credentials=None):
+        return self._multi_callables[self._picker.pick()].with_call(
+            request,
+            timeout=timeout,
+            metadata=metadata,
+            credentials=credentials)
+
+    def future(self, request, timeout=None, metadata=None, credentials=None):
+        return self._multi_callables[self._picker.pick()].future(
+            request,
+            timeout=timeout,
+            metadata=metadata,
+            credentials=credentials)
+
+    def batch(self, requests, timeout=None, metadata=None, credentials=None):
+        return self._multi_callables[self._picker.pick()].batch(
+            requests,
+            timeout=timeout,
+            metadata=metadata,
+            credentials=credentials)
+
+
+class _UnaryStreamMultiCallable(grpc.UnaryStreamMultiCallable):
+
+    def __init__(self, picker, multi_callables):
+        self._picker = picker
+        self._multi_callables = multi_callables
+
+    def __call__(self, request, timeout=None, metadata=None, credentials=None):
+        return self._multi_callables[self._picker.pick()](
+            request,
+            timeout=timeout,
+            metadata=metadata,
+            credentials=credentials)
+
+
+class _StreamUnaryMultiCallable(grpc.StreamUnaryMultiCallable):
+
+    def __init__(self, picker, multi_callables):
+        self._picker = picker
+        self._multi_callables = multi_callables
+
+    def __call__(self,
+                 request_iterator,
+                 timeout=None,
+                 metadata=None,
+                 credentials=None):
+        return self._multi_callables[self._picker.pick()](
+            request_iterator,
+            timeout=timeout,
+            metadata=metadata,
+            credentials=credentials)
+
+    def with_call(self,
+                  request_iterator,
+                  timeout=None,
+                  metadata=None,
+                  credentials=None):
+        return self._multi_callables[self._picker.pick()].with_call(
+            request_iterator,
+            timeout=timeout,
+            metadata=metadata,
+            credentials=credentials)
+
+    def future(self,
+               request_iterator,
+               timeout=None,
+               metadata=None,
+               credentials=None):
+        return self._multi_callables[self._picker.pick()].future(
+            request_iterator,
+            timeout=timeout,
+            metadata=metadata,
+            credentials=credentials)
+
+
+class _StreamStreamMultiCallable(grpc.StreamStreamMultiCallable):
+
+    def __init__(self, picker, multi_callables):
+        self._picker = picker
+        self._multi_callables = multi_callables
+
+    def __call__(self,
+                 request_iterator,
+                 timeout=None,
+                 metadata=None,
+                 credentials=None):
+        return self._multi_callables[self._picker.pick()](
+            request_iterator,
+            timeout=timeout,
+            metadata=metadata,
+            credentials=credentials)
+
+
+class _ConnectivityState(object):
+    """The connectivity of a pool, delivered as is that of a _channel.Channel.
+
+    Has the attributes of a _channel._ChannelConnectivityState used by
+    _channel._deliveries and _channel._spawn_delivery.
+    """
+
+    def __init__(self, size):
+        self.lock = threading.Lock()
+        # Held across the subscription and unsubscription of the pool's
+        # channels, which happen outside of lock, so that they do not
+        # interleave.
+        self.transition_lock = threading.Lock()
+        self.subscribed = False
+        self.connectivities = [None] * size
+        self.connectivity = None
+        self.callbacks_and_connectivities = []
+        self.delivering = False
+
+
+def _aggregate_connectivity(connectivities):
+    for connectivity in _CONNECTIVITY_PREFERENCE:
+        if connectivity in connectivities:
+            return connectivity
+    return None
+
+
+def _channel_callback(state, index):
+
+    def on_channel_connectivity(connectivity):
+        with state.lock:
+            state.connectivities[index] = connectivity
+            pool_connectivity = _aggregate_connectivity(state.connectivities)
+            if pool_connectivity is not state.connectivity:
+                state.connectivity = pool_connectivity
+                if not state.delivering:
+                    callbacks = _channel._deliveries(state)
+                    if callbacks:
+                        _channel._spawn_delivery(state, callbacks)
+
+    return on_channel_connectivity
+
+
+class ChannelPool(grpc.Channel):
+    """A grpc.Channel spreading its RPCs across several _channel.Channels.
+
+    Each RPC is made on the channel with the fewest calls in flight. The
+    multi-callable factories accept the same keyword options as those of
+    _channel.Channel.
+    """
+
+    def __init__(self, target, size, options, credentials):
+        """Constructor.
+
+    Args:
+      target: The target to which to connect.
+      size: The number of channels in the pool.
+      options: Configuration options for the channels.
+      credentials: A cygrpc.ChannelCredentials or None.
+    """
+        if size < 1:
+            raise ValueError('size must be positive!')
+        self._channels = tuple(
+            _channel.Channel(target,
+                             tuple(options) +
+                             ((_CHANNEL_POOL_INDEX_KEY, index),), credentials)
+            for index in range(size))
+        self._picker = _Picker(channel._call_state
+                               for channel in self._channels)
+        self._connectivity_state = _ConnectivityState(size)
+        self._channel_callbacks = tuple(
+            _channel_callback(self._connectivity_state, index)
+            for index in range(size))
+
+    def subscribe(self, callback, try_to_connect=None):
+        state = self._connectivity_state
+        with state.transition_lock:
+            with state.lock:
+                if state.subscribed:
+                    if not state.delivering and state.connectivity is not None:
+                        _channel._spawn_delivery(state, (callback,))
+                        state.callbacks_and_connectivities.append(
+                            [callback, state.connectivity])
+                    else:
+                        state.callbacks_and_connectivities.append(
+                            [callback, None])
+                    subscribe_channels = False
+                else:
+                    state.subscribed = True
+                    state.callbacks_and_connectivities.append([callback, None])
+                    subscribe_channels = True
+            if subscribe_channels:
+                for channel, channel_callback in zip(self._channels,
+                                                     self._channel_callbacks):
+                    channel.subscribe(
+                        channel_callback, try_to_connect=try_to_connect)
+            elif try_to_connect:
+                for channel in self._channels:
+                    channel._channel.check_connectivity_state(True)
+
+    def unsubscribe(self, callback):
+        state = self._connectivity_state
+        with state.transition_lock:
+            with state.lock:
+                for index, (subscribed_callback, unused_connectivity
+                           ) in enumerate(state.callbacks_and_connectivities):
+                    if callback == subscribed_callback:
+                        state.callbacks_and_connectivities.pop(index)
+                        break
+                if state.callbacks_and_connectivities or not state.subscribed:
+                    return
+                state.subscribed = False
+                state.connectivities = [None] * len(self._channels)
+                state.connectivity = None
+            for channel, channel_callback in zip(self._channels,
+                                                 self._channel_callbacks):
+                channel.unsubscribe(channel_callback)
+
+    def unary_unary(self,
+                    method,
+                    request_serializer=None,
+                    response_deserializer=None,
+                    defer_deserialization=False):
+        return _UnaryUnaryMultiCallable(
+            self._picker,
+            tuple(
+                channel.unary_unary(method, request_serializer,
+                                    response_deserializer,
+                                    defer_deserialization)
+                for channel in self._channels))
+
+    def unary_stream(self,
+                     method,
+                     request_serializer=None,
+                     response_deserializer=None,
+                     read_ahead=None,
+                     defer_deserialization=False):
+        return _UnaryStreamMultiCallable(
+            self._picker,
+            tuple(
+                channel.unary_stream(method, request_serializer,
+                                     response_deserializer, read_ahead,
+                                     defer_deserialization)
+                for channel in self._channels))
+
+    def stream_unary(self,
+                     method,
+                     request_serializer=None,
+                     response_deserializer=None,
+                     write_window=None,
+                     defer_deserialization=False):
+        return _StreamUnaryMultiCallable(
+            self._picker,
+            tuple(
+                channel.stream_unary(method, request_serializer,
+                                     response_deserializer, write_window,
+                                     defer_deserialization)
+                for channel in self._channels))
+
+    def stream_stream(self,
+                      method,
+                      request_serializer=None,
+                      response_deserializer=None,
+                      write_window=None,
+                      read_ahead=None,
+                      defer_deserialization=False):
+        return _StreamStreamMultiCallable(
+            self._picker,
+            tuple(
+                channel.stream_stream(method, request_serializer,
+                                      response_deserializer, write_window,
+                                      read_ahead, defer_deserialization)
+                for channel in self._channels))
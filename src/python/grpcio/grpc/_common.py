@@ -106,10 +106,38 @@ def channel_args(options):
     return cygrpc.ChannelArgs(cygrpc_args)
 
 
+class PrecompiledMetadata(object):
+    """Metadata converted once for transmission with any number of RPCs."""
+
+    def __init__(self, application_metadata):
+        self._application_metadata = tuple(
+            (key, value) for key, value in application_metadata)
+        self._cygrpc_metadata = cygrpc.Metadata(
+            cygrpc.Metadatum(encode(key), encode(value))
+            for key, value in self._application_metadata).interned()
+
+    def cygrpc_metadata(self):
+        return self._cygrpc_metadata.shared_copy()
+
+    def __iter__(self):
+        return iter(self._application_metadata)
+
+    def __len__(self):
+        return len(self._application_metadata)
+
+    def __repr__(self):
+        return 'PrecompiledMetadata({!r})'.format(self._application_metadata)
+
+
 def to_cygrpc_metadata(application_metadata):
-    return EMPTY_METADATA if application_metadata is None else cygrpc.Metadata(
-        cygrpc.Metadatum(encode(key), encode(value))
-        for key, value in application_metadata)
+    if application_metadata is None:
+        return EMPTY_METADATA
+    elif isinstance(application_metadata, PrecompiledMetadata):
+        return application_metadata.cygrpc_metadata()
+    else:
+        return cygrpc.Metadata(
+            cygrpc.Metadatum(encode(key), encode(value))
+            for key, value in application_metadata)
 
 
 def to_application_metadata(cygrpc_metadata):
@@ -132,6 +160,24 @@ def _transform(message, transformer, exception_message):
             return None
 
 
+def received_message(receive_message_operation, deserializer):
+    """Returns the message received by an operation for deserialization.
+
+  Args:
+    receive_message_operation: A completed cygrpc receive_message operation.
+    deserializer: The deserializer to be applied to the returned message.
+
+  Returns:
+    None if no message was received, the received cygrpc.ByteBuffer if
+      deserializer is grpc.raw_frame_deserializer, and the bytes of the
+      received message otherwise.
+  """
+    if deserializer is grpc.raw_frame_deserializer:
+        return receive_message_operation.received_byte_buffer
+    else:
+        return receive_message_operation.received_message.bytes()
+
+
 def serialize(message, serializer):
     return _transform(message, serializer, 'Exception serializing message!')
 
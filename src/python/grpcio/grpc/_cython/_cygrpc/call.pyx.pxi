@@ -64,6 +64,27 @@ cdef class Call:
   def start_server_batch(self, operations, tag):
     return self._start_batch(operations, tag, True)
 
+  def start_unary_unary(self, Metadata metadata not None, payload, tag):
+    """Starts all six operations of a unary-unary RPC in a single batch.
+
+    The operations are filled directly into the batch rather than being
+    created as Operation objects; the completion event of the batch carries
+    their results as its unary_unary_batch rather than its batch_operations.
+    """
+    if not self.is_valid:
+      raise ValueError("invalid call object cannot be used from Python")
+    cdef grpc_call_error result
+    cdef UnaryUnaryBatch batch = UnaryUnaryBatch(metadata, payload)
+    cdef OperationTag operation_tag = OperationTag(tag)
+    # As for start_client_batch this call is not referenced by the tag.
+    operation_tag.operation_call = None
+    operation_tag.unary_unary_batch = batch
+    cpython.Py_INCREF(operation_tag)
+    with nogil:
+      result = grpc_call_start_batch(
+          self.c_call, batch.c_ops, 6, <cpython.PyObject *>operation_tag, NULL)
+    return result
+
   def cancel(
       self, grpc_status_code error_code=GRPC_STATUS__DO_NOT_USE,
       details=None):
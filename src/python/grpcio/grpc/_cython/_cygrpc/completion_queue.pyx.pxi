@@ -35,6 +35,33 @@ import time
 cdef int _INTERRUPT_CHECK_PERIOD_MS = 200
 
 
+cdef grpc_event _next(
+    grpc_completion_queue *c_completion_queue, Timespec deadline) except *:
+  cdef gpr_timespec c_increment
+  cdef gpr_timespec c_timeout
+  cdef gpr_timespec c_deadline
+  cdef grpc_event event
+  with nogil:
+    c_increment = gpr_time_from_millis(_INTERRUPT_CHECK_PERIOD_MS, GPR_TIMESPAN)
+    c_deadline = gpr_inf_future(GPR_CLOCK_REALTIME)
+    if deadline is not None:
+      c_deadline = deadline.c_time
+
+    while True:
+      c_timeout = gpr_time_add(gpr_now(GPR_CLOCK_REALTIME), c_increment)
+      if gpr_time_cmp(c_timeout, c_deadline) > 0:
+        c_timeout = c_deadline
+      event = grpc_completion_queue_next(
+        c_completion_queue, c_timeout, NULL)
+      if event.type != GRPC_QUEUE_TIMEOUT or gpr_time_cmp(c_timeout, c_deadline) == 0:
+        break;
+
+      # Handle any signals
+      with gil:
+        cpython.PyErr_CheckSignals()
+  return event
+
+
 cdef class CompletionQueue:
 
   def __cinit__(self):
@@ -52,13 +79,14 @@ cdef class CompletionQueue:
     cdef Metadata request_metadata = None
     cdef Operations batch_operations = None
     cdef Operation batch_operation = None
+    cdef UnaryUnaryBatch unary_unary_batch = None
     if event.type == GRPC_QUEUE_TIMEOUT:
       return Event(
-          event.type, False, None, None, None, None, False, None)
+          event.type, False, None, None, None, None, False, None, None)
     elif event.type == GRPC_QUEUE_SHUTDOWN:
       self.is_shutdown = True
       return Event(
-          event.type, True, None, None, None, None, False, None)
+          event.type, True, None, None, None, None, False, None, None)
     else:
       if event.tag != NULL:
         tag = <OperationTag>event.tag
@@ -79,6 +107,9 @@ cdef class CompletionQueue:
             batch_operation = <Operation>op
             if batch_operation._received_metadata is not None:
               batch_operation._received_metadata._claim_slice_ownership()
+        unary_unary_batch = tag.unary_unary_batch
+        if unary_unary_batch is not None:
+          unary_unary_batch._claim_slice_ownership()
         if tag.is_new_request:
           # Stuff in the tag not explicitly handled by us needs to live through
           # the life of the call
@@ -86,33 +117,47 @@ cdef class CompletionQueue:
       return Event(
           event.type, event.success, user_tag, operation_call,
           request_call_details, request_metadata, tag.is_new_request,
-          batch_operations)
+          batch_operations, unary_unary_batch)
 
   def poll(self, Timespec deadline=None):
     # We name this 'poll' to avoid problems with CPython's expectations for
     # 'special' methods (like next and __next__).
-    cdef gpr_timespec c_increment
-    cdef gpr_timespec c_timeout
-    cdef gpr_timespec c_deadline
+    return self._interpret_event(_next(self.c_completion_queue, deadline))
+
+  def poll_many(self, int max_events, Timespec deadline=None):
+    """Waits for and returns a list of at most max_events Events.
+
+    Blocks as poll does until one event is available or the deadline passes,
+    then collects without blocking any further events that are already
+    available, all within a single release of the GIL.
+    """
+    cdef grpc_event *c_events
+    cdef grpc_event c_event
+    cdef gpr_timespec c_past
+    cdef int count = 1
+    if max_events < 1:
+      raise ValueError('max_events must be positive')
+    c_event = _next(self.c_completion_queue, deadline)
+    if c_event.type != GRPC_OP_COMPLETE or max_events == 1:
+      return [self._interpret_event(c_event)]
+    c_events = <grpc_event *>gpr_malloc(max_events*sizeof(grpc_event))
+    c_events[0] = c_event
     with nogil:
-      c_increment = gpr_time_from_millis(_INTERRUPT_CHECK_PERIOD_MS, GPR_TIMESPAN)
-      c_deadline = gpr_inf_future(GPR_CLOCK_REALTIME)
-      if deadline is not None:
-        c_deadline = deadline.c_time
-
-      while True:
-        c_timeout = gpr_time_add(gpr_now(GPR_CLOCK_REALTIME), c_increment)
-        if gpr_time_cmp(c_timeout, c_deadline) > 0:
-          c_timeout = c_deadline
-        event = grpc_completion_queue_next(
-          self.c_completion_queue, c_timeout, NULL)
-        if event.type != GRPC_QUEUE_TIMEOUT or gpr_time_cmp(c_timeout, c_deadline) == 0:
-          break;
-
-        # Handle any signals
-        with gil:
-          cpython.PyErr_CheckSignals()
-    return self._interpret_event(event)
+      c_past = gpr_inf_past(GPR_CLOCK_REALTIME)
+      while count < max_events:
+        c_event = grpc_completion_queue_next(
+            self.c_completion_queue, c_past, NULL)
+        if c_event.type == GRPC_QUEUE_TIMEOUT:
+          break
+        c_events[count] = c_event
+        count += 1
+        if c_event.type == GRPC_QUEUE_SHUTDOWN:
+          break
+    try:
+      return [self._interpret_event(c_events[index])
+              for index in range(count)]
+    finally:
+      gpr_free(c_events)
 
   def shutdown(self):
     with nogil:
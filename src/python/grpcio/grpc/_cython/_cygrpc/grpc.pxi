@@ -44,6 +44,17 @@ cdef extern from "grpc/support/alloc.h":
   void *gpr_realloc(void *p, size_t size) nogil
 
 
+cdef extern from "grpc/support/sync.h":
+
+  ctypedef struct gpr_mu:
+    # We don't care about the internals
+    pass
+
+  void gpr_mu_init(gpr_mu *mu) nogil
+  void gpr_mu_lock(gpr_mu *mu) nogil
+  void gpr_mu_unlock(gpr_mu *mu) nogil
+
+
 cdef extern from "grpc/byte_buffer_reader.h":
 
   struct grpc_byte_buffer_reader:
@@ -66,11 +77,14 @@ cdef extern from "grpc/grpc.h":
     pass
 
   grpc_slice grpc_slice_ref(grpc_slice s) nogil
+  grpc_slice grpc_slice_intern(grpc_slice s) nogil
   void grpc_slice_unref(grpc_slice s) nogil
   grpc_slice grpc_empty_slice() nogil
   grpc_slice grpc_slice_new(void *p, size_t len, void (*destroy)(void *)) nogil
   grpc_slice grpc_slice_new_with_len(
       void *p, size_t len, void (*destroy)(void *, size_t)) nogil
+  grpc_slice grpc_slice_new_with_user_data(
+      void *p, size_t len, void (*destroy)(void *), void *user_data) nogil
   grpc_slice grpc_slice_malloc(size_t length) nogil
   grpc_slice grpc_slice_from_copied_string(const char *source) nogil
   grpc_slice grpc_slice_from_copied_buffer(const char *source, size_t len) nogil
@@ -111,6 +125,7 @@ cdef extern from "grpc/grpc.h":
 
   grpc_byte_buffer *grpc_raw_byte_buffer_create(grpc_slice *slices,
                                                 size_t nslices) nogil
+  grpc_byte_buffer *grpc_byte_buffer_copy(grpc_byte_buffer *bb) nogil
   size_t grpc_byte_buffer_length(grpc_byte_buffer *bb) nogil
   void grpc_byte_buffer_destroy(grpc_byte_buffer *byte_buffer) nogil
 
@@ -54,6 +54,7 @@ cdef class OperationTag:
   cdef CallDetails request_call_details
   cdef Metadata request_metadata
   cdef Operations batch_operations
+  cdef UnaryUnaryBatch unary_unary_batch
   cdef bint is_new_request
 
 
@@ -74,6 +75,14 @@ cdef class Event:
   # For Call.start_batch
   cdef readonly Operations batch_operations
 
+  # For Call.start_unary_unary
+  cdef readonly UnaryUnaryBatch unary_unary_batch
+
+
+cdef class _SliceBuffer:
+
+  cdef grpc_slice c_slice
+
 
 cdef class ByteBuffer:
 
@@ -108,6 +117,8 @@ cdef class Metadatum:
 cdef class Metadata:
 
   cdef grpc_metadata_array c_metadata_array
+  # The Metadata owning the slices of this Metadata if it does not own them.
+  cdef Metadata _slice_owner
   cdef void _claim_slice_ownership(self)
 
 
@@ -130,6 +141,19 @@ cdef class Operations:
   cdef list operations
 
 
+cdef class UnaryUnaryBatch:
+
+  cdef grpc_op c_ops[6]
+  cdef Metadata _sent_metadata
+  cdef ByteBuffer _sent_message
+  cdef Metadata _received_initial_metadata
+  cdef ByteBuffer _received_message
+  cdef Metadata _received_trailing_metadata
+  cdef grpc_status_code _received_status_code
+  cdef grpc_slice _status_details
+  cdef void _claim_slice_ownership(self)
+
+
 cdef class CompressionOptions:
 
   cdef grpc_compression_options c_options
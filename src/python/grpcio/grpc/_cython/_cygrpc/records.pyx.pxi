@@ -28,6 +28,7 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 from libc.stdint cimport intptr_t
+from libc.string cimport memcpy
 
 
 cdef bytes _slice_bytes(grpc_slice slice):
@@ -255,7 +256,8 @@ cdef class Event:
                 CallDetails request_call_details,
                 Metadata request_metadata,
                 bint is_new_request,
-                Operations batch_operations):
+                Operations batch_operations,
+                UnaryUnaryBatch unary_unary_batch):
     self.type = type
     self.success = success
     self.tag = tag
@@ -263,22 +265,145 @@ cdef class Event:
     self.request_call_details = request_call_details
     self.request_metadata = request_metadata
     self.batch_operations = batch_operations
+    self.unary_unary_batch = unary_unary_batch
     self.is_new_request = is_new_request
 
 
+cdef grpc_slice *_read_slices(
+    grpc_byte_buffer *c_byte_buffer, size_t *c_count, size_t *c_length) nogil:
+  # Returns a gpr_malloc'd array of the (owned) slices of a byte buffer, or
+  # NULL if the byte buffer could not be read.
+  cdef grpc_byte_buffer_reader reader
+  cdef size_t capacity = 4
+  cdef grpc_slice *slices
+  if not grpc_byte_buffer_reader_init(&reader, c_byte_buffer):
+    return NULL
+  slices = <grpc_slice *>gpr_malloc(capacity*sizeof(grpc_slice))
+  c_count[0] = 0
+  c_length[0] = 0
+  while grpc_byte_buffer_reader_next(&reader, &slices[c_count[0]]):
+    c_length[0] += grpc_slice_length(slices[c_count[0]])
+    c_count[0] += 1
+    if c_count[0] == capacity:
+      capacity *= 2
+      slices = <grpc_slice *>gpr_realloc(slices, capacity*sizeof(grpc_slice))
+  grpc_byte_buffer_reader_destroy(&reader)
+  return slices
+
+
+cdef void _copy_and_release_slices(
+    grpc_slice *slices, size_t count, char *destination) nogil:
+  cdef size_t offset = 0
+  cdef size_t length
+  cdef size_t i
+  for i in range(count):
+    length = grpc_slice_length(slices[i])
+    memcpy(destination + offset, grpc_slice_start_ptr(slices[i]), length)
+    offset += length
+    grpc_slice_unref(slices[i])
+
+
+cdef class _SliceBuffer:
+  """Exposes the contents of a grpc_slice through the buffer protocol."""
+
+  def __cinit__(self):
+    grpc_init()
+    self.c_slice = grpc_empty_slice()
+
+  def __getbuffer__(self, Py_buffer *buffer, int flags):
+    # The start pointer must be computed from the slice held by this object;
+    # inlined slices store their bytes within the grpc_slice itself.
+    cpython.PyBuffer_FillInfo(
+        buffer, self, grpc_slice_start_ptr(self.c_slice),
+        grpc_slice_length(self.c_slice), 1, flags)
+
+  def __releasebuffer__(self, Py_buffer *buffer):
+    pass
+
+  def __dealloc__(self):
+    grpc_slice_unref(self.c_slice)
+    grpc_shutdown()
+
+
+# Byte strings at least this long are referenced rather than copied when sent.
+cdef size_t _BORROWED_BYTES_MINIMUM_LENGTH = 16384
+
+
+cdef struct _BorrowedBytes:
+  void *owner
+  _BorrowedBytes *next
+
+
+# Byte strings no longer referenced by core, awaiting release under the GIL.
+cdef gpr_mu _released_bytes_mu
+cdef _BorrowedBytes *_released_bytes = NULL
+gpr_mu_init(&_released_bytes_mu)
+
+
+cdef void _defer_borrowed_bytes_release(void *borrowed) nogil:
+  # Core may destroy slices from its own threads, including during interpreter
+  # finalization, so the GIL is not acquired here.
+  global _released_bytes
+  gpr_mu_lock(&_released_bytes_mu)
+  (<_BorrowedBytes *>borrowed).next = _released_bytes
+  _released_bytes = <_BorrowedBytes *>borrowed
+  gpr_mu_unlock(&_released_bytes_mu)
+
+
+cdef void _release_borrowed_bytes():
+  global _released_bytes
+  cdef _BorrowedBytes *released
+  cdef _BorrowedBytes *next
+  with nogil:
+    gpr_mu_lock(&_released_bytes_mu)
+    released = _released_bytes
+    _released_bytes = NULL
+    gpr_mu_unlock(&_released_bytes_mu)
+  while released != NULL:
+    next = released.next
+    cpython.Py_DECREF(<object>released.owner)
+    gpr_free(released)
+    released = next
+
+
 cdef class ByteBuffer:
 
-  def __cinit__(self, bytes data):
+  def __cinit__(self, data):
+    """Wraps any object supporting the buffer protocol.
+
+    Large byte strings are referenced, not copied, until core has finished
+    with them. The contents of all other objects are copied, since they may be
+    mutated after being sent.
+    """
     grpc_init()
+    _release_borrowed_bytes()
     if data is None:
       self.c_byte_buffer = NULL
       return
 
-    cdef char *c_data = data
     cdef grpc_slice data_slice
-    cdef size_t data_length = len(data)
-    with nogil:
-      data_slice = grpc_slice_from_copied_buffer(c_data, data_length)
+    cdef size_t data_length
+    cdef char *data_start
+    cdef _BorrowedBytes *borrowed
+    cdef Py_buffer view
+    if (type(data) is bytes and
+        _BORROWED_BYTES_MINIMUM_LENGTH <= cpython.PyBytes_GET_SIZE(data)):
+      data_length = cpython.PyBytes_GET_SIZE(data)
+      data_start = cpython.PyBytes_AS_STRING(data)
+      borrowed = <_BorrowedBytes *>gpr_malloc(sizeof(_BorrowedBytes))
+      borrowed.owner = <void *>data
+      cpython.Py_INCREF(data)
+      with nogil:
+        data_slice = grpc_slice_new_with_user_data(
+            data_start, data_length, _defer_borrowed_bytes_release, borrowed)
+    else:
+      cpython.PyObject_GetBuffer(data, &view, cpython.PyBUF_SIMPLE)
+      try:
+        with nogil:
+          data_slice = grpc_slice_from_copied_buffer(
+              <const char *>view.buf, view.len)
+      finally:
+        cpython.PyBuffer_Release(&view)
     with nogil:
       self.c_byte_buffer = grpc_raw_byte_buffer_create(
           &data_slice, 1)
@@ -286,28 +411,56 @@ cdef class ByteBuffer:
       grpc_slice_unref(data_slice)
 
   def bytes(self):
-    cdef grpc_byte_buffer_reader reader
-    cdef grpc_slice data_slice
-    cdef size_t data_slice_length
-    cdef void *data_slice_pointer
-    cdef bint reader_status
+    cdef grpc_slice *slices
+    cdef size_t count
+    cdef size_t length
+    cdef bytes result
+    cdef char *destination
     if self.c_byte_buffer != NULL:
       with nogil:
-        reader_status = grpc_byte_buffer_reader_init(
-            &reader, self.c_byte_buffer)
-      if not reader_status:
+        slices = _read_slices(self.c_byte_buffer, &count, &length)
+      if slices == NULL:
         return None
-      result = bytearray()
+      # A single, pre-sized copy of the buffer's contents.
+      result = cpython.PyBytes_FromStringAndSize(NULL, length)
+      destination = cpython.PyBytes_AS_STRING(result)
       with nogil:
-        while grpc_byte_buffer_reader_next(&reader, &data_slice):
-          data_slice_pointer = grpc_slice_start_ptr(data_slice)
-          data_slice_length = grpc_slice_length(data_slice)
-          with gil:
-            result += (<char *>data_slice_pointer)[:data_slice_length]
-          grpc_slice_unref(data_slice)
+        _copy_and_release_slices(slices, count, destination)
+        gpr_free(slices)
+      return result
+    else:
+      return None
+
+  def memoryview(self):
+    """Returns a read-only memoryview of the contents of this buffer.
+
+    The returned memoryview refers directly to the received data when this
+    buffer consists of a single slice and to a single copy of the data
+    otherwise. It remains valid after this buffer is destroyed.
+    """
+    cdef grpc_slice *slices
+    cdef size_t count
+    cdef size_t length
+    cdef _SliceBuffer slice_buffer
+    if self.c_byte_buffer != NULL:
       with nogil:
-        grpc_byte_buffer_reader_destroy(&reader)
-      return bytes(result)
+        slices = _read_slices(self.c_byte_buffer, &count, &length)
+      if slices == NULL:
+        return None
+      slice_buffer = _SliceBuffer()
+      if count == 1:
+        grpc_slice_unref(slice_buffer.c_slice)
+        slice_buffer.c_slice = slices[0]
+        gpr_free(slices)
+      else:
+        with nogil:
+          grpc_slice_unref(slice_buffer.c_slice)
+          slice_buffer.c_slice = grpc_slice_malloc(length)
+          _copy_and_release_slices(
+              slices, count,
+              <char *>grpc_slice_start_ptr(slice_buffer.c_slice))
+          gpr_free(slices)
+      return memoryview(slice_buffer)
     else:
       return None
 
@@ -323,9 +476,21 @@ cdef class ByteBuffer:
   def __str__(self):
     return self.bytes()
 
+  def __bytes__(self):
+    return self.bytes()
+
+  def copy(self):
+    """Returns a ByteBuffer of the same contents without copying them."""
+    cdef ByteBuffer result = ByteBuffer(None)
+    if self.c_byte_buffer != NULL:
+      with nogil:
+        result.c_byte_buffer = grpc_byte_buffer_copy(self.c_byte_buffer)
+    return result
+
   def __dealloc__(self):
     if self.c_byte_buffer != NULL:
       grpc_byte_buffer_destroy(self.c_byte_buffer)
+    _release_borrowed_bytes()
     grpc_shutdown()
 
 
@@ -510,6 +675,42 @@ cdef class Metadata:
   def __iter__(self):
     return _MetadataIterator(self)
 
+  def interned(self):
+    """Returns a Metadata of the same metadata with interned keys."""
+    cdef Metadata result = Metadata(())
+    cdef size_t count = self.c_metadata_array.count
+    cdef size_t i
+    with nogil:
+      result.c_metadata_array.metadata = <grpc_metadata *>gpr_malloc(
+          count*sizeof(grpc_metadata))
+      result.c_metadata_array.count = count
+      result.c_metadata_array.capacity = count
+      for i in range(count):
+        result.c_metadata_array.metadata[i].key = grpc_slice_intern(
+            self.c_metadata_array.metadata[i].key)
+        result.c_metadata_array.metadata[i].value = _copy_slice(
+            self.c_metadata_array.metadata[i].value)
+    return result
+
+  def shared_copy(self):
+    """Returns a Metadata of the same metadata sharing this one's slices.
+
+    Core uses the metadata array of an operation while the operation is in
+    progress, so each operation needs an array of its own, but copying the
+    array is all that is needed to send the same metadata again.
+    """
+    cdef Metadata result = Metadata(())
+    cdef size_t count = self.c_metadata_array.count
+    with nogil:
+      result.c_metadata_array.metadata = <grpc_metadata *>gpr_malloc(
+          count*sizeof(grpc_metadata))
+      memcpy(result.c_metadata_array.metadata,
+             self.c_metadata_array.metadata, count*sizeof(grpc_metadata))
+      result.c_metadata_array.count = count
+      result.c_metadata_array.capacity = count
+    result._slice_owner = self
+    return result
+
   cdef void _claim_slice_ownership(self):
     cdef grpc_metadata_array new_c_metadata_array
     grpc_metadata_array_init(&new_c_metadata_array)
@@ -557,6 +758,15 @@ cdef class Operation:
       return None
     return self._received_message
 
+  @property
+  def received_byte_buffer(self):
+    """The ByteBuffer of the received message, or None if none was received."""
+    if self.c_op.type != GRPC_OP_RECV_MESSAGE:
+      raise TypeError("self must be an operation receiving a message")
+    if self._received_message.c_byte_buffer == NULL:
+      return None
+    return self._received_message
+
   @property
   def received_metadata(self):
     if (self.c_op.type != GRPC_OP_RECV_INITIAL_METADATA and
@@ -627,7 +837,13 @@ def operation_send_message(data, int flags):
   cdef Operation op = Operation()
   op.c_op.type = GRPC_OP_SEND_MESSAGE
   op.c_op.flags = flags
-  byte_buffer = ByteBuffer(data)
+  cdef ByteBuffer byte_buffer
+  if isinstance(data, ByteBuffer):
+    # Core takes ownership of the slices of a sent message, so send a copy
+    # that shares (rather than duplicates) the slices of the given buffer.
+    byte_buffer = data.copy()
+  else:
+    byte_buffer = ByteBuffer(data)
   op.c_op.data.send_message.send_message = byte_buffer.c_byte_buffer
   op.references.append(byte_buffer)
   op.is_valid = True
@@ -756,6 +972,85 @@ cdef class Operations:
     return _OperationsIterator(self)
 
 
+cdef class UnaryUnaryBatch:
+  """The six operations of a unary-unary RPC in a single batch.
+
+  Fills its grpc_op array directly rather than through Operation objects.
+  """
+
+  def __cinit__(self, Metadata metadata not None, payload):
+    grpc_init()
+    self._status_details = grpc_empty_slice()
+    self._sent_metadata = metadata
+    if isinstance(payload, ByteBuffer):
+      # Core takes ownership of the slices of a sent message, so send a copy
+      # that shares (rather than duplicates) the slices of the given buffer.
+      self._sent_message = payload.copy()
+    else:
+      self._sent_message = ByteBuffer(payload)
+    self._received_initial_metadata = Metadata(())
+    self._received_message = ByteBuffer(None)
+    self._received_trailing_metadata = Metadata(())
+
+    self.c_ops[0].type = GRPC_OP_SEND_INITIAL_METADATA
+    self.c_ops[0].data.send_initial_metadata.count = (
+        metadata.c_metadata_array.count)
+    self.c_ops[0].data.send_initial_metadata.metadata = (
+        metadata.c_metadata_array.metadata)
+    self.c_ops[1].type = GRPC_OP_SEND_MESSAGE
+    self.c_ops[1].data.send_message.send_message = (
+        self._sent_message.c_byte_buffer)
+    self.c_ops[2].type = GRPC_OP_SEND_CLOSE_FROM_CLIENT
+    self.c_ops[3].type = GRPC_OP_RECV_INITIAL_METADATA
+    self.c_ops[3].data.receive_initial_metadata.receive_initial_metadata = (
+        &self._received_initial_metadata.c_metadata_array)
+    self.c_ops[4].type = GRPC_OP_RECV_MESSAGE
+    self.c_ops[4].data.receive_message.receive_message = (
+        &self._received_message.c_byte_buffer)
+    self.c_ops[5].type = GRPC_OP_RECV_STATUS_ON_CLIENT
+    self.c_ops[5].data.receive_status_on_client.trailing_metadata = (
+        &self._received_trailing_metadata.c_metadata_array)
+    self.c_ops[5].data.receive_status_on_client.status = (
+        &self._received_status_code)
+    self.c_ops[5].data.receive_status_on_client.status_details = (
+        &self._status_details)
+
+  @property
+  def received_initial_metadata(self):
+    return self._received_initial_metadata
+
+  @property
+  def received_message(self):
+    return self._received_message
+
+  @property
+  def received_byte_buffer(self):
+    """The ByteBuffer of the received message, or None if none was received."""
+    if self._received_message.c_byte_buffer == NULL:
+      return None
+    return self._received_message
+
+  @property
+  def received_trailing_metadata(self):
+    return self._received_trailing_metadata
+
+  @property
+  def received_status_code(self):
+    return self._received_status_code
+
+  @property
+  def received_status_details(self):
+    return _slice_bytes(self._status_details)
+
+  cdef void _claim_slice_ownership(self):
+    self._received_initial_metadata._claim_slice_ownership()
+    self._received_trailing_metadata._claim_slice_ownership()
+
+  def __dealloc__(self):
+    grpc_slice_unref(self._status_details)
+    grpc_shutdown()
+
+
 cdef class CompressionOptions:
 
   def __cinit__(self):
@@ -0,0 +1,116 @@
+# Copyright 2017, Google Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#     * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+#     * Neither the name of Google Inc. nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import collections
+import threading
+
+
+class ServerRPCClientState:
+  open = 'open'
+  closed = 'closed'
+  cancelled = 'cancelled'
+
+
+_CLIENT_OPEN = ServerRPCClientState.open
+_CLIENT_CANCELLED = ServerRPCClientState.cancelled
+_NOT_FINISHED = (None, ())
+
+
+cdef class ServerRPCState:
+  """The state of an RPC being serviced.
+
+  Every attribute other than condition is guarded by condition.
+  """
+
+  def __cinit__(self):
+    self.condition = threading.Condition()
+    self.due = 0
+    self.request = None
+    self.client = _CLIENT_OPEN
+    self.initial_metadata_allowed = True
+    self.disable_next_compression = False
+    self.trailing_metadata = None
+    self.code = None
+    self.details = None
+    self.statused = False
+    self.rpc_errors = []
+    self.callbacks = []
+    # Serialized responses awaiting transmission behind the one being sent
+    # for RPCs with a write window.
+    self.queued_responses = collections.deque()
+
+  cdef tuple _finish_batch(self, unsigned int token):
+    self.due &= ~token
+    if ((self.client is _CLIENT_CANCELLED or self.statused) and
+        self.due == 0):
+      callbacks = self.callbacks
+      self.callbacks = None
+      return self, callbacks
+    else:
+      return _NOT_FINISHED
+
+  def finish_batch(self, unsigned int token):
+    """Accounts for the completion of the batch of the given token.
+
+    Must be called with condition held.
+
+    Returns:
+      This state and the callbacks to be called if the completion of the batch
+      ends the RPC, or None and an empty sequence otherwise.
+    """
+    return self._finish_batch(token)
+
+  def batch_finisher(self, unsigned int token, bint notify):
+    """Returns an event tag that accounts for the completion of a batch.
+
+    Args:
+      token: The token of the batch.
+      notify: Whether to notify the waiters on condition when the batch
+        completes.
+
+    Returns:
+      A callable that accepts the completion event of the batch and returns
+        the value of finish_batch.
+    """
+    return _ServerBatchFinisher(self, token, notify)
+
+
+cdef class _ServerBatchFinisher:
+
+  def __cinit__(self, ServerRPCState state not None, unsigned int token,
+                bint notify):
+    self.state = state
+    self.token = token
+    self.notify = notify
+
+  def __call__(self, unused_event):
+    with self.state.condition:
+      if self.notify:
+        self.state.condition.notify_all()
+      return self.state._finish_batch(self.token)
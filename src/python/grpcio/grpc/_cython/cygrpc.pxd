@@ -34,5 +34,6 @@ include "_cygrpc/channel.pxd.pxi"
 include "_cygrpc/credentials.pxd.pxi"
 include "_cygrpc/completion_queue.pxd.pxi"
 include "_cygrpc/records.pxd.pxi"
+include "_cygrpc/rpc_state.pxd.pxi"
 include "_cygrpc/security.pxd.pxi"
 include "_cygrpc/server.pxd.pxi"
@@ -34,35 +34,44 @@ import logging
 import threading
 import time
 
+from concurrent import futures
+import six
+
 import grpc
 from grpc import _common
+from grpc import _utilities
 from grpc._cython import cygrpc
 from grpc.framework.foundation import callable_util
 
 _SHUTDOWN_TAG = 'shutdown'
 _REQUEST_CALL_TAG = 'request_call'
 
-_RECEIVE_CLOSE_ON_SERVER_TOKEN = 'receive_close_on_server'
-_SEND_INITIAL_METADATA_TOKEN = 'send_initial_metadata'
-_RECEIVE_MESSAGE_TOKEN = 'receive_message'
-_SEND_MESSAGE_TOKEN = 'send_message'
-_SEND_INITIAL_METADATA_AND_SEND_MESSAGE_TOKEN = (
-    'send_initial_metadata * send_message')
-_SEND_STATUS_FROM_SERVER_TOKEN = 'send_status_from_server'
-_SEND_INITIAL_METADATA_AND_SEND_STATUS_FROM_SERVER_TOKEN = (
-    'send_initial_metadata * send_status_from_server')
+# The tokens of the batches of an RPC are distinct bits so that the batches
+# due from the RPC's completion queue form a bitmask.
+_RECEIVE_CLOSE_ON_SERVER_TOKEN = 1 << 0
+_SEND_INITIAL_METADATA_TOKEN = 1 << 1
+_RECEIVE_MESSAGE_TOKEN = 1 << 2
+_SEND_MESSAGE_TOKEN = 1 << 3
+_SEND_INITIAL_METADATA_AND_SEND_MESSAGE_TOKEN = 1 << 4
+_SEND_STATUS_FROM_SERVER_TOKEN = 1 << 5
+_SEND_INITIAL_METADATA_AND_SEND_STATUS_FROM_SERVER_TOKEN = 1 << 6
 
-_OPEN = 'open'
-_CLOSED = 'closed'
-_CANCELLED = 'cancelled'
+_OPEN = cygrpc.ServerRPCClientState.open
+_CLOSED = cygrpc.ServerRPCClientState.closed
+_CANCELLED = cygrpc.ServerRPCClientState.cancelled
 
 _EMPTY_FLAGS = 0
 
 _UNEXPECTED_EXIT_SERVER_GRACE = 1.0
 
+_DEFAULT_PENDING_REQUEST_CALLS = 1
+_DEFAULT_COMPLETION_QUEUE_COUNT = 1
+_MAXIMUM_EVENTS_PER_POLL = 64
+
 
-def _serialized_request(request_event):
-    return request_event.batch_operations[0].received_message.bytes()
+def _serialized_request(request_event, request_deserializer):
+    return _common.received_message(request_event.batch_operations[0],
+                                    request_deserializer)
 
 
 def _application_code(code):
@@ -94,21 +103,7 @@ class _HandlerCallDetails(
     pass
 
 
-class _RPCState(object):
-
-    def __init__(self):
-        self.condition = threading.Condition()
-        self.due = set()
-        self.request = None
-        self.client = _OPEN
-        self.initial_metadata_allowed = True
-        self.disable_next_compression = False
-        self.trailing_metadata = None
-        self.code = None
-        self.details = None
-        self.statused = False
-        self.rpc_errors = []
-        self.callbacks = []
+_RPCState = cygrpc.ServerRPCState
 
 
 def _raise_rpc_error(state):
@@ -117,25 +112,6 @@ def _raise_rpc_error(state):
     raise rpc_error
 
 
-def _possibly_finish_call(state, token):
-    state.due.remove(token)
-    if (state.client is _CANCELLED or state.statused) and not state.due:
-        callbacks = state.callbacks
-        state.callbacks = None
-        return state, callbacks
-    else:
-        return None, ()
-
-
-def _send_status_from_server(state, token):
-
-    def send_status_from_server(unused_send_status_from_server_event):
-        with state.condition:
-            return _possibly_finish_call(state, token)
-
-    return send_status_from_server
-
-
 def _abort(state, call, code, details):
     if state.client is not _CANCELLED:
         effective_code = _abortion_code(state, code)
@@ -153,10 +129,9 @@ def _abort(state, call, code, details):
                 effective_code, effective_details, _EMPTY_FLAGS),)
             token = _SEND_STATUS_FROM_SERVER_TOKEN
         call.start_server_batch(
-            cygrpc.Operations(operations),
-            _send_status_from_server(state, token))
+            cygrpc.Operations(operations), state.batch_finisher(token, False))
         state.statused = True
-        state.due.add(token)
+        state.due |= token
 
 
 def _receive_close_on_server(state):
@@ -169,7 +144,7 @@ def _receive_close_on_server(state):
             elif state.client is _OPEN:
                 state.client = _CLOSED
             state.condition.notify_all()
-            return _possibly_finish_call(state, _RECEIVE_CLOSE_ON_SERVER_TOKEN)
+            return state.finish_batch(_RECEIVE_CLOSE_ON_SERVER_TOKEN)
 
     return receive_close_on_server
 
@@ -177,13 +152,14 @@ def _receive_close_on_server(state):
 def _receive_message(state, call, request_deserializer):
 
     def receive_message(receive_message_event):
-        serialized_request = _serialized_request(receive_message_event)
+        serialized_request = _serialized_request(receive_message_event,
+                                                 request_deserializer)
         if serialized_request is None:
             with state.condition:
                 if state.client is _OPEN:
                     state.client = _CLOSED
                 state.condition.notify_all()
-                return _possibly_finish_call(state, _RECEIVE_MESSAGE_TOKEN)
+                return state.finish_batch(_RECEIVE_MESSAGE_TOKEN)
         else:
             request = _common.deserialize(serialized_request,
                                           request_deserializer)
@@ -194,36 +170,19 @@ def _receive_message(state, call, request_deserializer):
                 else:
                     state.request = request
                 state.condition.notify_all()
-                return _possibly_finish_call(state, _RECEIVE_MESSAGE_TOKEN)
+                return state.finish_batch(_RECEIVE_MESSAGE_TOKEN)
 
     return receive_message
 
 
-def _send_initial_metadata(state):
-
-    def send_initial_metadata(unused_send_initial_metadata_event):
-        with state.condition:
-            return _possibly_finish_call(state, _SEND_INITIAL_METADATA_TOKEN)
-
-    return send_initial_metadata
-
-
-def _send_message(state, token):
-
-    def send_message(unused_send_message_event):
-        with state.condition:
-            state.condition.notify_all()
-            return _possibly_finish_call(state, token)
-
-    return send_message
-
-
 class _Context(grpc.ServicerContext):
 
     def __init__(self, rpc_event, state, request_deserializer):
         self._rpc_event = rpc_event
         self._state = state
         self._request_deserializer = request_deserializer
+        self._invocation_metadata = None
+        self._invocation_metadata_dict = None
 
     def is_active(self):
         with self._state.condition:
@@ -250,7 +209,18 @@ class _Context(grpc.ServicerContext):
             self._state.disable_next_compression = True
 
     def invocation_metadata(self):
-        return _common.to_application_metadata(self._rpc_event.request_metadata)
+        if self._invocation_metadata is None:
+            self._invocation_metadata = _common.to_application_metadata(
+                self._rpc_event.request_metadata)
+        return self._invocation_metadata
+
+    def invocation_metadata_dict(self):
+        if self._invocation_metadata_dict is None:
+            invocation_metadata_dict = {}
+            for key, value in self.invocation_metadata():
+                invocation_metadata_dict.setdefault(key, value)
+            self._invocation_metadata_dict = invocation_metadata_dict
+        return self._invocation_metadata_dict
 
     def peer(self):
         return _common.decode(self._rpc_event.operation_call.peer())
@@ -266,16 +236,16 @@ class _Context(grpc.ServicerContext):
                         _EMPTY_FLAGS)
                     self._rpc_event.operation_call.start_server_batch(
                         cygrpc.Operations((operation,)),
-                        _send_initial_metadata(self._state))
+                        self._state.batch_finisher(_SEND_INITIAL_METADATA_TOKEN,
+                                                   False))
                     self._state.initial_metadata_allowed = False
-                    self._state.due.add(_SEND_INITIAL_METADATA_TOKEN)
+                    self._state.due |= _SEND_INITIAL_METADATA_TOKEN
                 else:
                     raise ValueError('Initial metadata no longer allowed!')
 
     def set_trailing_metadata(self, trailing_metadata):
         with self._state.condition:
-            self._state.trailing_metadata = _common.to_cygrpc_metadata(
-                trailing_metadata)
+            self._state.trailing_metadata = trailing_metadata
 
     def set_code(self, code):
         with self._state.condition:
@@ -304,13 +274,13 @@ class _RequestIterator(object):
                     (cygrpc.operation_receive_message(_EMPTY_FLAGS),)),
                 _receive_message(self._state, self._call,
                                  self._request_deserializer))
-            self._state.due.add(_RECEIVE_MESSAGE_TOKEN)
+            self._state.due |= _RECEIVE_MESSAGE_TOKEN
 
     def _look_for_request(self):
         if self._state.client is _CANCELLED:
             _raise_rpc_error(self._state)
         elif (self._state.request is None and
-              _RECEIVE_MESSAGE_TOKEN not in self._state.due):
+              not self._state.due & _RECEIVE_MESSAGE_TOKEN):
             raise StopIteration()
         else:
             request = self._state.request
@@ -336,37 +306,87 @@ class _RequestIterator(object):
         return self._next()
 
 
-def _unary_request(rpc_event, state, request_deserializer):
+def _receive_unary_request(rpc_event, state, request_deserializer, on_request,
+                           rpc_future):
 
-    def unary_request():
+    def receive_unary_request(receive_message_event):
+        serialized_request = _serialized_request(receive_message_event,
+                                                 request_deserializer)
+        if serialized_request is None:
+            request = None
+            with state.condition:
+                if state.client is _OPEN:
+                    state.client = _CLOSED
+                if state.client is not _CANCELLED and not state.statused:
+                    details = '"{}" requires exactly one request message.'.format(
+                        rpc_event.request_call_details.method)
+                    _abort(state, rpc_event.operation_call,
+                           cygrpc.StatusCode.unimplemented,
+                           _common.encode(details))
+        else:
+            request = _common.deserialize(serialized_request,
+                                          request_deserializer)
+            with state.condition:
+                if request is None:
+                    _abort(state, rpc_event.operation_call,
+                           cygrpc.StatusCode.internal,
+                           b'Exception deserializing request!')
+                elif state.client is _CANCELLED or state.statused:
+                    request = None
+        if request is None:
+            rpc_future.set_result(None)
+        else:
+            on_request(request, rpc_future)
         with state.condition:
-            if state.client is _CANCELLED or state.statused:
-                return None
-            else:
-                rpc_event.operation_call.start_server_batch(
-                    cygrpc.Operations(
-                        (cygrpc.operation_receive_message(_EMPTY_FLAGS),)),
-                    _receive_message(state, rpc_event.operation_call,
-                                     request_deserializer))
-                state.due.add(_RECEIVE_MESSAGE_TOKEN)
-                while True:
-                    state.condition.wait()
-                    if state.request is None:
-                        if state.client is _CLOSED:
-                            details = '"{}" requires exactly one request message.'.format(
-                                rpc_event.request_call_details.method)
-                            _abort(state, rpc_event.operation_call,
-                                   cygrpc.StatusCode.unimplemented,
-                                   _common.encode(details))
-                            return None
-                        elif state.client is _CANCELLED:
-                            return None
-                    else:
-                        request = state.request
-                        state.request = None
-                        return request
+            return state.finish_batch(_RECEIVE_MESSAGE_TOKEN)
+
+    return receive_unary_request
+
+
+def _unary_request(rpc_event, state, request_deserializer, on_request):
+    """Starts receiving the request message of a unary-request RPC.
 
-    return unary_request
+  The receive_message operation is started as the RPC is accepted so that no
+  thread waits for the request to arrive.
+
+  Args:
+    rpc_event: The request_call event of the RPC.
+    state: The _RPCState of the RPC, the condition of which must be held.
+    request_deserializer: The request deserialization behavior of the RPC.
+    on_request: A callable to be called with the request and the returned
+      future on the thread that received the request, if the RPC is still
+      active once the request has been received. It must complete the future
+      once the RPC's handling is done.
+
+  Returns:
+    A future that completes when the RPC's handling is done.
+  """
+    rpc_future = futures.Future()
+    rpc_event.operation_call.start_server_batch(
+        cygrpc.Operations((cygrpc.operation_receive_message(_EMPTY_FLAGS),)),
+        _receive_unary_request(rpc_event, state, request_deserializer,
+                               on_request, rpc_future))
+    state.due |= _RECEIVE_MESSAGE_TOKEN
+    return rpc_future
+
+
+def _submit(thread_pool, rpc_future, behavior, rpc_event, state, *args):
+
+    def run_and_complete():
+        try:
+            behavior(rpc_event, state, *args)
+        finally:
+            rpc_future.set_result(None)
+
+    try:
+        thread_pool.submit(run_and_complete)
+    except Exception:  # pylint: disable=broad-except
+        logging.exception('Exception submitting RPC to thread pool!')
+        with state.condition:
+            _abort(state, rpc_event.operation_call,
+                   cygrpc.StatusCode.unavailable,
+                   b'Server thread pool unavailable!')
+        rpc_future.set_result(None)
 
 
 def _call_behavior(rpc_event, state, behavior, argument, request_deserializer):
@@ -426,14 +446,85 @@ def _send_response(rpc_event, state, serialized_response):
                                                             _EMPTY_FLAGS),)
                 token = _SEND_MESSAGE_TOKEN
             rpc_event.operation_call.start_server_batch(
-                cygrpc.Operations(operations), _send_message(state, token))
-            state.due.add(token)
+                cygrpc.Operations(operations),
+                state.batch_finisher(token, True))
+            state.due |= token
             while True:
                 state.condition.wait()
-                if token not in state.due:
+                if not state.due & token:
                     return state.client is not _CANCELLED and not state.statused
 
 
+def _send_queued_response(rpc_event, state):
+    serialized_response = state.queued_responses.popleft()
+    if state.queued_responses:
+        # Another response will soon follow, so this one may be buffered.
+        flags = cygrpc.WriteFlag.buffer_hint
+    else:
+        flags = _EMPTY_FLAGS
+    if state.initial_metadata_allowed:
+        operations = (cygrpc.operation_send_initial_metadata(
+            _common.EMPTY_METADATA, _EMPTY_FLAGS),
+                      cygrpc.operation_send_message(serialized_response,
+                                                    flags),)
+        state.initial_metadata_allowed = False
+        token = _SEND_INITIAL_METADATA_AND_SEND_MESSAGE_TOKEN
+    else:
+        operations = (cygrpc.operation_send_message(serialized_response,
+                                                    flags),)
+        token = _SEND_MESSAGE_TOKEN
+    rpc_event.operation_call.start_server_batch(
+        cygrpc.Operations(operations),
+        _send_queued_message(rpc_event, state, token))
+    state.due |= token
+
+
+def _send_queued_message(rpc_event, state, token):
+
+    def send_queued_message(unused_send_message_event):
+        with state.condition:
+            state.condition.notify_all()
+            rpc_state_and_callbacks = state.finish_batch(token)
+            if state.client is _CANCELLED or state.statused:
+                state.queued_responses.clear()
+            elif state.queued_responses:
+                _send_queued_response(rpc_event, state)
+            return rpc_state_and_callbacks
+
+    return send_queued_message
+
+
+def _sending(state):
+    return bool(state.due & (_SEND_MESSAGE_TOKEN |
+                             _SEND_INITIAL_METADATA_AND_SEND_MESSAGE_TOKEN))
+
+
+def _queue_response(rpc_event, state, serialized_response, write_window):
+    with state.condition:
+        while True:
+            if state.client is _CANCELLED or state.statused:
+                return False
+            elif len(state.queued_responses) < write_window:
+                break
+            else:
+                state.condition.wait()
+        state.queued_responses.append(serialized_response)
+        if not _sending(state):
+            _send_queued_response(rpc_event, state)
+        return True
+
+
+def _drain_queued_responses(state):
+    with state.condition:
+        while True:
+            if state.client is _CANCELLED or state.statused:
+                return False
+            elif not state.queued_responses and not _sending(state):
+                return True
+            else:
+                state.condition.wait()
+
+
 def _status(rpc_event, state, serialized_response):
     with state.condition:
         if state.client is not _CANCELLED:
@@ -455,9 +546,9 @@ def _status(rpc_event, state, serialized_response):
                                                   _EMPTY_FLAGS))
             rpc_event.operation_call.start_server_batch(
                 cygrpc.Operations(operations),
-                _send_status_from_server(state, _SEND_STATUS_FROM_SERVER_TOKEN))
+                state.batch_finisher(_SEND_STATUS_FROM_SERVER_TOKEN, False))
             state.statused = True
-            state.due.add(_SEND_STATUS_FROM_SERVER_TOKEN)
+            state.due |= _SEND_STATUS_FROM_SERVER_TOKEN
 
 
 def _unary_response_in_pool(rpc_event, state, behavior, argument_thunk,
@@ -473,8 +564,13 @@ def _unary_response_in_pool(rpc_event, state, behavior, argument_thunk,
                 _status(rpc_event, state, serialized_response)
 
 
-def _stream_response_in_pool(rpc_event, state, behavior, argument_thunk,
-                             request_deserializer, response_serializer):
+def _stream_response_in_pool(rpc_event,
+                             state,
+                             behavior,
+                             argument_thunk,
+                             request_deserializer,
+                             response_serializer,
+                             write_window=None):
     argument = argument_thunk()
     if argument is not None:
         response_iterator, proceed = _call_behavior(
@@ -485,38 +581,66 @@ def _stream_response_in_pool(rpc_event, state, behavior, argument_thunk,
                     rpc_event, state, response_iterator)
                 if proceed:
                     if response is None:
-                        _status(rpc_event, state, None)
+                        if (write_window is None or
+                                _drain_queued_responses(state)):
+                            _status(rpc_event, state, None)
                         break
                     else:
                         serialized_response = _serialize_response(
                             rpc_event, state, response, response_serializer)
-                        if serialized_response is not None:
+                        if serialized_response is None:
+                            break
+                        elif write_window is None:
                             proceed = _send_response(rpc_event, state,
                                                      serialized_response)
-                            if not proceed:
-                                break
                         else:
+                            proceed = _queue_response(rpc_event, state,
+                                                      serialized_response,
+                                                      write_window)
+                        if not proceed:
                             break
                 else:
                     break
 
 
 def _handle_unary_unary(rpc_event, state, method_handler, thread_pool):
-    unary_request = _unary_request(rpc_event, state,
-                                   method_handler.request_deserializer)
-    return thread_pool.submit(_unary_response_in_pool, rpc_event, state,
-                              method_handler.unary_unary, unary_request,
-                              method_handler.request_deserializer,
-                              method_handler.response_serializer)
+
+    def on_request(request, rpc_future):
+        _submit(thread_pool, rpc_future, _unary_response_in_pool, rpc_event,
+                state, method_handler.unary_unary, lambda: request,
+                method_handler.request_deserializer,
+                method_handler.response_serializer)
+
+    return _unary_request(rpc_event, state, method_handler.request_deserializer,
+                          on_request)
+
+
+def _handle_inline_unary_unary(rpc_event, state, method_handler):
+
+    def on_request(request, rpc_future):
+        try:
+            _unary_response_in_pool(rpc_event, state,
+                                    method_handler.unary_unary, lambda: request,
+                                    method_handler.request_deserializer,
+                                    method_handler.response_serializer)
+        finally:
+            rpc_future.set_result(None)
+
+    return _unary_request(rpc_event, state, method_handler.request_deserializer,
+                          on_request)
 
 
 def _handle_unary_stream(rpc_event, state, method_handler, thread_pool):
-    unary_request = _unary_request(rpc_event, state,
-                                   method_handler.request_deserializer)
-    return thread_pool.submit(_stream_response_in_pool, rpc_event, state,
-                              method_handler.unary_stream, unary_request,
-                              method_handler.request_deserializer,
-                              method_handler.response_serializer)
+
+    def on_request(request, rpc_future):
+        _submit(thread_pool, rpc_future, _stream_response_in_pool, rpc_event,
+                state, method_handler.unary_stream, lambda: request,
+                method_handler.request_deserializer,
+                method_handler.response_serializer,
+                getattr(method_handler, 'write_window', None))
+
+    return _unary_request(rpc_event, state, method_handler.request_deserializer,
+                          on_request)
 
 
 def _handle_stream_unary(rpc_event, state, method_handler, thread_pool):
@@ -534,15 +658,19 @@ def _handle_stream_stream(rpc_event, state, method_handler, thread_pool):
     return thread_pool.submit(
         _stream_response_in_pool, rpc_event, state,
         method_handler.stream_stream, lambda: request_iterator,
-        method_handler.request_deserializer, method_handler.response_serializer)
+        method_handler.request_deserializer, method_handler.response_serializer,
+        getattr(method_handler, 'write_window', None))
 
 
-def _find_method_handler(rpc_event, generic_handlers):
+def _find_method_handler(rpc_event, method_handlers, generic_handlers):
+    method_handler = method_handlers.get(rpc_event.request_call_details.method)
+    if method_handler is not None:
+        return method_handler
+    handler_call_details = _HandlerCallDetails(
+        _common.decode(rpc_event.request_call_details.method),
+        rpc_event.request_metadata)
     for generic_handler in generic_handlers:
-        method_handler = generic_handler.service(
-            _HandlerCallDetails(
-                _common.decode(rpc_event.request_call_details.method),
-                rpc_event.request_metadata))
+        method_handler = generic_handler.service(handler_call_details)
         if method_handler is not None:
             return method_handler
     else:
@@ -568,7 +696,7 @@ def _handle_with_method_handler(rpc_event, method_handler, thread_pool):
             cygrpc.Operations(
                 (cygrpc.operation_receive_close_on_server(_EMPTY_FLAGS),)),
             _receive_close_on_server(state))
-        state.due.add(_RECEIVE_CLOSE_ON_SERVER_TOKEN)
+        state.due |= _RECEIVE_CLOSE_ON_SERVER_TOKEN
         if method_handler.request_streaming:
             if method_handler.response_streaming:
                 return state, _handle_stream_stream(rpc_event, state,
@@ -580,17 +708,21 @@ def _handle_with_method_handler(rpc_event, method_handler, thread_pool):
             if method_handler.response_streaming:
                 return state, _handle_unary_stream(rpc_event, state,
                                                    method_handler, thread_pool)
+            elif getattr(method_handler, 'inline', False):
+                return state, _handle_inline_unary_unary(rpc_event, state,
+                                                         method_handler)
             else:
                 return state, _handle_unary_unary(rpc_event, state,
                                                   method_handler, thread_pool)
 
 
-def _handle_call(rpc_event, generic_handlers, thread_pool,
+def _handle_call(rpc_event, method_handlers, generic_handlers, thread_pool,
                  concurrency_exceeded):
     if not rpc_event.success:
         return None, None
     if rpc_event.request_call_details.method is not None:
-        method_handler = _find_method_handler(rpc_event, generic_handlers)
+        method_handler = _find_method_handler(rpc_event, method_handlers,
+                                              generic_handlers)
         if method_handler is None:
             return _reject_rpc(rpc_event, cygrpc.StatusCode.unimplemented,
                                b'Method not found!'), None
@@ -613,26 +745,72 @@ class _ServerStage(enum.Enum):
 
 class _ServerState(object):
 
-    def __init__(self, completion_queue, server, generic_handlers, thread_pool,
-                 maximum_concurrent_rpcs):
+    def __init__(self, completion_queues, server, generic_handlers, thread_pool,
+                 maximum_concurrent_rpcs, pending_request_calls):
         self.lock = threading.Lock()
-        self.completion_queue = completion_queue
         self.server = server
-        self.generic_handlers = list(generic_handlers)
+        # Method handlers of leading DictionaryGenericHandlers keyed by the
+        # method's wire name and the GenericRpcHandlers that must be consulted
+        # (in order) for any method not found among them.
+        self.method_handlers = {}
+        self.generic_handlers = []
+        _merge_generic_handlers(self, generic_handlers)
         self.thread_pool = thread_pool
         self.stage = _ServerStage.STOPPED
         self.shutdown_events = None
         self.maximum_concurrent_rpcs = maximum_concurrent_rpcs
         self.active_rpc_count = 0
+        # The number of request_call tags each shard keeps outstanding while
+        # serving.
+        self.pending_request_calls = pending_request_calls
+        self.shards = tuple(
+            _ServerShard(completion_queue)
+            for completion_queue in completion_queues)
+        self.stopped_shard_count = 0
+
+
+class _ServerShard(object):
+    """The serving state associated with one of a server's completion queues.
+
+    Each shard is drained by its own thread. RPCs accepted on a shard's
+    completion queue have all of their events delivered to that queue, so the
+    bookkeeping of those RPCs is guarded by the shard's lock rather than by the
+    lock of the server as a whole.
+    """
+
+    def __init__(self, completion_queue):
+        self.lock = threading.Lock()
+        self.completion_queue = completion_queue
+        self.serving = False
+        self.request_call_count = 0
 
         # TODO(https://github.com/grpc/grpc/issues/6597): eliminate these fields.
         self.rpc_states = set()
-        self.due = set()
+        self.shutdown_due = False
+
+
+def _method_key(method):
+    return method if isinstance(method, bytes) else method.encode('utf8')
+
+
+def _merge_generic_handlers(state, generic_handlers):
+    for generic_handler in generic_handlers:
+        # Only handlers registered before any other kind of handler may be
+        # merged into the dispatch table; later ones must be consulted after
+        # the handlers that precede them.
+        if (not state.generic_handlers and
+                type(generic_handler) is _utilities.DictionaryGenericHandler):
+            for method, method_handler in six.iteritems(
+                    generic_handler._method_handlers):
+                state.method_handlers.setdefault(
+                    _method_key(method), method_handler)
+        else:
+            state.generic_handlers.append(generic_handler)
 
 
 def _add_generic_handlers(state, generic_handlers):
     with state.lock:
-        state.generic_handlers.extend(generic_handlers)
+        _merge_generic_handlers(state, generic_handlers)
 
 
 def _add_insecure_port(state, address):
@@ -646,21 +824,37 @@ def _add_secure_port(state, address, server_credentials):
                                            server_credentials._credentials)
 
 
-def _request_call(state):
-    state.server.request_call(state.completion_queue, state.completion_queue,
+def _request_call(state, shard):
+    state.server.request_call(shard.completion_queue, shard.completion_queue,
                               _REQUEST_CALL_TAG)
-    state.due.add(_REQUEST_CALL_TAG)
+    shard.request_call_count += 1
 
 
 # TODO(https://github.com/grpc/grpc/issues/6597): delete this function.
-def _stop_serving(state):
-    if not state.rpc_states and not state.due:
-        for shutdown_event in state.shutdown_events:
-            shutdown_event.set()
-        state.stage = _ServerStage.STOPPED
-        return True
-    else:
+def _stop_serving(shard):
+    return (not shard.serving and not shard.rpc_states and
+            not shard.shutdown_due and not shard.request_call_count)
+
+
+def _on_shard_stopped(state):
+    with state.lock:
+        state.stopped_shard_count += 1
+        if state.stopped_shard_count == len(state.shards):
+            for shutdown_event in state.shutdown_events:
+                shutdown_event.set()
+            state.stage = _ServerStage.STOPPED
+
+
+def _concurrency_exceeded(state):
+    if state.maximum_concurrent_rpcs is None:
         return False
+    else:
+        with state.lock:
+            if state.active_rpc_count < state.maximum_concurrent_rpcs:
+                state.active_rpc_count += 1
+                return False
+            else:
+                return True
 
 
 def _on_call_completed(state):
@@ -668,43 +862,69 @@ def _on_call_completed(state):
         state.active_rpc_count -= 1
 
 
-def _serve(state):
-    while True:
-        event = state.completion_queue.poll()
-        if event.tag is _SHUTDOWN_TAG:
-            with state.lock:
-                state.due.remove(_SHUTDOWN_TAG)
-                if _stop_serving(state):
-                    return
-        elif event.tag is _REQUEST_CALL_TAG:
-            with state.lock:
-                state.due.remove(_REQUEST_CALL_TAG)
-                concurrency_exceeded = (
-                    state.maximum_concurrent_rpcs is not None and
-                    state.active_rpc_count >= state.maximum_concurrent_rpcs)
-                rpc_state, rpc_future = _handle_call(
-                    event, state.generic_handlers, state.thread_pool,
-                    concurrency_exceeded)
-                if rpc_state is not None:
-                    state.rpc_states.add(rpc_state)
-                if rpc_future is not None:
-                    state.active_rpc_count += 1
-                    rpc_future.add_done_callback(
-                        lambda unused_future: _on_call_completed(state))
-                if state.stage is _ServerStage.STARTED:
-                    _request_call(state)
-                elif _stop_serving(state):
-                    return
-        else:
-            rpc_state, callbacks = event.tag(event)
-            for callback in callbacks:
-                callable_util.call_logging_exceptions(
-                    callback, 'Exception calling callback!')
+def _serve_event(state, shard, event):
+    if event.tag is _SHUTDOWN_TAG:
+        with shard.lock:
+            shard.shutdown_due = False
+            if _stop_serving(shard):
+                return True
+    elif event.tag is _REQUEST_CALL_TAG:
+        concurrency_exceeded = _concurrency_exceeded(state)
+        with shard.lock:
+            shard.request_call_count -= 1
+            rpc_state, rpc_future = _handle_call(
+                event, state.method_handlers, state.generic_handlers,
+                state.thread_pool, concurrency_exceeded)
             if rpc_state is not None:
-                with state.lock:
-                    state.rpc_states.remove(rpc_state)
-                    if _stop_serving(state):
-                        return
+                shard.rpc_states.add(rpc_state)
+            if shard.serving:
+                _request_call(state, shard)
+                stopped = False
+            else:
+                stopped = _stop_serving(shard)
+        if (state.maximum_concurrent_rpcs is not None and
+                not concurrency_exceeded):
+            if rpc_future is None:
+                _on_call_completed(state)
+            else:
+                rpc_future.add_done_callback(
+                    lambda unused_future: _on_call_completed(state))
+        if stopped:
+            return True
+    else:
+        rpc_state, callbacks = event.tag(event)
+        for callback in callbacks:
+            callable_util.call_logging_exceptions(callback,
+                                                  'Exception calling callback!')
+        if rpc_state is not None:
+            with shard.lock:
+                shard.rpc_states.remove(rpc_state)
+                if _stop_serving(shard):
+                    return True
+    return False
+
+
+def _serve_shard(state, shard):
+    while True:
+        for event in shard.completion_queue.poll_many(_MAXIMUM_EVENTS_PER_POLL):
+            if _serve_event(state, shard, event):
+                return
+
+
+def _serve(state, shard):
+    _serve_shard(state, shard)
+    _on_shard_stopped(state)
+
+
+def _cancel_all_calls(state):
+    state.server.cancel_all_calls()
+    # TODO(https://github.com/grpc/grpc/issues/6597): delete this loop.
+    for shard in state.shards:
+        with shard.lock:
+            for rpc_state in shard.rpc_states:
+                with rpc_state.condition:
+                    rpc_state.client = _CANCELLED
+                    rpc_state.condition.notify_all()
 
 
 def _stop(state, grace):
@@ -715,30 +935,26 @@ def _stop(state, grace):
             return shutdown_event
         else:
             if state.stage is _ServerStage.STARTED:
-                state.server.shutdown(state.completion_queue, _SHUTDOWN_TAG)
+                for shard in state.shards:
+                    with shard.lock:
+                        shard.serving = False
+                notifying_shard = state.shards[0]
+                with notifying_shard.lock:
+                    state.server.shutdown(notifying_shard.completion_queue,
+                                          _SHUTDOWN_TAG)
+                    notifying_shard.shutdown_due = True
                 state.stage = _ServerStage.GRACE
                 state.shutdown_events = []
-                state.due.add(_SHUTDOWN_TAG)
             shutdown_event = threading.Event()
             state.shutdown_events.append(shutdown_event)
             if grace is None:
-                state.server.cancel_all_calls()
-                # TODO(https://github.com/grpc/grpc/issues/6597): delete this loop.
-                for rpc_state in state.rpc_states:
-                    with rpc_state.condition:
-                        rpc_state.client = _CANCELLED
-                        rpc_state.condition.notify_all()
+                _cancel_all_calls(state)
             else:
 
                 def cancel_all_calls_after_grace():
                     shutdown_event.wait(timeout=grace)
                     with state.lock:
-                        state.server.cancel_all_calls()
-                        # TODO(https://github.com/grpc/grpc/issues/6597): delete this loop.
-                        for rpc_state in state.rpc_states:
-                            with rpc_state.condition:
-                                rpc_state.client = _CANCELLED
-                                rpc_state.condition.notify_all()
+                        _cancel_all_calls(state)
 
                 thread = threading.Thread(target=cancel_all_calls_after_grace)
                 thread.start()
@@ -753,7 +969,7 @@ def _start(state):
             raise ValueError('Cannot start already-started server!')
         state.server.start()
         state.stage = _ServerStage.STARTED
-        _request_call(state)
+        state.stopped_shard_count = 0
 
         def cleanup_server(timeout):
             if timeout is None:
@@ -761,20 +977,37 @@ def _start(state):
             else:
                 _stop(state, timeout).wait()
 
-        thread = _common.CleanupThread(
-            cleanup_server, target=_serve, args=(state,))
-        thread.start()
+        for shard in state.shards:
+            with shard.lock:
+                shard.serving = True
+                for _ in range(state.pending_request_calls):
+                    _request_call(state, shard)
+            thread = _common.CleanupThread(
+                cleanup_server, target=_serve, args=(state, shard,))
+            thread.start()
 
 
 class Server(grpc.Server):
 
     def __init__(self, thread_pool, generic_handlers, options,
-                 maximum_concurrent_rpcs):
-        completion_queue = cygrpc.CompletionQueue()
+                 maximum_concurrent_rpcs, pending_request_calls,
+                 completion_queue_count):
+        if pending_request_calls is None:
+            pending_request_calls = _DEFAULT_PENDING_REQUEST_CALLS
+        elif pending_request_calls < 1:
+            raise ValueError('pending_request_calls must be positive!')
+        if completion_queue_count is None:
+            completion_queue_count = _DEFAULT_COMPLETION_QUEUE_COUNT
+        elif completion_queue_count < 1:
+            raise ValueError('completion_queue_count must be positive!')
+        completion_queues = tuple(cygrpc.CompletionQueue()
+                                  for _ in range(completion_queue_count))
         server = cygrpc.Server(_common.channel_args(options))
-        server.register_completion_queue(completion_queue)
-        self._state = _ServerState(completion_queue, server, generic_handlers,
-                                   thread_pool, maximum_concurrent_rpcs)
+        for completion_queue in completion_queues:
+            server.register_completion_queue(completion_queue)
+        self._state = _ServerState(completion_queues, server, generic_handlers,
+                                   thread_pool, maximum_concurrent_rpcs,
+                                   pending_request_calls)
 
     def add_generic_rpc_handlers(self, generic_rpc_handlers):
         _add_generic_handlers(self._state, generic_rpc_handlers)
@@ -46,7 +46,8 @@ class RpcMethodHandler(
         collections.namedtuple('_RpcMethodHandler', (
             'request_streaming', 'response_streaming', 'request_deserializer',
             'response_serializer', 'unary_unary', 'unary_stream',
-            'stream_unary', 'stream_stream',)), grpc.RpcMethodHandler):
+            'stream_unary', 'stream_stream', 'inline', 'write_window',)),
+        grpc.RpcMethodHandler):
     pass
 
 
@@ -167,6 +168,154 @@ class _ChannelReadyFuture(grpc.Future):
                 self._channel.unsubscribe(self._update)
 
 
+def _completion_callback(completed, index):
+
+    def on_completion(unused_response_future):
+        completed.put(index)
+
+    return on_completion
+
+
+class _CompletionOrderedOutcomes(object):
+
+    def __init__(self, response_futures):
+        self._response_futures = response_futures
+        # The callbacks of the futures refer only to this queue so that this
+        # object may be garbage collected (cancelling the futures) once
+        # unreferenced.
+        self._completed = six.moves.queue.Queue()
+        self._remaining = len(response_futures)
+        for index, response_future in enumerate(response_futures):
+            response_future.add_done_callback(
+                _completion_callback(self._completed, index))
+
+    def _next(self):
+        if not self._remaining:
+            raise StopIteration()
+        index = self._completed.get()
+        self._remaining -= 1
+        response_future = self._response_futures[index]
+        rpc_error = response_future.exception()
+        if rpc_error is None:
+            return index, response_future.result()
+        else:
+            return index, rpc_error
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self._next()
+
+    def next(self):
+        return self._next()
+
+    def __del__(self):
+        for response_future in self._response_futures:
+            response_future.cancel()
+
+
+def completion_ordered_outcomes(response_futures):
+    """Iterates over the outcomes of RPCs in the order in which they complete.
+
+  Args:
+    response_futures: A sequence of the Call-Futures of RPCs.
+
+  Returns:
+    An iterator of the pairs described by grpc.UnaryUnaryMultiCallable.batch.
+  """
+    return _CompletionOrderedOutcomes(response_futures)
+
+
+class _Waiter(object):
+    """Collects futures as they complete.
+
+    The waiter is added as a "done" callback of each waited-upon future, so
+    each completion costs one notification of the waiting thread.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._completed = collections.deque()
+
+    def __call__(self, future):
+        with self._condition:
+            self._completed.append(future)
+            self._condition.notify()
+
+    def take(self, until):
+        """Takes the futures that have completed since the last take.
+
+    Args:
+      until: The time.time() after which to stop waiting, or None to wait
+        indefinitely.
+
+    Returns:
+      A list of completed futures, empty only if until passed without any
+        future having completed.
+    """
+        with self._condition:
+            while not self._completed:
+                if until is None:
+                    self._condition.wait()
+                else:
+                    remaining = until - time.time()
+                    if remaining <= 0:
+                        return []
+                    else:
+                        self._condition.wait(timeout=remaining)
+            completed = list(self._completed)
+            self._completed.clear()
+            return completed
+
+
+def _waiter(futures):
+    waiter = _Waiter()
+    for future in futures:
+        future.add_done_callback(waiter)
+    return waiter
+
+
+def _raised(future):
+    return not future.cancelled() and future.exception() is not None
+
+
+def _completions(futures, waiter, until):
+    remaining = len(futures)
+    while remaining:
+        completed = waiter.take(until)
+        if not completed:
+            raise grpc.FutureTimeoutError()
+        remaining -= len(completed)
+        for future in completed:
+            yield future
+
+
+def as_completed(futures, timeout):
+    futures = frozenset(futures)
+    until = None if timeout is None else time.time() + timeout
+    return _completions(futures, _waiter(futures), until)
+
+
+def wait(futures, timeout, return_when):
+    not_done = set(futures)
+    until = None if timeout is None else time.time() + timeout
+    waiter = _waiter(not_done)
+    done = set()
+    while not_done:
+        completed = waiter.take(until)
+        if not completed:
+            break
+        done.update(completed)
+        not_done.difference_update(completed)
+        if return_when is grpc.FutureWaitCondition.FIRST_COMPLETED:
+            break
+        elif (return_when is grpc.FutureWaitCondition.FIRST_EXCEPTION and
+              any(_raised(future) for future in completed)):
+            break
+    return done, not_done
+
+
 def channel_ready_future(channel):
     ready_future = _ChannelReadyFuture(channel)
     ready_future.start()
@@ -0,0 +1,117 @@
+# Copyright 2017, Google Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#     * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+#     * Neither the name of Google Inc. nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""gRPC Python on asyncio.
+
+RPCs are conducted on an asyncio event loop: invoking an RPC returns an object
+that may be awaited for its response or asynchronously iterated over for its
+responses, and service-side application behaviors may be coroutine functions.
+All completion-queue events of a channel or server are drained by a single
+thread and handed to the event loop, so the number of RPCs in progress is not
+limited by the number of threads available.
+
+This API is experimental and requires Python 3.5.2 or later.
+"""
+
+import asyncio
+
+from grpc.aio import _channel
+from grpc.aio import _server
+
+AioRpcError = _channel.AioRpcError
+
+
+def insecure_channel(target, options=None, loop=None):
+    """Creates an insecure Channel to a server.
+
+  Args:
+    target: The server address.
+    options: An optional list of key-value pairs (channel args in gRPC runtime)
+      to configure the channel.
+    loop: The asyncio event loop on which RPCs on the channel are to be
+      conducted, or None for the current event loop.
+
+  Returns:
+    A Channel with methods unary_unary, unary_stream, stream_unary and
+      stream_stream, analogous to those of grpc.Channel, and close.
+  """
+    return _channel.Channel(target, () if options is None else options, None,
+                            asyncio.get_event_loop() if loop is None else loop)
+
+
+def secure_channel(target, credentials, options=None, loop=None):
+    """Creates a secure Channel to a server.
+
+  Args:
+    target: The server address.
+    credentials: A grpc.ChannelCredentials instance.
+    options: An optional list of key-value pairs (channel args in gRPC runtime)
+      to configure the channel.
+    loop: The asyncio event loop on which RPCs on the channel are to be
+      conducted, or None for the current event loop.
+
+  Returns:
+    A Channel with methods unary_unary, unary_stream, stream_unary and
+      stream_stream, analogous to those of grpc.Channel, and close.
+  """
+    return _channel.Channel(target, () if options is None else options,
+                            credentials._credentials,
+                            asyncio.get_event_loop() if loop is None else loop)
+
+
+def server(handlers=None, options=None, loop=None):
+    """Creates a Server with which RPCs can be serviced.
+
+  The application behaviors of the grpc.RpcMethodHandlers supplied by the given
+  handlers are called on the event loop and may return awaitables (such as the
+  coroutines of coroutine functions) in place of their results. Behaviors of
+  request-streaming RPCs are passed an asynchronous iterator of requests, and
+  behaviors of response-streaming RPCs may produce an iterable or an
+  asynchronous iterable (such as an asynchronous generator) of responses.
+
+  Args:
+    handlers: An optional list of grpc.GenericRpcHandlers used for executing
+      RPCs. More handlers may be added by calling add_generic_rpc_handlers any
+      time before the server is started.
+    options: An optional list of key-value pairs (channel args in gRPC runtime)
+      to configure the server.
+    loop: The asyncio event loop on which RPCs are to be serviced, or None for
+      the current event loop.
+
+  Returns:
+    A Server with methods add_generic_rpc_handlers, add_insecure_port,
+      add_secure_port and start analogous to those of grpc.Server and a stop
+      method returning a future that completes once the server has stopped.
+  """
+    handlers = () if handlers is None else handlers
+    options = () if options is None else options
+    return _server.Server(handlers, options,
+                          asyncio.get_event_loop() if loop is None else loop)
+
+
+__all__ = ('AioRpcError', 'insecure_channel', 'secure_channel', 'server',)
@@ -0,0 +1,585 @@
+# Copyright 2017, Google Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#     * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+#     * Neither the name of Google Inc. nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Invocation-side implementation of gRPC Python on asyncio."""
+
+import collections
+import logging
+
+import grpc
+from grpc import _channel
+from grpc import _common
+from grpc._cython import cygrpc
+from grpc.aio import _loop
+from grpc.framework.foundation import callable_util
+
+_EMPTY_FLAGS = 0
+
+
+class AioRpcError(grpc.RpcError):
+    """The grpc.RpcError of an RPC that terminated with non-OK status."""
+
+    def __init__(self, code, details, initial_metadata, trailing_metadata):
+        super(AioRpcError, self).__init__(code, details)
+        self._code = code
+        self._details = details
+        self._initial_metadata = initial_metadata
+        self._trailing_metadata = trailing_metadata
+
+    def code(self):
+        return self._code
+
+    def details(self):
+        return self._details
+
+    def initial_metadata(self):
+        return self._initial_metadata
+
+    def trailing_metadata(self):
+        return self._trailing_metadata
+
+    def __str__(self):
+        return '<AioRpcError of RPC that terminated with ({}, {})>'.format(
+            self._code, self._details)
+
+
+def _dispatch(events):
+    for event in events:
+        if event.type == cygrpc.CompletionType.operation_complete:
+            callable_util.call_logging_exceptions(
+                event.tag, 'Exception handling event!', event)
+
+
+class _Call(object):
+    """An RPC in progress, all of whose state is owned by the event loop."""
+
+    def __init__(self, channel_state, call, state, response_deserializer):
+        self._channel_state = channel_state
+        self._loop = channel_state.loop
+        self._call = call
+        self._state = state
+        self._response_deserializer = response_deserializer
+        self._initial_metadata = self._loop.create_future()
+        self._status = self._loop.create_future()
+        if call is not None:
+            channel_state.calls.add(self)
+
+    def _handler(self, continuation):
+
+        def handle_event(event):
+            _channel._handle_event(event, self._state,
+                                   self._response_deserializer)
+            self._update()
+            if continuation is not None and self._state.code is None:
+                continuation()
+
+        return handle_event
+
+    def _start(self, operations, metadata=None, continuation=None):
+        call_error = self._call.start_client_batch(
+            cygrpc.Operations(operations), self._handler(continuation))
+        if call_error == cygrpc.CallError.ok:
+            for operation in operations:
+                self._state.due |= _channel._due(operation.type)
+        else:
+            self._call.cancel()
+            _channel._call_error_set_RPCstate(self._state, call_error, metadata)
+            self._update()
+
+    def _abort(self, code, details):
+        self._call.cancel()
+        _channel._abort(self._state, code, details)
+        self._update()
+
+    def _update(self):
+        if (self._state.initial_metadata is not None and
+                not self._initial_metadata.done()):
+            self._initial_metadata.set_result(None)
+        if self._state.code is not None and not self._status.done():
+            self._status.set_result(None)
+            self._terminate()
+        if not self._state.due:
+            self._channel_state.calls.discard(self)
+
+    def _terminate(self):
+        raise NotImplementedError()
+
+    def _rpc_error(self):
+        return AioRpcError(
+            self._state.code,
+            _common.decode(self._state.details),
+            _common.to_application_metadata(self._state.initial_metadata),
+            _common.to_application_metadata(self._state.trailing_metadata))
+
+    def _consume_requests(self, request_iterator, request_serializer):
+        take = _loop.taker(self._loop, request_iterator)
+
+        def send_next_request():
+            take().add_done_callback(send_request)
+
+        def send_request(future):
+            if self._state.code is not None:
+                return
+            request, exception = _loop.outcome(future)
+            if isinstance(exception, StopAsyncIteration):
+                self._start(
+                    (cygrpc.operation_send_close_from_client(_EMPTY_FLAGS),))
+            elif exception is not None:
+                logging.error(
+                    'Exception iterating requests!', exc_info=exception)
+                self._abort(grpc.StatusCode.UNKNOWN,
+                            'Exception iterating requests!')
+            else:
+                serialized_request = _common.serialize(request,
+                                                       request_serializer)
+                if serialized_request is None:
+                    self._abort(grpc.StatusCode.INTERNAL,
+                                'Exception serializing request!')
+                else:
+                    self._start(
+                        (cygrpc.operation_send_message(serialized_request,
+                                                       _EMPTY_FLAGS),),
+                        continuation=send_next_request)
+
+        send_next_request()
+
+    def _derived(self, source, value):
+        future = self._loop.create_future()
+
+        def resolve(unused_source):
+            if not future.done():
+                future.set_result(value())
+
+        source.add_done_callback(resolve)
+        return future
+
+    def cancel(self):
+        """Cancels the RPC.
+
+        Returns:
+          True if the RPC was cancelled by this call and False if it had
+            already terminated.
+        """
+        if self._state.code is None:
+            self._call.cancel()
+            self._state.cancelled = True
+            _channel._abort(self._state, grpc.StatusCode.CANCELLED,
+                            'Cancelled!')
+            self._update()
+            return True
+        else:
+            return False
+
+    def cancelled(self):
+        return self._state.cancelled
+
+    def done(self):
+        return self._state.code is not None
+
+    def initial_metadata(self):
+        """Returns a future of the metadata sent by the server."""
+        return self._derived(
+            self._initial_metadata,
+            lambda: _common.to_application_metadata(self._state.initial_metadata)
+        )
+
+    def trailing_metadata(self):
+        """Returns a future of the trailing metadata sent by the server."""
+        return self._derived(
+            self._status,
+            lambda: _common.to_application_metadata(self._state.trailing_metadata)
+        )
+
+    def code(self):
+        """Returns a future of the grpc.StatusCode of the RPC."""
+        return self._derived(self._status, lambda: self._state.code)
+
+    def details(self):
+        """Returns a future of the details of the RPC's status."""
+        return self._derived(self._status,
+                             lambda: _common.decode(self._state.details))
+
+
+class _UnaryResponseCall(_Call):
+    """An RPC that, when awaited, produces its single response."""
+
+    def __init__(self, channel_state, call, state, response_deserializer):
+        super(_UnaryResponseCall, self).__init__(channel_state, call, state,
+                                                 response_deserializer)
+        self._response = self._loop.create_future()
+        self._response.add_done_callback(self._response_done)
+
+    def _response_done(self, response):
+        if response.cancelled():
+            self.cancel()
+
+    def _terminate(self):
+        if not self._response.done():
+            if self._state.code is grpc.StatusCode.OK:
+                self._response.set_result(self._state.response)
+            elif self._state.cancelled:
+                self._response.cancel()
+            else:
+                self._response.set_exception(self._rpc_error())
+
+    def __await__(self):
+        return self._response.__await__()
+
+
+class _StreamResponseCall(_Call):
+    """An RPC whose responses are produced by asynchronous iteration."""
+
+    def __init__(self, channel_state, call, state, response_deserializer):
+        super(_StreamResponseCall, self).__init__(channel_state, call, state,
+                                                  response_deserializer)
+        self._responses = collections.deque()
+        self._exhausted = False
+        self._waiter = None
+
+    def _receive_message(self, event):
+        _channel._handle_event(event, self._state, self._response_deserializer)
+        if self._state.response is None:
+            self._exhausted = True
+        self._update()
+
+    def _update(self):
+        if self._state.response is not None:
+            self._responses.append(self._state.response)
+            self._state.response = None
+        super(_StreamResponseCall, self)._update()
+        self._wake()
+
+    def _terminate(self):
+        pass
+
+    def _waiter_done(self, waiter):
+        if waiter.cancelled():
+            self.cancel()
+
+    def _wake(self):
+        waiter = self._waiter
+        if waiter is None:
+            return
+        elif waiter.done():
+            self._waiter = None
+        elif self._responses:
+            self._waiter = None
+            waiter.set_result(self._responses.popleft())
+        elif self._state.code is grpc.StatusCode.OK:
+            self._waiter = None
+            waiter.set_exception(StopAsyncIteration())
+        elif self._state.code is not None:
+            self._waiter = None
+            if self._state.cancelled:
+                waiter.cancel()
+            else:
+                waiter.set_exception(self._rpc_error())
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        if self._waiter is not None:
+            raise ValueError('Concurrent reads of an RPC are not supported!')
+        waiter = self._loop.create_future()
+        waiter.add_done_callback(self._waiter_done)
+        self._waiter = waiter
+        if (not self._responses and self._state.code is None and
+                not self._exhausted and
+                not self._state.due & _channel._RECEIVE_MESSAGE_DUE):
+            call_error = self._call.start_client_batch(
+                cygrpc.Operations(
+                    (cygrpc.operation_receive_message(_EMPTY_FLAGS),)),
+                self._receive_message)
+            if call_error == cygrpc.CallError.ok:
+                self._state.due |= _channel._RECEIVE_MESSAGE_DUE
+            else:
+                self._call.cancel()
+                _channel._call_error_set_RPCstate(self._state, call_error, None)
+                self._update()
+        self._wake()
+        return waiter
+
+
+class _MultiCallable(object):
+
+    def __init__(self, channel_state, method, request_serializer,
+                 response_deserializer):
+        self._channel_state = channel_state
+        self._method = method
+        self._request_serializer = request_serializer
+        self._response_deserializer = response_deserializer
+
+    def _create_call(self, timeout, credentials):
+        unused_deadline, deadline_timespec = _channel._deadline(timeout)
+        call = self._channel_state.channel.create_call(
+            None, 0, self._channel_state.poller.completion_queue, self._method,
+            None, deadline_timespec)
+        if credentials is not None:
+            call.set_credentials(credentials._credentials)
+        return call
+
+    def _serialization_failure(self, call_type):
+        state = _channel._RPCState(
+            0, _common.EMPTY_METADATA, _common.EMPTY_METADATA,
+            grpc.StatusCode.INTERNAL, 'Exception serializing request!')
+        rpc = call_type(self._channel_state, None, state, None)
+        rpc._update()
+        return rpc
+
+
+class UnaryUnaryMultiCallable(_MultiCallable):
+    """Invokes unary-unary RPCs."""
+
+    def __call__(self, request, timeout=None, metadata=None, credentials=None):
+        """Invokes the RPC.
+
+        Must be called on the channel's event loop.
+
+        Args:
+          request: The request value for the RPC.
+          timeout: An optional duration of time in seconds to allow for the RPC.
+          metadata: Optional metadata to be transmitted to the service-side of
+            the RPC.
+          credentials: An optional CallCredentials for the RPC.
+
+        Returns:
+          An object that is awaitable for the response value of the RPC, that
+            raises an AioRpcError if the RPC terminates with non-OK status, and
+            that provides futures of the RPC's metadata and status.
+        """
+        serialized_request = _common.serialize(request,
+                                               self._request_serializer)
+        if serialized_request is None:
+            return self._serialization_failure(_UnaryResponseCall)
+        state = _channel._RPCState(0, None, None, None, None)
+        rpc = _UnaryResponseCall(self._channel_state,
+                                 self._create_call(timeout, credentials), state,
+                                 self._response_deserializer)
+        rpc._start(
+            (cygrpc.operation_send_initial_metadata(
+                _common.to_cygrpc_metadata(metadata), _EMPTY_FLAGS),
+             cygrpc.operation_send_message(serialized_request, _EMPTY_FLAGS),
+             cygrpc.operation_send_close_from_client(_EMPTY_FLAGS),
+             cygrpc.operation_receive_initial_metadata(_EMPTY_FLAGS),
+             cygrpc.operation_receive_message(_EMPTY_FLAGS),
+             cygrpc.operation_receive_status_on_client(_EMPTY_FLAGS),),
+            metadata)
+        return rpc
+
+
+class UnaryStreamMultiCallable(_MultiCallable):
+    """Invokes unary-stream RPCs."""
+
+    def __call__(self, request, timeout=None, metadata=None, credentials=None):
+        """Invokes the RPC.
+
+        Must be called on the channel's event loop.
+
+        Args:
+          request: The request value for the RPC.
+          timeout: An optional duration of time in seconds to allow for the RPC.
+          metadata: Optional metadata to be transmitted to the service-side of
+            the RPC.
+          credentials: An optional CallCredentials for the RPC.
+
+        Returns:
+          An asynchronous iterator of response values that raises an
+            AioRpcError if the RPC terminates with non-OK status, and that
+            provides futures of the RPC's metadata and status.
+        """
+        serialized_request = _common.serialize(request,
+                                               self._request_serializer)
+        if serialized_request is None:
+            return self._serialization_failure(_StreamResponseCall)
+        rpc = _StreamResponseCall(self._channel_state,
+                                  self._create_call(timeout, credentials),
+                                  _channel._RPCState(0, None, None, None, None),
+                                  self._response_deserializer)
+        rpc._start((cygrpc.operation_receive_initial_metadata(_EMPTY_FLAGS),))
+        rpc._start(
+            (cygrpc.operation_send_initial_metadata(
+                _common.to_cygrpc_metadata(metadata), _EMPTY_FLAGS),
+             cygrpc.operation_send_message(serialized_request, _EMPTY_FLAGS),
+             cygrpc.operation_send_close_from_client(_EMPTY_FLAGS),
+             cygrpc.operation_receive_status_on_client(_EMPTY_FLAGS),),
+            metadata)
+        return rpc
+
+
+class StreamUnaryMultiCallable(_MultiCallable):
+    """Invokes stream-unary RPCs."""
+
+    def __call__(self,
+                 request_iterator,
+                 timeout=None,
+                 metadata=None,
+                 credentials=None):
+        """Invokes the RPC.
+
+        Must be called on the channel's event loop.
+
+        Args:
+          request_iterator: An iterator or asynchronous iterator of request
+            values for the RPC. A synchronous iterator is advanced on the event
+            loop and so must not block.
+          timeout: An optional duration of time in seconds to allow for the RPC.
+          metadata: Optional metadata to be transmitted to the service-side of
+            the RPC.
+          credentials: An optional CallCredentials for the RPC.
+
+        Returns:
+          An object that is awaitable for the response value of the RPC, that
+            raises an AioRpcError if the RPC terminates with non-OK status, and
+            that provides futures of the RPC's metadata and status.
+        """
+        state = _channel._RPCState(0, None, None, None, None)
+        rpc = _UnaryResponseCall(self._channel_state,
+                                 self._create_call(timeout, credentials), state,
+                                 self._response_deserializer)
+        rpc._start((cygrpc.operation_receive_initial_metadata(_EMPTY_FLAGS),))
+        rpc._start((cygrpc.operation_send_initial_metadata(
+            _common.to_cygrpc_metadata(metadata),
+            _EMPTY_FLAGS), cygrpc.operation_receive_message(_EMPTY_FLAGS),
+                    cygrpc.operation_receive_status_on_client(_EMPTY_FLAGS),),
+                   metadata)
+        rpc._consume_requests(request_iterator, self._request_serializer)
+        return rpc
+
+
+class StreamStreamMultiCallable(_MultiCallable):
+    """Invokes stream-stream RPCs."""
+
+    def __call__(self,
+                 request_iterator,
+                 timeout=None,
+                 metadata=None,
+                 credentials=None):
+        """Invokes the RPC.
+
+        Must be called on the channel's event loop.
+
+        Args:
+          request_iterator: An iterator or asynchronous iterator of request
+            values for the RPC. A synchronous iterator is advanced on the event
+            loop and so must not block.
+          timeout: An optional duration of time in seconds to allow for the RPC.
+          metadata: Optional metadata to be transmitted to the service-side of
+            the RPC.
+          credentials: An optional CallCredentials for the RPC.
+
+        Returns:
+          An asynchronous iterator of response values that raises an
+            AioRpcError if the RPC terminates with non-OK status, and that
+            provides futures of the RPC's metadata and status.
+        """
+        rpc = _StreamResponseCall(self._channel_state,
+                                  self._create_call(timeout, credentials),
+                                  _channel._RPCState(0, None, None, None, None),
+                                  self._response_deserializer)
+        rpc._start((cygrpc.operation_receive_initial_metadata(_EMPTY_FLAGS),))
+        rpc._start((cygrpc.operation_send_initial_metadata(
+            _common.to_cygrpc_metadata(metadata), _EMPTY_FLAGS),
+                    cygrpc.operation_receive_status_on_client(_EMPTY_FLAGS),),
+                   metadata)
+        rpc._consume_requests(request_iterator, self._request_serializer)
+        return rpc
+
+
+class _ChannelState(object):
+
+    def __init__(self, loop, channel):
+        self.loop = loop
+        self.channel = channel
+        self.poller = _loop.Poller(loop, _dispatch)
+        # The _Calls with operations due from the channel's completion queue.
+        self.calls = set()
+
+
+class Channel(object):
+    """A channel whose RPCs are conducted on an asyncio event loop."""
+
+    def __init__(self, target, options, credentials, loop):
+        """Constructor.
+
+        Args:
+          target: The target to which to connect.
+          options: Configuration options for the channel.
+          credentials: A cygrpc.ChannelCredentials or None.
+          loop: The asyncio event loop on which RPCs are to be conducted.
+        """
+        channel = cygrpc.Channel(
+            _common.encode(target),
+            _common.channel_args(_channel._options(options)), credentials)
+        self._state = _ChannelState(loop, channel)
+
+    def unary_unary(self,
+                    method,
+                    request_serializer=None,
+                    response_deserializer=None):
+        return UnaryUnaryMultiCallable(
+            self._state,
+            _common.encode(method), request_serializer, response_deserializer)
+
+    def unary_stream(self,
+                     method,
+                     request_serializer=None,
+                     response_deserializer=None):
+        return UnaryStreamMultiCallable(
+            self._state,
+            _common.encode(method), request_serializer, response_deserializer)
+
+    def stream_unary(self,
+                     method,
+                     request_serializer=None,
+                     response_deserializer=None):
+        return StreamUnaryMultiCallable(
+            self._state,
+            _common.encode(method), request_serializer, response_deserializer)
+
+    def stream_stream(self,
+                      method,
+                      request_serializer=None,
+                      response_deserializer=None):
+        return StreamStreamMultiCallable(
+            self._state,
+            _common.encode(method), request_serializer, response_deserializer)
+
+    def close(self):
+        """Cancels all RPCs in progress and releases the channel's resources.
+
+        Must be called on the channel's event loop.
+        """
+        for rpc in tuple(self._state.calls):
+            rpc.cancel()
+        self._state.poller.shutdown()
+
+    def __del__(self):
+        for rpc in tuple(self._state.calls):
+            rpc._call.cancel()
+        self._state.poller.shutdown()
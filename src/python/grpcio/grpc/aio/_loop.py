@@ -0,0 +1,120 @@
+# Copyright 2017, Google Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#     * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+#     * Neither the name of Google Inc. nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Bridges between completion queues and asyncio event loops."""
+
+import asyncio
+import logging
+import threading
+
+from grpc._cython import cygrpc
+
+_MAXIMUM_EVENTS_PER_POLL = 64
+
+
+def _poll(completion_queue, loop, dispatch):
+    while True:
+        events = completion_queue.poll_many(_MAXIMUM_EVENTS_PER_POLL)
+        try:
+            loop.call_soon_threadsafe(dispatch, events)
+        except RuntimeError:
+            logging.exception('Event loop unavailable to handle events!')
+        if events[-1].type == cygrpc.CompletionType.queue_shutdown:
+            return
+
+
+class Poller(object):
+    """Drains a completion queue on a thread of its own.
+
+    Events are handed in batches to a dispatch function called on the event
+    loop, so any number of RPCs may be conducted on the completion queue
+    without dedicating a thread to any of them.
+    """
+
+    def __init__(self, loop, dispatch):
+        self.loop = loop
+        self.completion_queue = cygrpc.CompletionQueue()
+        thread = threading.Thread(
+            target=_poll, args=(self.completion_queue, loop, dispatch,))
+        thread.daemon = True
+        thread.start()
+
+    def shutdown(self):
+        self.completion_queue.shutdown()
+
+
+def _completed_future(loop, result=None, exception=None):
+    future = loop.create_future()
+    if exception is None:
+        future.set_result(result)
+    else:
+        future.set_exception(exception)
+    return future
+
+
+def taker(loop, iterable):
+    """Adapts an iterable or an asynchronous iterable to future-returning calls.
+
+    Args:
+      loop: The event loop with which to create futures.
+      iterable: An iterable or an object implementing __aiter__.
+
+    Returns:
+      A function that when called returns a future of the next value of the
+        iterable. The future is completed with StopAsyncIteration when the
+        iterable is exhausted or with the exception raised by the iterable.
+    """
+    if hasattr(iterable, '__aiter__'):
+        iterator = iterable.__aiter__()
+        return lambda: asyncio.ensure_future(iterator.__anext__(), loop=loop)
+    else:
+        iterator = iter(iterable)
+
+        def take():
+            try:
+                return _completed_future(loop, result=next(iterator))
+            except StopIteration:
+                return _completed_future(loop, exception=StopAsyncIteration())
+            except Exception as exception:  # pylint: disable=broad-except
+                return _completed_future(loop, exception=exception)
+
+        return take
+
+
+def outcome(future):
+    """Returns the value and the exception of a completed future.
+
+    A cancelled future is reported as having raised asyncio.CancelledError.
+    """
+    if future.cancelled():
+        return None, asyncio.CancelledError()
+    exception = future.exception()
+    if exception is None:
+        return future.result(), None
+    else:
+        return None, exception
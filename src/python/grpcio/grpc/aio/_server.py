@@ -0,0 +1,441 @@
+# Copyright 2017, Google Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#     * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+#     * Neither the name of Google Inc. nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Service-side implementation of gRPC Python on asyncio."""
+
+import asyncio
+import inspect
+import logging
+
+import grpc
+from grpc import _common
+from grpc import _server
+from grpc._cython import cygrpc
+from grpc.aio import _loop
+from grpc.framework.foundation import callable_util
+
+_EMPTY_FLAGS = 0
+
+
+def _dispatch(events):
+    for event in events:
+        if event.type == cygrpc.CompletionType.operation_complete:
+            outcome = callable_util.call_logging_exceptions(
+                event.tag, 'Exception handling event!', event)
+            if outcome.kind is callable_util.Outcome.Kind.RETURNED:
+                unused_rpc_state, callbacks = outcome.return_value
+                for callback in callbacks:
+                    callable_util.call_logging_exceptions(
+                        callback, 'Exception calling callback!')
+
+
+class _ServerState(object):
+
+    def __init__(self, loop, server, poller, generic_handlers):
+        self.loop = loop
+        self.server = server
+        self.poller = poller
+        self.generic_handlers = list(generic_handlers)
+        self.stage = _server._ServerStage.STOPPED
+        self.shutdown = None
+        # The asyncio.Tasks of application behaviors not yet completed.
+        self.tasks = set()
+
+
+def _rpc_error(state):
+    rpc_error = grpc.RpcError()
+    state.rpc_errors.append(rpc_error)
+    return rpc_error
+
+
+def _abort_for_exception(rpc_event, state, exception, details_format):
+    with state.condition:
+        if exception not in state.rpc_errors and not state.statused:
+            details = details_format.format(exception)
+            logging.error(details, exc_info=exception)
+            _server._abort(state, rpc_event.operation_call,
+                           cygrpc.StatusCode.unknown, _common.encode(details))
+
+
+def _receive_message(state, call, request_deserializer, on_request):
+
+    def receive_message(receive_message_event):
+        serialized_request = _server._serialized_request(receive_message_event,
+                                                         request_deserializer)
+        with state.condition:
+            if serialized_request is None:
+                if state.client is _server._OPEN:
+                    state.client = _server._CLOSED
+                request = None
+            else:
+                request = _common.deserialize(serialized_request,
+                                              request_deserializer)
+                if request is None:
+                    _server._abort(state, call, cygrpc.StatusCode.internal,
+                                   b'Exception deserializing request!')
+            finished = state.finish_batch(_server._RECEIVE_MESSAGE_TOKEN)
+        on_request(request)
+        return finished
+
+    return receive_message
+
+
+def _start_receive_message(rpc_event, state, request_deserializer, on_request):
+    rpc_event.operation_call.start_server_batch(
+        cygrpc.Operations((cygrpc.operation_receive_message(_EMPTY_FLAGS),)),
+        _receive_message(state, rpc_event.operation_call, request_deserializer,
+                         on_request))
+    state.due |= _server._RECEIVE_MESSAGE_TOKEN
+
+
+class _RequestIterator(object):
+    """An asynchronous iterator of the requests of an RPC."""
+
+    def __init__(self, loop, rpc_event, state, request_deserializer):
+        self._loop = loop
+        self._rpc_event = rpc_event
+        self._state = state
+        self._request_deserializer = request_deserializer
+
+    def _on_request(self, future):
+
+        def on_request(request):
+            if future.done():
+                return
+            elif request is not None:
+                future.set_result(request)
+            elif self._state.client is _server._CANCELLED:
+                future.set_exception(_rpc_error(self._state))
+            else:
+                future.set_exception(StopAsyncIteration())
+
+        return on_request
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        future = self._loop.create_future()
+        with self._state.condition:
+            if self._state.client is _server._CANCELLED:
+                future.set_exception(_rpc_error(self._state))
+            elif (self._state.client is _server._CLOSED or
+                  self._state.statused):
+                future.set_exception(StopAsyncIteration())
+            elif self._state.due & _server._RECEIVE_MESSAGE_TOKEN:
+                raise ValueError(
+                    'Concurrent reads of requests are not supported!')
+            else:
+                _start_receive_message(self._rpc_event, self._state,
+                                       self._request_deserializer,
+                                       self._on_request(future))
+        return future
+
+
+def _call_behavior(server_state, rpc_event, state, behavior, argument,
+                   on_result):
+    context = _server._Context(rpc_event, state, None)
+    try:
+        result = behavior(argument, context)
+    except Exception as exception:  # pylint: disable=broad-except
+        _abort_for_exception(rpc_event, state, exception,
+                             'Exception calling application: {}')
+        return
+    if inspect.isawaitable(result):
+        task = asyncio.ensure_future(result, loop=server_state.loop)
+        server_state.tasks.add(task)
+
+        def on_behavior_done(task):
+            server_state.tasks.discard(task)
+            value, exception = _loop.outcome(task)
+            if exception is None:
+                on_result(value)
+            else:
+                _abort_for_exception(rpc_event, state, exception,
+                                     'Exception calling application: {}')
+
+        task.add_done_callback(on_behavior_done)
+    else:
+        on_result(result)
+
+
+def _unary_response(rpc_event, state, response_serializer):
+
+    def respond(response):
+        serialized_response = _common.serialize(response, response_serializer)
+        with state.condition:
+            if state.statused:
+                return
+            elif serialized_response is None:
+                _server._abort(state, rpc_event.operation_call,
+                               cygrpc.StatusCode.internal,
+                               b'Failed to serialize response!')
+            else:
+                _server._status(rpc_event, state, serialized_response)
+
+    return respond
+
+
+def _send_message(state, token, continuation):
+
+    def send_message(unused_send_message_event):
+        with state.condition:
+            finished = state.finish_batch(token)
+            proceed = (state.client is not _server._CANCELLED and
+                       not state.statused)
+        if proceed:
+            continuation()
+        return finished
+
+    return send_message
+
+
+def _send_response(rpc_event, state, serialized_response, continuation):
+    if state.initial_metadata_allowed:
+        operations = (
+            cygrpc.operation_send_initial_metadata(_common.EMPTY_METADATA,
+                                                   _EMPTY_FLAGS),
+            cygrpc.operation_send_message(serialized_response, _EMPTY_FLAGS),)
+        state.initial_metadata_allowed = False
+        token = _server._SEND_INITIAL_METADATA_AND_SEND_MESSAGE_TOKEN
+    else:
+        operations = (cygrpc.operation_send_message(serialized_response,
+                                                    _EMPTY_FLAGS),)
+        token = _server._SEND_MESSAGE_TOKEN
+    rpc_event.operation_call.start_server_batch(
+        cygrpc.Operations(operations),
+        _send_message(state, token, continuation))
+    state.due |= token
+
+
+def _stream_response(server_state, rpc_event, state, response_serializer):
+
+    def respond(responses):
+        try:
+            take = _loop.taker(server_state.loop, responses)
+        except Exception as exception:  # pylint: disable=broad-except
+            _abort_for_exception(rpc_event, state, exception,
+                                 'Exception iterating responses: {}')
+            return
+
+        def send_next_response():
+            take().add_done_callback(send_response)
+
+        def send_response(future):
+            response, exception = _loop.outcome(future)
+            if isinstance(exception, StopAsyncIteration):
+                with state.condition:
+                    if (state.client is not _server._CANCELLED and
+                            not state.statused):
+                        _server._status(rpc_event, state, None)
+            elif exception is not None:
+                _abort_for_exception(rpc_event, state, exception,
+                                     'Exception iterating responses: {}')
+            else:
+                serialized_response = _common.serialize(response,
+                                                        response_serializer)
+                with state.condition:
+                    if (state.client is _server._CANCELLED or state.statused):
+                        return
+                    elif serialized_response is None:
+                        _server._abort(state, rpc_event.operation_call,
+                                       cygrpc.StatusCode.internal,
+                                       b'Failed to serialize response!')
+                    else:
+                        _send_response(rpc_event, state, serialized_response,
+                                       send_next_response)
+
+        send_next_response()
+
+    return respond
+
+
+def _unary_request(server_state, rpc_event, state, method_handler, behavior,
+                   on_result):
+
+    def on_request(request):
+        if request is None:
+            with state.condition:
+                if state.client is _server._CLOSED and not state.statused:
+                    details = '"{}" requires exactly one request message.'.format(
+                        rpc_event.request_call_details.method)
+                    _server._abort(state, rpc_event.operation_call,
+                                   cygrpc.StatusCode.unimplemented,
+                                   _common.encode(details))
+        else:
+            _call_behavior(server_state, rpc_event, state, behavior, request,
+                           on_result)
+
+    _start_receive_message(rpc_event, state,
+                           method_handler.request_deserializer, on_request)
+
+
+def _handle_with_method_handler(server_state, rpc_event, method_handler):
+    state = _server._RPCState()
+    with state.condition:
+        rpc_event.operation_call.start_server_batch(
+            cygrpc.Operations(
+                (cygrpc.operation_receive_close_on_server(_EMPTY_FLAGS),)),
+            _server._receive_close_on_server(state))
+        state.due |= _server._RECEIVE_CLOSE_ON_SERVER_TOKEN
+    if method_handler.response_streaming:
+        on_result = _stream_response(server_state, rpc_event, state,
+                                     method_handler.response_serializer)
+        if method_handler.request_streaming:
+            behavior = method_handler.stream_stream
+        else:
+            behavior = method_handler.unary_stream
+    else:
+        on_result = _unary_response(rpc_event, state,
+                                    method_handler.response_serializer)
+        if method_handler.request_streaming:
+            behavior = method_handler.stream_unary
+        else:
+            behavior = method_handler.unary_unary
+    if method_handler.request_streaming:
+        request_iterator = _RequestIterator(server_state.loop, rpc_event, state,
+                                            method_handler.request_deserializer)
+        _call_behavior(server_state, rpc_event, state, behavior,
+                       request_iterator, on_result)
+    else:
+        _unary_request(server_state, rpc_event, state, method_handler, behavior,
+                       on_result)
+
+
+def _request_call(state):
+    state.server.request_call(state.poller.completion_queue,
+                              state.poller.completion_queue, _accept(state))
+
+
+def _accept(state):
+
+    def accept(rpc_event):
+        if state.stage is _server._ServerStage.STARTED:
+            _request_call(state)
+        if (rpc_event.success and
+                rpc_event.request_call_details.method is not None):
+            method_handler = _server._find_method_handler(
+                rpc_event, {}, state.generic_handlers)
+            if method_handler is None:
+                _server._reject_rpc(rpc_event, cygrpc.StatusCode.unimplemented,
+                                    b'Method not found!')
+            else:
+                _handle_with_method_handler(state, rpc_event, method_handler)
+        return None, ()
+
+    return accept
+
+
+def _shutdown(state):
+
+    def shutdown(unused_shutdown_event):
+        state.stage = _server._ServerStage.STOPPED
+        state.shutdown.set_result(None)
+        state.poller.shutdown()
+        return None, ()
+
+    return shutdown
+
+
+def _cancel_all_calls(state):
+    if state.stage is not _server._ServerStage.STOPPED:
+        state.server.cancel_all_calls()
+        for task in tuple(state.tasks):
+            task.cancel()
+
+
+def _stop(state, grace):
+    stopped = state.loop.create_future()
+    if state.stage is _server._ServerStage.STOPPED:
+        stopped.set_result(None)
+        return stopped
+    elif state.stage is _server._ServerStage.STARTED:
+        state.shutdown = state.loop.create_future()
+        state.server.shutdown(state.poller.completion_queue, _shutdown(state))
+        state.stage = _server._ServerStage.GRACE
+    if grace is None:
+        _cancel_all_calls(state)
+    else:
+        state.loop.call_later(grace, _cancel_all_calls, state)
+    state.shutdown.add_done_callback(
+        lambda unused_shutdown: stopped.done() or stopped.set_result(None))
+    return stopped
+
+
+def _start(state):
+    if state.stage is not _server._ServerStage.STOPPED:
+        raise ValueError('Cannot start already-started server!')
+    state.server.start()
+    state.stage = _server._ServerStage.STARTED
+    _request_call(state)
+
+
+class Server(object):
+    """A server whose RPCs are serviced on an asyncio event loop."""
+
+    def __init__(self, generic_handlers, options, loop):
+        server = cygrpc.Server(_common.channel_args(options))
+        poller = _loop.Poller(loop, _dispatch)
+        server.register_completion_queue(poller.completion_queue)
+        self._state = _ServerState(loop, server, poller, generic_handlers)
+
+    def add_generic_rpc_handlers(self, generic_rpc_handlers):
+        self._state.generic_handlers.extend(generic_rpc_handlers)
+
+    def add_insecure_port(self, address):
+        return self._state.server.add_http2_port(_common.encode(address))
+
+    def add_secure_port(self, address, server_credentials):
+        return self._state.server.add_http2_port(
+            _common.encode(address), server_credentials._credentials)
+
+    def start(self):
+        """Starts the server.
+
+        Must be called on the server's event loop.
+        """
+        _start(self._state)
+
+    def stop(self, grace):
+        """Stops the server.
+
+        Must be called on the server's event loop.
+
+        Args:
+          grace: A duration of time in seconds or None. RPCs in progress are
+            aborted, and their application behaviors cancelled, once the grace
+            period has elapsed (immediately if grace is None).
+
+        Returns:
+          A future that completes once the server has stopped.
+        """
+        return _stop(self._state, grace)
+
+    def __del__(self):
+        if self._state.stage is not _server._ServerStage.STOPPED:
+            self._state.server.cancel_all_calls()
@@ -42,6 +42,7 @@ from tests.unit import resources
 from tests.unit import test_common
 
 _TIMEOUT = 60 * 60 * 24
+_STREAMING_CALL = '/grpc.testing.BenchmarkService/StreamingCall'
 
 
 class GenericStub(object):
@@ -49,8 +50,7 @@ class GenericStub(object):
     def __init__(self, channel):
         self.UnaryCall = channel.unary_unary(
             '/grpc.testing.BenchmarkService/UnaryCall')
-        self.StreamingCall = channel.stream_stream(
-            '/grpc.testing.BenchmarkService/StreamingCall')
+        self.StreamingCall = channel.stream_stream(_STREAMING_CALL)
 
 
 class BenchmarkClient:
@@ -70,6 +70,7 @@ class BenchmarkClient:
 
         # waits for the channel to be ready before we start sending messages
         grpc.channel_ready_future(channel).result()
+        self._channel = channel
 
         if config.payload_config.WhichOneof('payload') == 'simple_params':
             self._generic = False
@@ -151,9 +152,8 @@ class UnaryAsyncBenchmarkClient(BenchmarkClient):
 
 class _SyncStream(object):
 
-    def __init__(self, stub, generic, request, handle_response):
-        self._stub = stub
-        self._generic = generic
+    def __init__(self, streaming_call, request, handle_response):
+        self._streaming_call = streaming_call
         self._request = request
         self._handle_response = handle_response
         self._is_streaming = False
@@ -166,8 +166,8 @@ class _SyncStream(object):
 
     def start(self):
         self._is_streaming = True
-        response_stream = self._stub.StreamingCall(self._request_generator(),
-                                                   _TIMEOUT)
+        response_stream = self._streaming_call(self._request_generator(),
+                                               _TIMEOUT)
         for _ in response_stream:
             self._handle_response(
                 self, time.time() - self._send_time_queue.get_nowait())
@@ -184,15 +184,54 @@ class _SyncStream(object):
                 pass
 
 
+class _PipelinedSyncStream(_SyncStream):
+    """A _SyncStream that does not wait for responses before sending requests.
+
+    Requests are taken from the generator as fast as the call's write window
+    admits them rather than one per received response.
+    """
+
+    def send_request(self):
+        pass
+
+    def _request_generator(self):
+        while self._is_streaming:
+            self._send_time_queue.put(time.time())
+            yield self._request
+
+
 class StreamingSyncBenchmarkClient(BenchmarkClient):
 
-    def __init__(self, server, config, hist):
+    def __init__(self, server, config, hist, write_window=None):
+        """Constructor.
+
+    Args:
+      server: The target of the benchmark server.
+      config: The ClientConfig of the benchmark.
+      hist: The Histogram in which to record latencies.
+      write_window: The number of requests each stream may queue for
+        transmission, or None to transmit each request before taking the next.
+        With a write window each stream sends requests continuously instead of
+        one per received response, so the load parameters of the config pace
+        only streams without one.
+    """
         super(StreamingSyncBenchmarkClient, self).__init__(server, config, hist)
         self._pool = futures.ThreadPoolExecutor(
             max_workers=config.outstanding_rpcs_per_channel)
+        if write_window is None:
+            streaming_call = self._stub.StreamingCall
+        elif self._generic:
+            streaming_call = self._channel.stream_stream(
+                _STREAMING_CALL, write_window=write_window)
+        else:
+            streaming_call = self._channel.stream_stream(
+                _STREAMING_CALL,
+                request_serializer=messages_pb2.SimpleRequest.SerializeToString,
+                response_deserializer=messages_pb2.SimpleResponse.FromString,
+                write_window=write_window)
+        stream_class = _SyncStream if write_window is None else _PipelinedSyncStream
         self._streams = [
-            _SyncStream(self._stub, self._generic, self._request,
-                        self._handle_response)
+            stream_class(streaming_call, self._request, self._handle_response)
             for _ in xrange(config.outstanding_rpcs_per_channel)
         ]
         self._curr_stream = 0
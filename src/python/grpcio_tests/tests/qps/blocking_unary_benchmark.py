@@ -0,0 +1,117 @@
+# Copyright 2017, Google Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#     * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+#     * Neither the name of Google Inc. nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Measures the per-call overhead of blocking unary-unary RPCs.
+
+Compares blocking RPCs that reuse their thread's completion queue against
+blocking RPCs that each create (and later destroy) a completion queue of their
+own, which was the behavior of gRPC Python before completion queue reuse.
+"""
+
+import argparse
+import contextlib
+import time
+
+from concurrent import futures
+import grpc
+from grpc import _channel
+from grpc._cython import cygrpc
+
+_METHOD = '/test/UnaryUnary'
+_REQUEST = b'\x00\x00\x00'
+
+
+def _handle_unary_unary(request, unused_servicer_context):
+    return request
+
+
+@contextlib.contextmanager
+def _fresh_completion_queues():
+    take_blocking_completion_queue = _channel._take_blocking_completion_queue
+    _channel._take_blocking_completion_queue = cygrpc.CompletionQueue
+    try:
+        yield
+    finally:
+        _channel._take_blocking_completion_queue = (
+            take_blocking_completion_queue)
+
+
+def _completion_queue_lifecycle_seconds(iterations):
+    start_time = time.time()
+    for _ in range(iterations):
+        cygrpc.CompletionQueue()
+    return (time.time() - start_time) / iterations
+
+
+def _blocking_call_seconds(multi_callable, iterations):
+    start_time = time.time()
+    for _ in range(iterations):
+        multi_callable(_REQUEST)
+    return (time.time() - start_time) / iterations
+
+
+def run_benchmark(iterations):
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=1),
+        handlers=(grpc.method_handlers_generic_handler('test', {
+            'UnaryUnary':
+            grpc.unary_unary_rpc_method_handler(_handle_unary_unary)
+        }),))
+    port = server.add_insecure_port('[::]:0')
+    server.start()
+    channel = grpc.insecure_channel('localhost:{}'.format(port))
+    multi_callable = channel.unary_unary(_METHOD)
+    # Warm up the connection.
+    multi_callable(_REQUEST)
+
+    print('completion queue create and destroy: {:.2f} us'.format(
+        _completion_queue_lifecycle_seconds(iterations) * 1e6))
+    with _fresh_completion_queues():
+        fresh_seconds = _blocking_call_seconds(multi_callable, iterations)
+    reused_seconds = _blocking_call_seconds(multi_callable, iterations)
+    print('blocking call, completion queue per call: {:.2f} us'.format(
+        fresh_seconds * 1e6))
+    print('blocking call, reused completion queue: {:.2f} us'.format(
+        reused_seconds * 1e6))
+    print('per-call overhead saved: {:.2f} us'.format((fresh_seconds -
+                                                       reused_seconds) * 1e6))
+
+    server.stop(None)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='gRPC Python blocking unary-unary overhead benchmark')
+    parser.add_argument(
+        '--iterations',
+        type=int,
+        default=10000,
+        help='The number of calls to make in each configuration')
+    args = parser.parse_args()
+
+    run_benchmark(args.iterations)
@@ -0,0 +1,97 @@
+# Copyright 2017, Google Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#     * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+#     * Neither the name of Google Inc. nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Compares client-streaming upload throughput with and without a write window.
+
+Without a write window each request is sent before the next is taken from the
+request iterator; with one, requests are queued and sent back-to-back with a
+buffer hint while the iterator is consumed.
+"""
+
+import argparse
+import time
+
+from concurrent import futures
+import grpc
+
+_METHOD = '/test/StreamUnary'
+_WRITE_WINDOWS = (None, 4, 16, 64)
+
+
+def _handle_stream_unary(request_iterator, unused_servicer_context):
+    for _ in request_iterator:
+        pass
+    return b''
+
+
+def _messages_per_second(multi_callable, message_count, message):
+    start_time = time.time()
+    multi_callable(iter([message] * message_count))
+    return message_count / (time.time() - start_time)
+
+
+def run_benchmark(message_count, message_size):
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=1),
+        handlers=(grpc.method_handlers_generic_handler('test', {
+            'StreamUnary':
+            grpc.stream_unary_rpc_method_handler(_handle_stream_unary)
+        }),))
+    port = server.add_insecure_port('[::]:0')
+    server.start()
+    channel = grpc.insecure_channel('localhost:{}'.format(port))
+    message = b'\x00' * message_size
+
+    for write_window in _WRITE_WINDOWS:
+        multi_callable = channel.stream_unary(
+            _METHOD, write_window=write_window)
+        # Warm up the connection.
+        multi_callable(iter([message]))
+        print('write window {}: {:.0f} messages/s'.format(
+            write_window,
+            _messages_per_second(multi_callable, message_count, message)))
+
+    server.stop(None)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='gRPC Python client-streaming throughput benchmark')
+    parser.add_argument(
+        '--message_count',
+        type=int,
+        default=10000,
+        help='The number of request messages to stream in each configuration')
+    parser.add_argument(
+        '--message_size',
+        type=int,
+        default=16,
+        help='The size in bytes of each request message')
+    args = parser.parse_args()
+
+    run_benchmark(args.message_count, args.message_size)
@@ -0,0 +1,133 @@
+# Copyright 2017, Google Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#     * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+#     * Neither the name of Google Inc. nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Reports the memory used per idle stream-stream RPC.
+
+The server's thread pool has a single thread, which the first RPC occupies,
+so that every later RPC is held idle by both the client and the server
+without occupying a thread. The memory of the process (which is both client
+and server) is measured once all of the RPCs have reached the server.
+"""
+
+import argparse
+import resource
+import threading
+
+from concurrent import futures
+import grpc
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+_STREAM_STREAM = '/test/StreamStream'
+
+
+class _GenericHandler(grpc.GenericRpcHandler):
+
+    def __init__(self, release):
+        self._release = release
+        self._condition = threading.Condition()
+        self._serviced = 0
+
+        def handle_stream_stream(request_iterator, unused_servicer_context):
+            self._release.wait()
+            for request in request_iterator:
+                yield request
+
+        self._method_handler = grpc.stream_stream_rpc_method_handler(
+            handle_stream_stream)
+
+    def service(self, handler_call_details):
+        with self._condition:
+            self._serviced += 1
+            self._condition.notify_all()
+        return self._method_handler
+
+    def await_serviced(self, count):
+        with self._condition:
+            while self._serviced < count:
+                self._condition.wait()
+
+
+def _maximum_resident_bytes():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _traced_bytes():
+    return 0 if tracemalloc is None else tracemalloc.get_traced_memory()[0]
+
+
+def run_benchmark(stream_count):
+    release = threading.Event()
+    handler = _GenericHandler(release)
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=1), handlers=(handler,))
+    port = server.add_insecure_port('[::]:0')
+    server.start()
+    channel = grpc.insecure_channel('localhost:{}'.format(port))
+    multi_callable = channel.stream_stream(_STREAM_STREAM)
+    # Occupy the server's only thread and warm up the connection.
+    calls = [multi_callable(iter(()))]
+    handler.await_serviced(1)
+
+    if tracemalloc is not None:
+        tracemalloc.start()
+    start_resident_bytes = _maximum_resident_bytes()
+    start_traced_bytes = _traced_bytes()
+    for _ in range(stream_count):
+        calls.append(multi_callable(iter(())))
+    handler.await_serviced(1 + stream_count)
+    resident_bytes = _maximum_resident_bytes() - start_resident_bytes
+    traced_bytes = _traced_bytes() - start_traced_bytes
+
+    print('{} idle streams: {:.0f} resident bytes per stream'.format(
+        stream_count, float(resident_bytes) / stream_count))
+    if tracemalloc is not None:
+        print('{} idle streams: {:.0f} Python heap bytes per stream'.format(
+            stream_count, float(traced_bytes) / stream_count))
+        tracemalloc.stop()
+
+    release.set()
+    for call in calls:
+        call.cancel()
+    server.stop(None)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='gRPC Python idle stream memory benchmark')
+    parser.add_argument(
+        '--stream_count',
+        type=int,
+        default=10000,
+        help='The number of idle streams to hold open')
+    args = parser.parse_args()
+
+    run_benchmark(args.stream_count)
@@ -0,0 +1,113 @@
+# Copyright 2017, Google Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#     * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+#     * Neither the name of Google Inc. nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Compares the latency of inline and thread-pool unary-unary handlers.
+
+Inline handlers are called directly on the thread servicing the server's
+completion queue; pooled handlers are submitted to the server's thread pool
+and so pay for a thread handoff on every RPC.
+"""
+
+import argparse
+import time
+
+from concurrent import futures
+import grpc
+
+_POOLED = '/test/Pooled'
+_INLINE = '/test/Inline'
+_REQUEST = b'\x00\x00\x00'
+
+
+def _handle_unary_unary(request, unused_servicer_context):
+    return request
+
+
+def _latencies(multi_callable, iterations):
+    latencies = []
+    for _ in range(iterations):
+        start_time = time.time()
+        multi_callable(_REQUEST)
+        latencies.append(time.time() - start_time)
+    return sorted(latencies)
+
+
+def _percentile(sorted_latencies, percentile):
+    index = int(len(sorted_latencies) * percentile / 100.0)
+    return sorted_latencies[min(index, len(sorted_latencies) - 1)]
+
+
+def _report(name, sorted_latencies):
+    print('{}: p50 {:.2f} us, p99 {:.2f} us'.format(
+        name,
+        _percentile(sorted_latencies, 50) * 1e6,
+        _percentile(sorted_latencies, 99) * 1e6))
+
+
+def run_benchmark(iterations, pool_size):
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=pool_size),
+        handlers=(grpc.method_handlers_generic_handler('test', {
+            'Pooled':
+            grpc.unary_unary_rpc_method_handler(_handle_unary_unary),
+            'Inline':
+            grpc.unary_unary_rpc_method_handler(
+                _handle_unary_unary, inline=True),
+        }),))
+    port = server.add_insecure_port('[::]:0')
+    server.start()
+    channel = grpc.insecure_channel('localhost:{}'.format(port))
+    pooled = channel.unary_unary(_POOLED)
+    inline = channel.unary_unary(_INLINE)
+    # Warm up the connection and the thread pool.
+    for _ in range(pool_size):
+        pooled(_REQUEST)
+        inline(_REQUEST)
+
+    _report('pooled handler', _latencies(pooled, iterations))
+    _report('inline handler', _latencies(inline, iterations))
+
+    server.stop(None)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='gRPC Python inline handler latency benchmark')
+    parser.add_argument(
+        '--iterations',
+        type=int,
+        default=10000,
+        help='The number of calls to make to each handler')
+    parser.add_argument(
+        '--pool_size',
+        type=int,
+        default=10,
+        help='The number of threads in the server\'s thread pool')
+    args = parser.parse_args()
+
+    run_benchmark(args.iterations, args.pool_size)
@@ -38,9 +38,9 @@ from src.proto.grpc.testing import services_pb2_grpc
 from tests.qps import worker_server
 
 
-def run_worker_server(port):
+def run_worker_server(port, write_window):
     server = grpc.server(futures.ThreadPoolExecutor(max_workers=5))
-    servicer = worker_server.WorkerServer()
+    servicer = worker_server.WorkerServer(write_window)
     services_pb2_grpc.add_WorkerServiceServicer_to_server(servicer, server)
     server.add_insecure_port('[::]:{}'.format(port))
     server.start()
@@ -56,6 +56,12 @@ if __name__ == '__main__':
         type=int,
         dest='port',
         help='The port the worker should listen on')
+    parser.add_argument(
+        '--write_window',
+        type=int,
+        default=None,
+        help='The number of requests each streaming client RPC may queue for '
+        'transmission; by default each request is sent before the next')
     args = parser.parse_args()
 
-    run_worker_server(args.port)
+    run_worker_server(args.port, args.write_window)
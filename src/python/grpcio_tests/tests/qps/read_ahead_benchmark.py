@@ -0,0 +1,171 @@
+# Copyright 2017, Google Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#     * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+#     * Neither the name of Google Inc. nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Compares response-streaming throughput with and without read-ahead.
+
+The client reaches the server through a local proxy that delays every chunk of
+data it forwards, simulating a link with latency but ample bandwidth, and
+spends a fixed time working on each response it takes. Without read-ahead a
+response is received only once it is asked for; with it, responses are received
+while the client works on earlier ones.
+"""
+
+import argparse
+import socket
+import threading
+import time
+
+from concurrent import futures
+from six.moves import queue
+import grpc
+
+_METHOD = '/test/UnaryStream'
+_READ_AHEADS = (None, 1, 4, 16)
+_CHUNK_SIZE = 65536
+
+
+def _handle_unary_stream(request, unused_servicer_context):
+    message_count, message_size = (int(value) for value in request.split(b','))
+    message = b'\x00' * message_size
+    for _ in range(message_count):
+        yield message
+
+
+def _delay_line(source, destination, latency):
+    chunks = queue.Queue()
+
+    def receive():
+        while True:
+            chunk = source.recv(_CHUNK_SIZE)
+            chunks.put((time.time() + latency, chunk))
+            if not chunk:
+                return
+
+    def send():
+        while True:
+            due, chunk = chunks.get()
+            remaining = due - time.time()
+            if 0 < remaining:
+                time.sleep(remaining)
+            if chunk:
+                destination.sendall(chunk)
+            else:
+                destination.shutdown(socket.SHUT_WR)
+                return
+
+    for target in (receive, send):
+        thread = threading.Thread(target=target)
+        thread.daemon = True
+        thread.start()
+
+
+def _serve_latency_proxy(listener, port, latency):
+    while True:
+        client_socket, _ = listener.accept()
+        server_socket = socket.create_connection(('localhost', port))
+        for source, destination in ((client_socket, server_socket),
+                                    (server_socket, client_socket)):
+            _delay_line(source, destination, latency)
+
+
+def _start_latency_proxy(port, latency):
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(('localhost', 0))
+    listener.listen(1)
+    thread = threading.Thread(
+        target=_serve_latency_proxy, args=(listener, port, latency))
+    thread.daemon = True
+    thread.start()
+    return listener.getsockname()[1]
+
+
+def _work(work_time):
+    until = time.time() + work_time
+    while time.time() < until:
+        pass
+
+
+def _messages_per_second(multi_callable, request, message_count, work_time):
+    start_time = time.time()
+    for _ in multi_callable(request):
+        _work(work_time)
+    return message_count / (time.time() - start_time)
+
+
+def run_benchmark(message_count, message_size, latency, work_time):
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=1),
+        handlers=(grpc.method_handlers_generic_handler('test', {
+            'UnaryStream':
+            grpc.unary_stream_rpc_method_handler(_handle_unary_stream)
+        }),))
+    port = server.add_insecure_port('[::]:0')
+    server.start()
+    proxy_port = _start_latency_proxy(port, latency)
+    channel = grpc.insecure_channel('localhost:{}'.format(proxy_port))
+    request = '{},{}'.format(message_count, message_size).encode('ascii')
+
+    for read_ahead in _READ_AHEADS:
+        multi_callable = channel.unary_stream(_METHOD, read_ahead=read_ahead)
+        # Warm up the connection.
+        tuple(multi_callable(b'1,1'))
+        print('read ahead {}: {:.0f} messages/s'.format(
+            read_ahead,
+            _messages_per_second(multi_callable, request, message_count,
+                                 work_time)))
+
+    server.stop(None)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='gRPC Python response-streaming read-ahead benchmark')
+    parser.add_argument(
+        '--message_count',
+        type=int,
+        default=10000,
+        help='The number of response messages to stream in each configuration')
+    parser.add_argument(
+        '--message_size',
+        type=int,
+        default=16,
+        help='The size in bytes of each response message')
+    parser.add_argument(
+        '--latency',
+        type=float,
+        default=0.005,
+        help='The one-way latency in seconds added by the local proxy')
+    parser.add_argument(
+        '--work_time',
+        type=float,
+        default=0.00005,
+        help='The time in seconds the client spends on each response')
+    args = parser.parse_args()
+
+    run_benchmark(args.message_count, args.message_size, args.latency,
+                  args.work_time)
@@ -0,0 +1,121 @@
+# Copyright 2017, Google Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#     * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+#     * Neither the name of Google Inc. nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Measures the rate at which a server accepts RPCs.
+
+Reports accepted RPCs per second for a range of values of the
+pending_request_calls server option under a burst of concurrent unary RPCs.
+"""
+
+import argparse
+import threading
+import time
+
+from concurrent import futures
+import grpc
+
+_METHOD = '/test/UnaryUnary'
+_REQUEST = b'\x00\x00\x00'
+
+
+def _handle_unary_unary(request, unused_servicer_context):
+    return request
+
+
+def _generic_handler():
+    return grpc.method_handlers_generic_handler('test', {
+        'UnaryUnary':
+        grpc.unary_unary_rpc_method_handler(_handle_unary_unary)
+    })
+
+
+def _accepted_rpcs_per_second(pending_request_calls, channel_count, rpc_count):
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=16),
+        handlers=(_generic_handler(),),
+        pending_request_calls=pending_request_calls)
+    port = server.add_insecure_port('[::]:0')
+    server.start()
+    channels = [
+        grpc.insecure_channel('localhost:{}'.format(port))
+        for _ in range(channel_count)
+    ]
+    for channel in channels:
+        grpc.channel_ready_future(channel).result()
+    multi_callables = [channel.unary_unary(_METHOD) for channel in channels]
+
+    condition = threading.Condition()
+    remaining = [rpc_count]
+
+    def on_done(unused_response_future):
+        with condition:
+            remaining[0] -= 1
+            if not remaining[0]:
+                condition.notify_all()
+
+    start_time = time.time()
+    for index in range(rpc_count):
+        response_future = multi_callables[index %
+                                          channel_count].future(_REQUEST)
+        response_future.add_done_callback(on_done)
+    with condition:
+        while remaining[0]:
+            condition.wait()
+    elapsed = time.time() - start_time
+
+    server.stop(None)
+    return rpc_count / elapsed
+
+
+def run_benchmark(pending_request_calls_values, channel_count, rpc_count):
+    for pending_request_calls in pending_request_calls_values:
+        rate = _accepted_rpcs_per_second(pending_request_calls, channel_count,
+                                         rpc_count)
+        print('pending_request_calls={}: {:.1f} accepted RPCs/sec'.format(
+            pending_request_calls, rate))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='gRPC Python server RPC acceptance benchmark')
+    parser.add_argument(
+        '--pending_request_calls',
+        type=int,
+        nargs='+',
+        default=[1, 2, 4, 8, 16, 32],
+        help='The pending_request_calls values to benchmark')
+    parser.add_argument(
+        '--channels',
+        type=int,
+        default=8,
+        help='The number of client channels issuing RPCs')
+    parser.add_argument(
+        '--rpcs', type=int, default=10000, help='The number of RPCs to issue')
+    args = parser.parse_args()
+
+    run_benchmark(args.pending_request_calls, args.channels, args.rpcs)
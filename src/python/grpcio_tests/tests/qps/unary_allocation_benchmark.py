@@ -0,0 +1,119 @@
+# Copyright 2017, Google Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#     * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+#     * Neither the name of Google Inc. nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Counts the Python allocations made per unary-unary call by cygrpc.
+
+Compares starting the six operations of a unary-unary RPC as Operation objects
+in an Operations batch with Call.start_unary_unary, which fills them into the
+batch directly. Calls are made on a channel to an address at which no server
+listens so that only the allocations of the client are counted; each call
+fails fast once the channel has failed to connect.
+
+Allocations are counted as the growth of the interpreter's allocated memory
+blocks while every call, batch, and completion event is kept alive, and so
+require Python 3.4 or later.
+"""
+
+import argparse
+import gc
+import sys
+import time
+
+from grpc._cython import cygrpc
+
+_EMPTY_FLAGS = 0
+_METHOD = b'/test/UnaryUnary'
+_REQUEST = b'\x00\x00\x00'
+_METADATA = cygrpc.Metadata(())
+_INFINITE_FUTURE = cygrpc.Timespec(float('+inf'))
+
+
+def _operations_call(channel, completion_queue):
+    call = channel.create_call(None, 0, completion_queue, _METHOD, None,
+                               _INFINITE_FUTURE)
+    operations = cygrpc.Operations(
+        (cygrpc.operation_send_initial_metadata(_METADATA, _EMPTY_FLAGS),
+         cygrpc.operation_send_message(_REQUEST, _EMPTY_FLAGS),
+         cygrpc.operation_send_close_from_client(_EMPTY_FLAGS),
+         cygrpc.operation_receive_initial_metadata(_EMPTY_FLAGS),
+         cygrpc.operation_receive_message(_EMPTY_FLAGS),
+         cygrpc.operation_receive_status_on_client(_EMPTY_FLAGS),))
+    call.start_client_batch(operations, None)
+    return call, operations, completion_queue.poll()
+
+
+def _unary_unary_batch_call(channel, completion_queue):
+    call = channel.create_call(None, 0, completion_queue, _METHOD, None,
+                               _INFINITE_FUTURE)
+    call.start_unary_unary(_METADATA, _REQUEST, None)
+    return call, completion_queue.poll()
+
+
+def _measure(make_call, channel, iterations):
+    completion_queue = cygrpc.CompletionQueue()
+    # Warm up the channel and any lazily-allocated state of make_call.
+    make_call(channel, completion_queue)
+    # Presize the list of retained objects so that it does not grow.
+    retained = [None] * iterations
+    gc.collect()
+    gc.disable()
+    try:
+        start_blocks = sys.getallocatedblocks()
+        start_time = time.time()
+        for index in range(iterations):
+            retained[index] = make_call(channel, completion_queue)
+        elapsed_time = time.time() - start_time
+        allocated_blocks = sys.getallocatedblocks() - start_blocks
+    finally:
+        gc.enable()
+    # Don't count the tuple in which each call's objects are retained.
+    return (float(allocated_blocks) / iterations - 1, elapsed_time / iterations)
+
+
+def run_benchmark(iterations):
+    channel = cygrpc.Channel(b'localhost:1', cygrpc.ChannelArgs([]))
+    for name, make_call in (('operations', _operations_call),
+                            ('start_unary_unary', _unary_unary_batch_call),):
+        allocations, latency = _measure(make_call, channel, iterations)
+        print('{}: {:.1f} allocations per call, {:.2f} us per call'.format(
+            name, allocations, latency * 1e6))
+
+
+if __name__ == '__main__':
+    if not hasattr(sys, 'getallocatedblocks'):
+        sys.exit('Counting allocations requires Python 3.4 or later.')
+    parser = argparse.ArgumentParser(
+        description='gRPC Python unary-unary call allocation benchmark')
+    parser.add_argument(
+        '--iterations',
+        type=int,
+        default=10000,
+        help='The number of calls to make with each approach')
+    args = parser.parse_args()
+
+    run_benchmark(args.iterations)
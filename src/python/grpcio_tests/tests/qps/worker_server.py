@@ -48,8 +48,9 @@ from tests.unit import resources
 class WorkerServer(services_pb2_grpc.WorkerServiceServicer):
     """Python Worker Server implementation."""
 
-    def __init__(self):
+    def __init__(self, write_window=None):
         self._quit_event = threading.Event()
+        self._write_window = write_window
 
     def RunServer(self, request_iterator, context):
         config = next(request_iterator).setup
@@ -163,7 +164,7 @@ class WorkerServer(services_pb2_grpc.WorkerServiceServicer):
                     server, config, qps_data)
             elif config.rpc_type == control_pb2.STREAMING:
                 client = benchmark_client.StreamingSyncBenchmarkClient(
-                    server, config, qps_data)
+                    server, config, qps_data, self._write_window)
         elif config.client_type == control_pb2.ASYNC_CLIENT:
             if config.rpc_type == control_pb2.UNARY:
                 client = benchmark_client.UnaryAsyncBenchmarkClient(
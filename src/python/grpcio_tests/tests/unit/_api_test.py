@@ -42,22 +42,24 @@ class AllTest(unittest.TestCase):
     def testAll(self):
         expected_grpc_code_elements = (
             'FutureTimeoutError', 'FutureCancelledError', 'Future',
-            'ChannelConnectivity', 'StatusCode', 'RpcError', 'RpcContext',
-            'Call', 'ChannelCredentials', 'CallCredentials',
-            'AuthMetadataContext', 'AuthMetadataPluginCallback',
-            'AuthMetadataPlugin', 'ServerCredentials',
-            'UnaryUnaryMultiCallable', 'UnaryStreamMultiCallable',
-            'StreamUnaryMultiCallable', 'StreamStreamMultiCallable', 'Channel',
-            'ServicerContext', 'RpcMethodHandler', 'HandlerCallDetails',
-            'GenericRpcHandler', 'ServiceRpcHandler', 'Server',
-            'unary_unary_rpc_method_handler', 'unary_stream_rpc_method_handler',
+            'FutureWaitCondition', 'ChannelConnectivity', 'StatusCode',
+            'RpcError', 'RpcContext', 'Call', 'ChannelCredentials',
+            'CallCredentials', 'AuthMetadataContext',
+            'AuthMetadataPluginCallback', 'AuthMetadataPlugin',
+            'ServerCredentials', 'UnaryUnaryMultiCallable',
+            'UnaryStreamMultiCallable', 'StreamUnaryMultiCallable',
+            'StreamStreamMultiCallable', 'Channel', 'ServicerContext',
+            'RpcMethodHandler', 'HandlerCallDetails', 'GenericRpcHandler',
+            'ServiceRpcHandler', 'Server', 'unary_unary_rpc_method_handler',
+            'unary_stream_rpc_method_handler',
             'stream_unary_rpc_method_handler',
-            'stream_stream_rpc_method_handler',
-            'method_handlers_generic_handler', 'ssl_channel_credentials',
-            'metadata_call_credentials', 'access_token_call_credentials',
-            'composite_call_credentials', 'composite_channel_credentials',
-            'ssl_server_credentials', 'channel_ready_future',
-            'insecure_channel', 'secure_channel', 'server',)
+            'stream_stream_rpc_method_handler', 'precompiled_metadata',
+            'raw_frame_deserializer', 'method_handlers_generic_handler',
+            'ssl_channel_credentials', 'metadata_call_credentials',
+            'access_token_call_credentials', 'composite_call_credentials',
+            'composite_channel_credentials', 'ssl_server_credentials',
+            'channel_ready_future', 'as_completed', 'wait', 'insecure_channel',
+            'secure_channel', 'channel_pool', 'server',)
 
         six.assertCountEqual(self, expected_grpc_code_elements,
                              _from_grpc_import_star.GRPC_ELEMENTS)
@@ -0,0 +1,171 @@
+# Copyright 2017, Google Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#     * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+#     * Neither the name of Google Inc. nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Tests of grpc.UnaryUnaryMultiCallable.batch."""
+
+import threading
+import time
+import unittest
+
+from concurrent import futures
+import grpc
+
+from tests.unit.framework.common import test_constants
+
+_UNARY_UNARY = '/test/UnaryUnary'
+
+_INVALID_REQUEST = b'\x01'
+_UNSERIALIZABLE_REQUEST = b'\x02'
+
+
+class _Handler(object):
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._request_count = 0
+
+    def handle_unary_unary(self, request, servicer_context):
+        with self._condition:
+            self._request_count += 1
+            self._condition.notify_all()
+        if request == _INVALID_REQUEST:
+            servicer_context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            servicer_context.set_details('Invalid request!')
+        return request
+
+    def block_until_request_count(self, request_count, timeout):
+        deadline = time.time() + timeout
+        with self._condition:
+            while self._request_count < request_count:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            return True
+
+
+def _serialize_request(request):
+    if request == _UNSERIALIZABLE_REQUEST:
+        raise ValueError('Unserializable request!')
+    return request
+
+
+class _FutureOnlyMultiCallable(grpc.UnaryUnaryMultiCallable):
+    """Exercises the default implementation of batch."""
+
+    def __init__(self, multi_callable):
+        self._multi_callable = multi_callable
+
+    def __call__(self, request, timeout=None, metadata=None, credentials=None):
+        raise NotImplementedError()
+
+    def with_call(self, request, timeout=None, metadata=None, credentials=None):
+        raise NotImplementedError()
+
+    def future(self, request, timeout=None, metadata=None, credentials=None):
+        return self._multi_callable.future(
+            request,
+            timeout=timeout,
+            metadata=metadata,
+            credentials=credentials)
+
+
+class BatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self._handler = _Handler()
+        self._server = grpc.server(
+            futures.ThreadPoolExecutor(max_workers=test_constants.POOL_SIZE),
+            handlers=(grpc.method_handlers_generic_handler('test', {
+                'UnaryUnary':
+                grpc.unary_unary_rpc_method_handler(
+                    self._handler.handle_unary_unary),
+            }),))
+        port = self._server.add_insecure_port('[::]:0')
+        self._server.start()
+        self._channel = grpc.insecure_channel('localhost:{}'.format(port))
+        self._requests = tuple(
+            bytes(bytearray((index % 256, 0, 0)))
+            for index in range(test_constants.RPC_CONCURRENCY))
+
+    def tearDown(self):
+        self._server.stop(None)
+
+    def _assert_echoed(self, outcomes):
+        responses = dict(outcomes)
+        self.assertEqual(len(self._requests), len(responses))
+        for index, request in enumerate(self._requests):
+            self.assertEqual(request, responses[index])
+
+    def testBatch(self):
+        multi_callable = self._channel.unary_unary(_UNARY_UNARY)
+        self._assert_echoed(
+            multi_callable.batch(
+                self._requests,
+                timeout=test_constants.LONG_TIMEOUT,
+                metadata=(('test', 'Batch'),)))
+
+    def testDefaultBatch(self):
+        multi_callable = _FutureOnlyMultiCallable(
+            self._channel.unary_unary(_UNARY_UNARY))
+        self._assert_echoed(multi_callable.batch(self._requests))
+
+    def testBatchProgressesBeforeIteration(self):
+        multi_callable = self._channel.unary_unary(_UNARY_UNARY)
+        outcomes = multi_callable.batch(
+            self._requests, timeout=test_constants.LONG_TIMEOUT)
+        self.assertTrue(
+            self._handler.block_until_request_count(
+                len(self._requests), test_constants.SHORT_TIMEOUT))
+        self._assert_echoed(outcomes)
+
+    def testBatchFailures(self):
+        multi_callable = self._channel.unary_unary(
+            _UNARY_UNARY, request_serializer=_serialize_request)
+        requests = (_UNSERIALIZABLE_REQUEST, b'\x00', _INVALID_REQUEST,
+                    _UNSERIALIZABLE_REQUEST)
+        outcomes = list(multi_callable.batch(requests))
+
+        # RPCs failing to start are yielded first and in request order.
+        self.assertSequenceEqual([0, 3], [index for index, _ in outcomes[:2]])
+        for unused_index, outcome in outcomes[:2]:
+            self.assertIsInstance(outcome, grpc.RpcError)
+            self.assertIs(grpc.StatusCode.INTERNAL, outcome.code())
+        outcomes = dict(outcomes[2:])
+        self.assertEqual(b'\x00', outcomes[1])
+        self.assertIsInstance(outcomes[2], grpc.RpcError)
+        self.assertIs(grpc.StatusCode.INVALID_ARGUMENT, outcomes[2].code())
+        self.assertEqual('Invalid request!', outcomes[2].details())
+
+    def testEmptyBatch(self):
+        multi_callable = self._channel.unary_unary(_UNARY_UNARY)
+        self.assertEqual([], list(multi_callable.batch(())))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
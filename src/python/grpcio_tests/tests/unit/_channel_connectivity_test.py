@@ -28,6 +28,7 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 """Tests of grpc._channel.Channel connectivity."""
 
+import os
 import threading
 import time
 import unittest
@@ -36,6 +37,9 @@ import grpc
 from tests.unit.framework.common import test_constants
 from tests.unit import _thread_pool
 
+_IDLE_CHANNEL_COUNT = 1000
+_MAXIMUM_IDLE_CPU_FRACTION = 0.1
+
 
 def _ready_in_connectivities(connectivities):
     return grpc.ChannelConnectivity.READY in connectivities
@@ -45,6 +49,11 @@ def _last_connectivity_is_not_ready(connectivities):
     return connectivities[-1] is not grpc.ChannelConnectivity.READY
 
 
+def _cpu_time():
+    times = os.times()
+    return times[0] + times[1]
+
+
 class _Callback(object):
 
     def __init__(self):
@@ -155,6 +164,29 @@ class ChannelConnectivityTest(unittest.TestCase):
         channel.unsubscribe(callback.update)
         self.assertFalse(thread_pool.was_used())
 
+    def test_many_idle_subscribed_channels(self):
+        callbacks = tuple(_Callback() for _ in range(_IDLE_CHANNEL_COUNT))
+        channels = tuple(
+            grpc.insecure_channel('localhost:12345') for _ in callbacks)
+        for channel, callback in zip(channels, callbacks):
+            channel.subscribe(callback.update, try_to_connect=False)
+        for callback in callbacks:
+            callback.block_until_connectivities_satisfy(bool)
+
+        start_cpu_time = _cpu_time()
+        time.sleep(test_constants.SHORT_TIMEOUT)
+        idle_cpu_time = _cpu_time() - start_cpu_time
+        idle_thread_count = threading.active_count()
+        for channel, callback in zip(channels, callbacks):
+            channel.unsubscribe(callback.update)
+
+        self.assertLess(idle_cpu_time, test_constants.SHORT_TIMEOUT *
+                        _MAXIMUM_IDLE_CPU_FRACTION)
+        self.assertLess(idle_thread_count, _IDLE_CHANNEL_COUNT // 10)
+        for callback in callbacks:
+            self.assertSequenceEqual((grpc.ChannelConnectivity.IDLE,),
+                                     callback.connectivities())
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
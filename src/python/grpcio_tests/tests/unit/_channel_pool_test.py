@@ -0,0 +1,206 @@
+# Copyright 2017, Google Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#     * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+#     * Neither the name of Google Inc. nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Tests of grpc.channel_pool."""
+
+import threading
+import time
+import unittest
+
+from concurrent import futures
+import grpc
+from grpc import _channel
+
+from tests.unit.framework.common import test_constants
+
+_REQUEST = b'\x00\x00\x00'
+_RESPONSE = b'\x00\x00\x00'
+
+_UNARY_UNARY = '/test/UnaryUnary'
+_UNARY_STREAM = '/test/UnaryStream'
+_STREAM_UNARY = '/test/StreamUnary'
+_STREAM_STREAM = '/test/StreamStream'
+
+_POOL_SIZE = 3
+_POLL_INTERVAL = 0.01
+
+
+class _Handler(object):
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def handle_unary_unary(self, request, unused_servicer_context):
+        self.release.wait()
+        return _RESPONSE
+
+    def handle_unary_stream(self, request, unused_servicer_context):
+        for _ in range(test_constants.STREAM_LENGTH):
+            yield _RESPONSE
+
+    def handle_stream_unary(self, request_iterator, unused_servicer_context):
+        for request in request_iterator:
+            pass
+        return _RESPONSE
+
+    def handle_stream_stream(self, request_iterator, unused_servicer_context):
+        for request in request_iterator:
+            yield _RESPONSE
+
+
+def _generic_handler(handler):
+    return grpc.method_handlers_generic_handler('test', {
+        'UnaryUnary':
+        grpc.unary_unary_rpc_method_handler(handler.handle_unary_unary),
+        'UnaryStream':
+        grpc.unary_stream_rpc_method_handler(handler.handle_unary_stream),
+        'StreamUnary':
+        grpc.stream_unary_rpc_method_handler(handler.handle_stream_unary),
+        'StreamStream':
+        grpc.stream_stream_rpc_method_handler(handler.handle_stream_stream),
+    })
+
+
+class _Callback(object):
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._connectivities = []
+
+    def update(self, connectivity):
+        with self._condition:
+            self._connectivities.append(connectivity)
+            self._condition.notify_all()
+
+    def block_until_connectivity(self, connectivity):
+        with self._condition:
+            while connectivity not in self._connectivities:
+                self._condition.wait()
+
+
+class ChannelPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self._handler = _Handler()
+        self._server = grpc.server(
+            futures.ThreadPoolExecutor(max_workers=test_constants.POOL_SIZE),
+            handlers=(_generic_handler(self._handler),))
+        port = self._server.add_insecure_port('[::]:0')
+        self._server.start()
+        self._pool = grpc.channel_pool('localhost:{}'.format(port), _POOL_SIZE)
+
+    def tearDown(self):
+        self._handler.release.set()
+        self._server.stop(None)
+
+    def _call_count(self):
+        return sum(
+            _channel._call_count(channel._call_state)
+            for channel in self._pool._channels)
+
+    def testAllCardinalities(self):
+        self._handler.release.set()
+        self.assertEqual(_RESPONSE,
+                         self._pool.unary_unary(_UNARY_UNARY)(_REQUEST))
+        self.assertSequenceEqual(
+            [_RESPONSE] * test_constants.STREAM_LENGTH,
+            list(self._pool.unary_stream(_UNARY_STREAM)(_REQUEST)))
+        self.assertEqual(_RESPONSE,
+                         self._pool.stream_unary(_STREAM_UNARY)(
+                             iter([_REQUEST] * test_constants.STREAM_LENGTH)))
+        self.assertSequenceEqual(
+            [_RESPONSE] * test_constants.STREAM_LENGTH,
+            list(
+                self._pool.stream_stream(_STREAM_STREAM)(iter(
+                    [_REQUEST] * test_constants.STREAM_LENGTH))))
+
+    def testCallsSpreadAcrossChannels(self):
+        multi_callable = self._pool.unary_unary(_UNARY_UNARY)
+        response_futures = [
+            multi_callable.future(_REQUEST) for _ in range(_POOL_SIZE * 2)
+        ]
+        for channel in self._pool._channels:
+            self.assertEqual(2, _channel._call_count(channel._call_state))
+        self._handler.release.set()
+        for response_future in response_futures:
+            self.assertEqual(_RESPONSE, response_future.result())
+
+    def testBlockingCallsSpreadAcrossChannels(self):
+        multi_callable = self._pool.unary_unary(_UNARY_UNARY)
+        threads = []
+        for index in range(_POOL_SIZE * 2):
+            thread = threading.Thread(target=multi_callable, args=(_REQUEST,))
+            thread.start()
+            threads.append(thread)
+            # Each call is to be counted before the next picks its channel.
+            while self._call_count() <= index:
+                time.sleep(_POLL_INTERVAL)
+        for channel in self._pool._channels:
+            self.assertEqual(2, _channel._call_count(channel._call_state))
+        self._handler.release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(0, self._call_count())
+
+    def testConnectivity(self):
+        callback = _Callback()
+        self._pool.subscribe(callback.update, try_to_connect=True)
+        callback.block_until_connectivity(grpc.ChannelConnectivity.READY)
+        self._pool.unsubscribe(callback.update)
+        grpc.channel_ready_future(self._pool).result(
+            timeout=test_constants.SHORT_TIMEOUT)
+
+    def testConcurrentResubscription(self):
+
+        def resubscribe():
+            for _ in range(test_constants.THREAD_CONCURRENCY):
+                callback = _Callback()
+                self._pool.subscribe(callback.update)
+                self._pool.unsubscribe(callback.update)
+
+        threads = [
+            threading.Thread(target=resubscribe)
+            for _ in range(test_constants.THREAD_CONCURRENCY)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        callback = _Callback()
+        self._pool.subscribe(callback.update, try_to_connect=True)
+        callback.block_until_connectivity(grpc.ChannelConnectivity.READY)
+        self._pool.unsubscribe(callback.update)
+
+    def testInvalidSize(self):
+        with self.assertRaises(ValueError):
+            grpc.channel_pool('localhost:0', 0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
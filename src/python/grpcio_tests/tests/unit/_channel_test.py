@@ -0,0 +1,407 @@
+# Copyright 2017, Google Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#     * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+#     * Neither the name of Google Inc. nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Tests of grpc._channel.Channel configuration options."""
+
+import threading
+import unittest
+
+from concurrent import futures
+import grpc
+from grpc import _channel
+
+from tests.unit.framework.common import test_constants
+
+_REQUEST = b'\x00\x00\x00'
+_RESPONSE = b'\x00\x00\x00'
+
+_UNARY_UNARY = '/test/UnaryUnary'
+_UNARY_STREAM = '/test/UnaryStream'
+_STREAM_STREAM = '/test/StreamStream'
+_STREAM_UNARY = '/test/StreamUnary'
+
+_CHANNEL_COUNT = 100
+_SHARED_COMPLETION_QUEUE_COUNT = 2
+_WRITE_WINDOW = 8
+_READ_AHEAD = 8
+
+
+def _handle_unary_unary(request, unused_servicer_context):
+    return _RESPONSE
+
+
+def _handle_unary_stream(request, unused_servicer_context):
+    for index in range(bytearray(request)[0]):
+        yield bytes(bytearray((index,)))
+    if bytearray(request)[1]:
+        raise ValueError('Failing after streaming responses!')
+
+
+def _handle_stream_stream(request_iterator, unused_servicer_context):
+    for request in request_iterator:
+        yield _RESPONSE
+
+
+def _handle_stream_unary(request_iterator, unused_servicer_context):
+    return b''.join(request_iterator)
+
+
+def _generic_handler():
+    return grpc.method_handlers_generic_handler('test', {
+        'UnaryUnary':
+        grpc.unary_unary_rpc_method_handler(_handle_unary_unary),
+        'UnaryStream':
+        grpc.unary_stream_rpc_method_handler(_handle_unary_stream),
+        'StreamStream':
+        grpc.stream_stream_rpc_method_handler(_handle_stream_stream),
+        'StreamUnary':
+        grpc.stream_unary_rpc_method_handler(_handle_stream_unary),
+    })
+
+
+class SharedCompletionQueueCountTest(unittest.TestCase):
+
+    def setUp(self):
+        self._server = grpc.server(
+            futures.ThreadPoolExecutor(max_workers=test_constants.POOL_SIZE),
+            handlers=(_generic_handler(),))
+        port = self._server.add_insecure_port('[::]:0')
+        self._server.start()
+        self._target = 'localhost:{}'.format(port)
+
+    def tearDown(self):
+        self._server.stop(None)
+
+    def _channel(self):
+        return grpc.insecure_channel(
+            self._target,
+            shared_completion_queue_count=_SHARED_COMPLETION_QUEUE_COUNT)
+
+    def testConcurrentUnaryUnary(self):
+        multi_callable = self._channel().unary_unary(_UNARY_UNARY)
+        response_futures = [
+            multi_callable.future(_REQUEST)
+            for _ in range(test_constants.RPC_CONCURRENCY)
+        ]
+        for response_future in response_futures:
+            self.assertEqual(_RESPONSE, response_future.result())
+
+    def testStreamStream(self):
+        multi_callable = self._channel().stream_stream(_STREAM_STREAM)
+        response_iterator = multi_callable(
+            iter([_REQUEST] * test_constants.STREAM_LENGTH))
+        self.assertSequenceEqual([_RESPONSE] * test_constants.STREAM_LENGTH,
+                                 list(response_iterator))
+
+    def testThreadCountIndependentOfChannelCount(self):
+        # Warm the shared completion queues so that their threads are counted.
+        self._channel().unary_unary(_UNARY_UNARY).future(_REQUEST).result()
+        initial_thread_count = threading.active_count()
+
+        channels = [self._channel() for _ in range(_CHANNEL_COUNT)]
+        response_futures = [
+            channel.unary_unary(_UNARY_UNARY).future(_REQUEST)
+            for channel in channels
+        ]
+        self.assertLess(threading.active_count() - initial_thread_count,
+                        _CHANNEL_COUNT)
+        for response_future in response_futures:
+            self.assertEqual(_RESPONSE, response_future.result())
+
+    def testCompletionQueuesAssignedRoundRobinAcrossChannels(self):
+        shared_completion_queues = _channel._SHARED_COMPLETION_QUEUES
+        shared_completion_queues.reserve(_SHARED_COMPLETION_QUEUE_COUNT)
+        self.assertIsNot(
+            shared_completion_queues.next(_SHARED_COMPLETION_QUEUE_COUNT),
+            shared_completion_queues.next(_SHARED_COMPLETION_QUEUE_COUNT))
+
+    def testInvalidSharedCompletionQueueCount(self):
+        with self.assertRaises(ValueError):
+            grpc.insecure_channel(self._target, shared_completion_queue_count=0)
+
+
+class WriteWindowTest(unittest.TestCase):
+
+    def setUp(self):
+        self._server = grpc.server(
+            futures.ThreadPoolExecutor(max_workers=test_constants.POOL_SIZE),
+            handlers=(_generic_handler(),))
+        port = self._server.add_insecure_port('[::]:0')
+        self._server.start()
+        self._channel = grpc.insecure_channel('localhost:{}'.format(port))
+        self._requests = tuple(
+            bytes(bytearray((index % 256,)))
+            for index in range(test_constants.STREAM_LENGTH))
+
+    def tearDown(self):
+        self._server.stop(None)
+
+    def testBlockingStreamUnary(self):
+        multi_callable = self._channel.stream_unary(
+            _STREAM_UNARY, write_window=_WRITE_WINDOW)
+        self.assertEqual(b''.join(self._requests),
+                         multi_callable(iter(self._requests)))
+
+    def testFutureStreamUnary(self):
+        multi_callable = self._channel.stream_unary(
+            _STREAM_UNARY, write_window=_WRITE_WINDOW)
+        response_futures = [
+            multi_callable.future(iter(self._requests))
+            for _ in range(test_constants.THREAD_CONCURRENCY)
+        ]
+        for response_future in response_futures:
+            self.assertEqual(b''.join(self._requests), response_future.result())
+
+    def testStreamStream(self):
+        multi_callable = self._channel.stream_stream(
+            _STREAM_STREAM, write_window=_WRITE_WINDOW)
+        response_iterator = multi_callable(iter(self._requests))
+        self.assertSequenceEqual([_RESPONSE] * test_constants.STREAM_LENGTH,
+                                 list(response_iterator))
+
+    def testCancelledStreamUnary(self):
+        multi_callable = self._channel.stream_unary(
+            _STREAM_UNARY, write_window=_WRITE_WINDOW)
+
+        def endless_requests():
+            while True:
+                yield _REQUEST
+
+        response_future = multi_callable.future(endless_requests())
+        response_future.cancel()
+        with self.assertRaises(grpc.FutureCancelledError):
+            response_future.result()
+
+    def testInvalidWriteWindow(self):
+        with self.assertRaises(ValueError):
+            self._channel.stream_unary(_STREAM_UNARY, write_window=0)
+
+
+class ReadAheadTest(unittest.TestCase):
+
+    def setUp(self):
+        self._server = grpc.server(
+            futures.ThreadPoolExecutor(max_workers=test_constants.POOL_SIZE),
+            handlers=(_generic_handler(),))
+        port = self._server.add_insecure_port('[::]:0')
+        self._server.start()
+        self._channel = grpc.insecure_channel('localhost:{}'.format(port))
+        self._responses = tuple(
+            bytes(bytearray((index,))) for index in range(_READ_AHEAD * 4 + 1))
+
+    def tearDown(self):
+        self._server.stop(None)
+
+    def testUnaryStream(self):
+        multi_callable = self._channel.unary_stream(
+            _UNARY_STREAM, read_ahead=_READ_AHEAD)
+        response_iterator = multi_callable(
+            bytes(bytearray((len(self._responses), 0))))
+        self.assertSequenceEqual(self._responses, tuple(response_iterator))
+        self.assertIs(grpc.StatusCode.OK, response_iterator.code())
+
+    def testEmptyUnaryStream(self):
+        multi_callable = self._channel.unary_stream(
+            _UNARY_STREAM, read_ahead=_READ_AHEAD)
+        self.assertSequenceEqual((), tuple(multi_callable(b'\x00\x00')))
+
+    def testFailedUnaryStream(self):
+        multi_callable = self._channel.unary_stream(
+            _UNARY_STREAM, read_ahead=_READ_AHEAD)
+        response_iterator = multi_callable(
+            bytes(bytearray((len(self._responses), 1))))
+        for response in self._responses:
+            self.assertEqual(response, next(response_iterator))
+        with self.assertRaises(grpc.RpcError) as exception_context:
+            next(response_iterator)
+        self.assertIs(grpc.StatusCode.UNKNOWN,
+                      exception_context.exception.code())
+
+    def testCancelledUnaryStream(self):
+        multi_callable = self._channel.unary_stream(
+            _UNARY_STREAM, read_ahead=_READ_AHEAD)
+        response_iterator = multi_callable(
+            bytes(bytearray((len(self._responses), 0))))
+        self.assertEqual(self._responses[0], next(response_iterator))
+        response_iterator.cancel()
+        with self.assertRaises(grpc.RpcError) as exception_context:
+            for _ in response_iterator:
+                pass
+        self.assertIs(grpc.StatusCode.CANCELLED,
+                      exception_context.exception.code())
+
+    def testStreamStream(self):
+        multi_callable = self._channel.stream_stream(
+            _STREAM_STREAM, write_window=_WRITE_WINDOW, read_ahead=_READ_AHEAD)
+        response_iterator = multi_callable(
+            iter([_REQUEST] * test_constants.STREAM_LENGTH))
+        self.assertSequenceEqual([_RESPONSE] * test_constants.STREAM_LENGTH,
+                                 list(response_iterator))
+
+    def testInvalidReadAhead(self):
+        with self.assertRaises(ValueError):
+            self._channel.unary_stream(_UNARY_STREAM, read_ahead=0)
+
+
+class _RecordingDeserializer(object):
+
+    def __init__(self, fail):
+        self.threads = []
+        self._fail = fail
+
+    def __call__(self, serialized_response):
+        self.threads.append(threading.current_thread())
+        if self._fail:
+            raise ValueError('Failing to deserialize!')
+        return serialized_response
+
+
+class _BlockingDeserializer(object):
+    """Blocks in deserializing its first response until released."""
+
+    def __init__(self):
+        self.entered = threading.Event()
+        self.released = threading.Event()
+
+    def __call__(self, serialized_response):
+        if not self.entered.is_set():
+            self.entered.set()
+            self.released.wait()
+        return serialized_response
+
+
+class DeferDeserializationTest(unittest.TestCase):
+
+    def setUp(self):
+        self._server = grpc.server(
+            futures.ThreadPoolExecutor(max_workers=test_constants.POOL_SIZE),
+            handlers=(_generic_handler(),))
+        port = self._server.add_insecure_port('[::]:0')
+        self._server.start()
+        self._channel = grpc.insecure_channel('localhost:{}'.format(port))
+        self._responses = tuple(
+            bytes(bytearray((index,))) for index in range(_READ_AHEAD * 2 + 1))
+        self._request = bytes(bytearray((len(self._responses), 0)))
+
+    def tearDown(self):
+        self._server.stop(None)
+
+    def _assert_deserialized_in_this_thread(self, deserializer, count):
+        self.assertSequenceEqual([threading.current_thread()] * count,
+                                 deserializer.threads)
+
+    def testUnaryUnaryFuture(self):
+        deserializer = _RecordingDeserializer(False)
+        multi_callable = self._channel.unary_unary(
+            _UNARY_UNARY,
+            response_deserializer=deserializer,
+            defer_deserialization=True)
+        response_future = multi_callable.future(_REQUEST)
+        response_future.exception()
+        self.assertEqual([], deserializer.threads)
+        self.assertEqual(_RESPONSE, response_future.result())
+        self.assertEqual(_RESPONSE, response_future.result())
+        self._assert_deserialized_in_this_thread(deserializer, 1)
+
+    def testFailedUnaryUnaryFuture(self):
+        multi_callable = self._channel.unary_unary(
+            _UNARY_UNARY,
+            response_deserializer=_RecordingDeserializer(True),
+            defer_deserialization=True)
+        response_future = multi_callable.future(_REQUEST)
+        with self.assertRaises(grpc.RpcError) as exception_context:
+            response_future.result()
+        self.assertIs(grpc.StatusCode.INTERNAL,
+                      exception_context.exception.code())
+        self.assertIs(grpc.StatusCode.INTERNAL, response_future.code())
+
+    def testUnaryStream(self):
+        deserializer = _RecordingDeserializer(False)
+        multi_callable = self._channel.unary_stream(
+            _UNARY_STREAM,
+            response_deserializer=deserializer,
+            defer_deserialization=True)
+        self.assertSequenceEqual(self._responses,
+                                 tuple(multi_callable(self._request)))
+        self._assert_deserialized_in_this_thread(deserializer,
+                                                 len(self._responses))
+
+    def testReadAheadUnaryStream(self):
+        deserializer = _RecordingDeserializer(False)
+        multi_callable = self._channel.unary_stream(
+            _UNARY_STREAM,
+            response_deserializer=deserializer,
+            read_ahead=_READ_AHEAD,
+            defer_deserialization=True)
+        self.assertSequenceEqual(self._responses,
+                                 tuple(multi_callable(self._request)))
+        self._assert_deserialized_in_this_thread(deserializer,
+                                                 len(self._responses))
+
+    def testFailedReadAheadUnaryStream(self):
+        multi_callable = self._channel.unary_stream(
+            _UNARY_STREAM,
+            response_deserializer=_RecordingDeserializer(True),
+            read_ahead=_READ_AHEAD,
+            defer_deserialization=True)
+        response_iterator = multi_callable(self._request)
+        with self.assertRaises(grpc.RpcError):
+            next(response_iterator)
+        with self.assertRaises(grpc.RpcError):
+            next(response_iterator)
+        self.assertIs(grpc.StatusCode.INTERNAL, response_iterator.code())
+
+    def testSlowDeserializationDoesNotBlockChannel(self):
+        deserializer = _BlockingDeserializer()
+        multi_callable = self._channel.unary_stream(
+            _UNARY_STREAM,
+            response_deserializer=deserializer,
+            read_ahead=_READ_AHEAD,
+            defer_deserialization=True)
+        response_iterator = multi_callable(self._request)
+        responses = []
+        consumption_thread = threading.Thread(
+            target=lambda: responses.extend(response_iterator))
+        consumption_thread.start()
+        try:
+            deserializer.entered.wait()
+            # Responses read ahead of the blocked one arrive on the channel
+            # while this second RPC is in flight.
+            response_future = self._channel.unary_unary(_UNARY_UNARY).future(
+                _REQUEST)
+            self.assertEqual(
+                _RESPONSE,
+                response_future.result(timeout=test_constants.SHORT_TIMEOUT))
+        finally:
+            deserializer.released.set()
+            consumption_thread.join()
+        self.assertSequenceEqual(self._responses, responses)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -27,6 +27,7 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import sys
 import time
 import threading
 import unittest
@@ -77,6 +78,39 @@ class TypeSmokeTest(unittest.TestCase):
         with self.assertRaises(StopIteration):
             next(iterator)
 
+    def testMetadataInternedAndSharedCopy(self):
+        metadata = cygrpc.Metadata(
+            [cygrpc.Metadatum(b'a', b'b'), cygrpc.Metadatum(b'c', b'd')])
+        interned = metadata.interned()
+        shared_copy = interned.shared_copy()
+        del interned
+        for copy in (metadata.interned(), shared_copy,
+                     shared_copy.shared_copy()):
+            self.assertEqual(2, len(copy))
+            self.assertEqual(
+                [(b'a', b'b'), (b'c', b'd')],
+                [(metadatum.key, metadatum.value) for metadatum in copy])
+
+    def testServerRPCStateFinishBatch(self):
+        state = cygrpc.ServerRPCState()
+        callbacks = state.callbacks
+        state.due |= 1 | 2
+        with state.condition:
+            self.assertEqual((None, ()), state.finish_batch(1))
+            state.statused = True
+            self.assertEqual((state, callbacks), state.finish_batch(2))
+        self.assertEqual(0, state.due)
+        self.assertIsNone(state.callbacks)
+
+    def testServerRPCStateBatchFinisher(self):
+        state = cygrpc.ServerRPCState()
+        state.due |= 4
+        state.client = cygrpc.ServerRPCClientState.cancelled
+        callbacks = state.callbacks
+        self.assertEqual((state, callbacks),
+                         state.batch_finisher(4, True)(None))
+        self.assertEqual(0, state.due)
+
     def testOperationsIteration(self):
         operations = cygrpc.Operations(
             [cygrpc.operation_send_message(b'asdf', _EMPTY_FLAGS)])
@@ -93,6 +127,57 @@ class TypeSmokeTest(unittest.TestCase):
                                                   cygrpc.WriteFlag.no_compress)
         self.assertEqual(cygrpc.WriteFlag.no_compress, operation.flags)
 
+    def testByteBufferContents(self):
+        data = b'\x00\x01' * 4096
+        byte_buffer = cygrpc.ByteBuffer(data)
+        self.assertEqual(data, byte_buffer.bytes())
+        view = byte_buffer.memoryview()
+        self.assertTrue(view.readonly)
+        del byte_buffer
+        self.assertEqual(data, view.tobytes())
+        self.assertIsNone(cygrpc.ByteBuffer(None).bytes())
+        self.assertIsNone(cygrpc.ByteBuffer(None).memoryview())
+
+    def testByteBufferFromBufferObjects(self):
+        for length in (3, 1024 * 1024,):
+            data = b'\x07' * length
+            self.assertEqual(data, cygrpc.ByteBuffer(bytearray(data)).bytes())
+            self.assertEqual(data, cygrpc.ByteBuffer(memoryview(data)).bytes())
+        with self.assertRaises(TypeError):
+            cygrpc.ByteBuffer(object())
+
+    def testByteBufferReleasesBuffers(self):
+        length = 1024 * 1024
+        data = bytearray(b'\x07' * length)
+        byte_buffer = cygrpc.ByteBuffer(data)
+        # The contents of mutable buffers are copied, so that the buffer may be
+        # resized and mutated without affecting what is sent.
+        data.extend(b'\x08')
+        data[0] = 0
+        self.assertEqual(b'\x07' * length, byte_buffer.bytes())
+
+        data = b'\x07' * length
+        reference_count = sys.getrefcount(data)
+        byte_buffer = cygrpc.ByteBuffer(data)
+        byte_buffer_copy = byte_buffer.copy()
+        self.assertLess(reference_count, sys.getrefcount(data))
+        del byte_buffer
+        self.assertLess(reference_count, sys.getrefcount(data))
+        del byte_buffer_copy
+        self.assertEqual(reference_count, sys.getrefcount(data))
+
+    def testByteBufferCopy(self):
+        data = b'\x03' * 1024
+        byte_buffer = cygrpc.ByteBuffer(data)
+        byte_buffer_copy = byte_buffer.copy()
+        del byte_buffer
+        self.assertEqual(len(data), len(byte_buffer_copy))
+        self.assertEqual(data, byte_buffer_copy.bytes())
+        self.assertIsNone(cygrpc.ByteBuffer(None).copy().bytes())
+        operation = cygrpc.operation_send_message(byte_buffer_copy, 0)
+        self.assertEqual(cygrpc.OperationType.send_message, operation.type)
+        self.assertEqual(data, byte_buffer_copy.bytes())
+
     def testTimespec(self):
         now = time.time()
         now_timespec_a = cygrpc.Timespec(now)
@@ -155,6 +240,30 @@ class TypeSmokeTest(unittest.TestCase):
         del server
         del completion_queue
 
+    def testCompletionQueuePollMany(self):
+        completion_queue = cygrpc.CompletionQueue()
+        events = completion_queue.poll_many(4, cygrpc.Timespec(time.time()))
+        self.assertEqual(1, len(events))
+        self.assertEqual(cygrpc.CompletionType.queue_timeout, events[0].type)
+
+        server = cygrpc.Server(cygrpc.ChannelArgs([]))
+        server.add_http2_port(b'[::]:0')
+        server.register_completion_queue(completion_queue)
+        server.start()
+        shutdown_tags = (object(), object())
+        for shutdown_tag in shutdown_tags:
+            server.shutdown(completion_queue, shutdown_tag)
+        events = []
+        while len(events) < len(shutdown_tags):
+            events.extend(completion_queue.poll_many(4))
+        self.assertEqual(len(shutdown_tags), len(events))
+        for event in events:
+            self.assertEqual(cygrpc.CompletionType.operation_complete,
+                             event.type)
+        self.assertEqual(set(shutdown_tags), set(event.tag for event in events))
+        del server
+        del completion_queue
+
 
 class ServerClientMixin(object):
 
@@ -364,6 +473,79 @@ class ServerClientMixin(object):
         del client_call
         del server_call
 
+    def testUnaryUnaryBatch(self):
+        DEADLINE = time.time() + 5
+        SERVER_INITIAL_METADATA_KEY = b'init_me_me_me'
+        SERVER_INITIAL_METADATA_VALUE = b'whodawha?'
+        SERVER_TRAILING_METADATA_KEY = b'california_is_in_a_drought'
+        SERVER_TRAILING_METADATA_VALUE = b'zomg it is'
+        SERVER_STATUS_CODE = cygrpc.StatusCode.ok
+        SERVER_STATUS_DETAILS = b'our work is never over'
+        REQUEST = b'in death a member of project mayhem has a name'
+        RESPONSE = b'his name is robert paulson'
+        METHOD = b'twinkies'
+
+        cygrpc_deadline = cygrpc.Timespec(DEADLINE)
+
+        server_request_tag = object()
+        self.server.request_call(self.server_completion_queue,
+                                 self.server_completion_queue,
+                                 server_request_tag)
+
+        client_call_tag = object()
+        client_call = self.client_channel.create_call(
+            None, 0, self.client_completion_queue, METHOD, self.host_argument,
+            cygrpc_deadline)
+        client_start_result = client_call.start_unary_unary(
+            cygrpc.Metadata([]), REQUEST, client_call_tag)
+        self.assertEqual(cygrpc.CallError.ok, client_start_result)
+        client_event_future = test_utilities.CompletionQueuePollFuture(
+            self.client_completion_queue, cygrpc_deadline)
+
+        request_event = self.server_completion_queue.poll(cygrpc_deadline)
+        server_call = request_event.operation_call
+        server_initial_metadata = cygrpc.Metadata([
+            cygrpc.Metadatum(SERVER_INITIAL_METADATA_KEY,
+                             SERVER_INITIAL_METADATA_VALUE)
+        ])
+        server_trailing_metadata = cygrpc.Metadata([
+            cygrpc.Metadatum(SERVER_TRAILING_METADATA_KEY,
+                             SERVER_TRAILING_METADATA_VALUE)
+        ])
+        server_call.start_server_batch([
+            cygrpc.operation_send_initial_metadata(
+                server_initial_metadata,
+                _EMPTY_FLAGS), cygrpc.operation_receive_message(_EMPTY_FLAGS),
+            cygrpc.operation_send_message(RESPONSE, _EMPTY_FLAGS),
+            cygrpc.operation_receive_close_on_server(_EMPTY_FLAGS),
+            cygrpc.operation_send_status_from_server(
+                server_trailing_metadata, SERVER_STATUS_CODE,
+                SERVER_STATUS_DETAILS, _EMPTY_FLAGS)
+        ], object())
+
+        server_event = self.server_completion_queue.poll(cygrpc_deadline)
+        client_event = client_event_future.result()
+
+        self.assertIs(client_call_tag, client_event.tag)
+        self.assertTrue(client_event.success)
+        self.assertIsNone(client_event.batch_operations)
+        batch = client_event.unary_unary_batch
+        self.assertTrue(
+            test_common.metadata_transmitted(server_initial_metadata,
+                                             batch.received_initial_metadata))
+        self.assertEqual(RESPONSE, batch.received_message.bytes())
+        self.assertEqual(RESPONSE, batch.received_byte_buffer.bytes())
+        self.assertTrue(
+            test_common.metadata_transmitted(server_trailing_metadata,
+                                             batch.received_trailing_metadata))
+        self.assertEqual(SERVER_STATUS_CODE, batch.received_status_code)
+        self.assertEqual(SERVER_STATUS_DETAILS, batch.received_status_details)
+        self.assertEqual(REQUEST, server_event.batch_operations[1]
+                         .received_message.bytes())
+
+        del client_call
+        del server_call
+
     def test6522(self):
         DEADLINE = time.time() + 5
         DEADLINE_TOLERANCE = 0.25
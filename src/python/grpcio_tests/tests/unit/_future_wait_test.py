@@ -0,0 +1,155 @@
+# Copyright 2017, Google Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#     * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+#     * Neither the name of Google Inc. nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Tests of grpc.as_completed and grpc.wait."""
+
+import threading
+import unittest
+
+from concurrent import futures
+import grpc
+
+from tests.unit.framework.common import test_constants
+
+_UNARY_UNARY = '/test/UnaryUnary'
+
+_RPC_COUNT = 4
+_FAILING_RPC = 2
+_SHORT_TIMEOUT = 0.2
+
+
+class _Handler(object):
+
+    def __init__(self):
+        self.releases = tuple(threading.Event() for _ in range(_RPC_COUNT))
+
+    def handle_unary_unary(self, request, servicer_context):
+        index = bytearray(request)[0]
+        self.releases[index].wait()
+        if index == _FAILING_RPC:
+            servicer_context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+        return request
+
+    def release_all(self):
+        for release in self.releases:
+            release.set()
+
+
+class FutureWaitTest(unittest.TestCase):
+
+    def setUp(self):
+        self._handler = _Handler()
+        self._server = grpc.server(
+            futures.ThreadPoolExecutor(max_workers=_RPC_COUNT),
+            handlers=(grpc.method_handlers_generic_handler('test', {
+                'UnaryUnary':
+                grpc.unary_unary_rpc_method_handler(
+                    self._handler.handle_unary_unary),
+            }),))
+        port = self._server.add_insecure_port('[::]:0')
+        self._server.start()
+        channel = grpc.insecure_channel('localhost:{}'.format(port))
+        multi_callable = channel.unary_unary(_UNARY_UNARY)
+        self._response_futures = tuple(
+            multi_callable.future(bytes(bytearray((index,))))
+            for index in range(_RPC_COUNT))
+
+    def tearDown(self):
+        self._handler.release_all()
+        self._server.stop(None)
+
+    def _release(self, index):
+        self._handler.releases[index].set()
+        self._response_futures[index].exception(
+            timeout=test_constants.SHORT_TIMEOUT)
+
+    def testAsCompleted(self):
+        completions = grpc.as_completed(
+            self._response_futures + self._response_futures,
+            timeout=test_constants.SHORT_TIMEOUT)
+
+        for index in reversed(range(_RPC_COUNT)):
+            self._release(index)
+            self.assertIs(self._response_futures[index], next(completions))
+        with self.assertRaises(StopIteration):
+            next(completions)
+
+    def testAsCompletedTimeout(self):
+        self._release(0)
+
+        completions = grpc.as_completed(
+            self._response_futures, timeout=_SHORT_TIMEOUT)
+
+        self.assertIs(self._response_futures[0], next(completions))
+        with self.assertRaises(grpc.FutureTimeoutError):
+            next(completions)
+
+    def testWaitAllCompleted(self):
+        self._handler.release_all()
+
+        done, not_done = grpc.wait(
+            self._response_futures, timeout=test_constants.SHORT_TIMEOUT)
+
+        self.assertEqual(set(self._response_futures), done)
+        self.assertEqual(set(), not_done)
+
+    def testWaitFirstCompleted(self):
+        self._release(1)
+
+        done, not_done = grpc.wait(
+            self._response_futures,
+            return_when=grpc.FutureWaitCondition.FIRST_COMPLETED)
+
+        self.assertEqual(set((self._response_futures[1],)), done)
+        self.assertEqual(len(self._response_futures) - 1, len(not_done))
+
+    def testWaitFirstException(self):
+        self._release(0)
+        self._release(_FAILING_RPC)
+
+        done, not_done = grpc.wait(
+            self._response_futures,
+            return_when=grpc.FutureWaitCondition.FIRST_EXCEPTION)
+
+        self.assertIn(self._response_futures[_FAILING_RPC], done)
+        self.assertIs(grpc.StatusCode.INVALID_ARGUMENT,
+                      self._response_futures[_FAILING_RPC].code())
+        self.assertEqual(set(self._response_futures), done.union(not_done))
+
+    def testWaitTimeout(self):
+        self._release(3)
+
+        done, not_done = grpc.wait(
+            self._response_futures, timeout=_SHORT_TIMEOUT)
+
+        self.assertEqual(set((self._response_futures[3],)), done)
+        self.assertEqual(set(self._response_futures[:3]), not_done)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
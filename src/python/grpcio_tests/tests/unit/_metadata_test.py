@@ -48,6 +48,7 @@ _UNARY_UNARY = '/test/UnaryUnary'
 _UNARY_STREAM = '/test/UnaryStream'
 _STREAM_UNARY = '/test/StreamUnary'
 _STREAM_STREAM = '/test/StreamStream'
+_PRECOMPILED_UNARY_UNARY = '/test/PrecompiledUnaryUnary'
 
 _CLIENT_METADATA = (('client-md-key', 'client-md-key'),
                     ('client-md-key-bin', b'\x00\x01'))
@@ -60,6 +61,12 @@ _SERVER_TRAILING_METADATA = (
     ('server-trailing-md-key', 'server-trailing-md-value'),
     ('server-trailing-md-key-bin', b'\x00\x03'))
 
+_PRECOMPILED_CLIENT_METADATA = grpc.precompiled_metadata(_CLIENT_METADATA)
+_PRECOMPILED_SERVER_INITIAL_METADATA = grpc.precompiled_metadata(
+    _SERVER_INITIAL_METADATA)
+_PRECOMPILED_SERVER_TRAILING_METADATA = grpc.precompiled_metadata(
+    _SERVER_TRAILING_METADATA)
+
 
 def user_agent(metadata):
     for key, val in metadata:
@@ -78,6 +85,14 @@ def validate_client_metadata(test, servicer_context):
     test.assertTrue(
         user_agent(servicer_context.invocation_metadata())
         .endswith('secondary-agent'))
+    test.assertIs(servicer_context.invocation_metadata(),
+                  servicer_context.invocation_metadata())
+    invocation_metadata_dict = servicer_context.invocation_metadata_dict()
+    for key, value in _CLIENT_METADATA:
+        test.assertEqual(value, invocation_metadata_dict[key])
+    test.assertEqual(
+        user_agent(servicer_context.invocation_metadata()),
+        invocation_metadata_dict['user-agent'])
 
 
 def handle_unary_unary(test, request, servicer_context):
@@ -87,6 +102,14 @@ def handle_unary_unary(test, request, servicer_context):
     return _RESPONSE
 
 
+def handle_precompiled_unary_unary(test, request, servicer_context):
+    validate_client_metadata(test, servicer_context)
+    servicer_context.send_initial_metadata(_PRECOMPILED_SERVER_INITIAL_METADATA)
+    servicer_context.set_trailing_metadata(
+        _PRECOMPILED_SERVER_TRAILING_METADATA)
+    return _RESPONSE
+
+
 def handle_unary_stream(test, request, servicer_context):
     validate_client_metadata(test, servicer_context)
     servicer_context.send_initial_metadata(_SERVER_INITIAL_METADATA)
@@ -150,6 +173,10 @@ class _GenericHandler(grpc.GenericRpcHandler):
             return _MethodHandler(self._test, True, False)
         elif handler_call_details.method == _STREAM_STREAM:
             return _MethodHandler(self._test, True, True)
+        elif handler_call_details.method == _PRECOMPILED_UNARY_UNARY:
+            test = self._test
+            return grpc.unary_unary_rpc_method_handler(
+                lambda x, y: handle_precompiled_unary_unary(test, x, y))
         else:
             return None
 
@@ -179,6 +206,19 @@ class MetadataTest(unittest.TestCase):
             test_common.metadata_transmitted(_SERVER_TRAILING_METADATA,
                                              call.trailing_metadata()))
 
+    def testPrecompiledMetadata(self):
+        multi_callable = self._channel.unary_unary(_PRECOMPILED_UNARY_UNARY)
+        self.assertEqual(_CLIENT_METADATA, tuple(_PRECOMPILED_CLIENT_METADATA))
+        for _ in range(test_constants.STREAM_LENGTH):
+            unused_response, call = multi_callable.with_call(
+                _REQUEST, metadata=_PRECOMPILED_CLIENT_METADATA)
+            self.assertTrue(
+                test_common.metadata_transmitted(_SERVER_INITIAL_METADATA,
+                                                 call.initial_metadata()))
+            self.assertTrue(
+                test_common.metadata_transmitted(_SERVER_TRAILING_METADATA,
+                                                 call.trailing_metadata()))
+
     def testUnaryStream(self):
         multi_callable = self._channel.unary_stream(_UNARY_STREAM)
         call = multi_callable(_REQUEST, metadata=_CLIENT_METADATA)
@@ -0,0 +1,133 @@
+# Copyright 2017, Google Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#     * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+#     * Neither the name of Google Inc. nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Tests forwarding messages between RPCs as raw frames."""
+
+import unittest
+
+from concurrent import futures
+import grpc
+
+from tests.unit.framework.common import test_constants
+
+_REQUEST = b'\x00\x01\x02' * 1024
+_LARGE_REQUEST = b'\x03' * (1024 * 1024)
+
+_UNARY_UNARY = '/test/UnaryUnary'
+_STREAM_STREAM = '/test/StreamStream'
+
+
+def _handle_unary_unary(request, unused_servicer_context):
+    return request[::-1]
+
+
+def _handle_stream_stream(request_iterator, unused_servicer_context):
+    for request in request_iterator:
+        yield request[::-1]
+
+
+class _Proxy(object):
+    """Forwards RPCs to a backend without deserializing their messages."""
+
+    def __init__(self, channel):
+        self.frame_types = set()
+        self._unary_unary = channel.unary_unary(
+            _UNARY_UNARY, response_deserializer=grpc.raw_frame_deserializer)
+        self._stream_stream = channel.stream_stream(
+            _STREAM_STREAM, response_deserializer=grpc.raw_frame_deserializer)
+
+    def _record(self, raw_frame):
+        self.frame_types.add(type(raw_frame))
+        return raw_frame
+
+    def unary_unary(self, request, unused_servicer_context):
+        return self._record(self._unary_unary(self._record(request)))
+
+    def stream_stream(self, request_iterator, unused_servicer_context):
+        for response in self._stream_stream(
+                self._record(request) for request in request_iterator):
+            yield self._record(response)
+
+
+def _start_server(handlers):
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=test_constants.POOL_SIZE),
+        handlers=(grpc.method_handlers_generic_handler('test', handlers),))
+    port = server.add_insecure_port('[::]:0')
+    server.start()
+    return server, grpc.insecure_channel('localhost:{}'.format(port))
+
+
+class RawFrameTest(unittest.TestCase):
+
+    def setUp(self):
+        self._backend, backend_channel = _start_server({
+            'UnaryUnary':
+            grpc.unary_unary_rpc_method_handler(_handle_unary_unary),
+            'StreamStream':
+            grpc.stream_stream_rpc_method_handler(_handle_stream_stream),
+        })
+        self._proxy = _Proxy(backend_channel)
+        self._proxy_server, self._channel = _start_server({
+            'UnaryUnary':
+            grpc.unary_unary_rpc_method_handler(
+                self._proxy.unary_unary,
+                request_deserializer=grpc.raw_frame_deserializer),
+            'StreamStream':
+            grpc.stream_stream_rpc_method_handler(
+                self._proxy.stream_stream,
+                request_deserializer=grpc.raw_frame_deserializer),
+        })
+
+    def tearDown(self):
+        self._proxy_server.stop(None)
+        self._backend.stop(None)
+
+    def testUnaryUnary(self):
+        multi_callable = self._channel.unary_unary(_UNARY_UNARY)
+        for request in (_REQUEST, _LARGE_REQUEST, b'',):
+            self.assertEqual(request[::-1], multi_callable(request))
+        self.assertNotIn(bytes, self._proxy.frame_types)
+
+    def testStreamStream(self):
+        multi_callable = self._channel.stream_stream(_STREAM_STREAM)
+        requests = [_REQUEST] * test_constants.STREAM_LENGTH
+        self.assertSequenceEqual([request[::-1] for request in requests],
+                                 list(multi_callable(iter(requests))))
+        self.assertNotIn(bytes, self._proxy.frame_types)
+
+    def testRawFrameContents(self):
+        multi_callable = self._channel.unary_unary(
+            _UNARY_UNARY, response_deserializer=grpc.raw_frame_deserializer)
+        raw_frame = multi_callable(_REQUEST)
+        self.assertEqual(len(_REQUEST), len(raw_frame))
+        self.assertEqual(_REQUEST[::-1], bytes(raw_frame))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,433 @@
+# Copyright 2017, Google Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#     * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+#     * Neither the name of Google Inc. nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Tests of grpc._server.Server configuration options."""
+
+import threading
+import unittest
+
+from concurrent import futures
+import grpc
+from grpc import _common
+from grpc._cython import cygrpc
+
+from tests.unit import _thread_pool
+from tests.unit.framework.common import test_constants
+
+_REQUEST = b'\x00\x00\x00'
+_RESPONSE = b'\x00\x00\x00'
+
+_UNARY_UNARY = '/test/UnaryUnary'
+_STREAM_STREAM = '/test/StreamStream'
+_INLINE = '/test/Inline'
+_INLINE_FAILURE = '/test/InlineFailure'
+_WINDOWED_UNARY_STREAM = '/test/WindowedUnaryStream'
+_WINDOWED_STREAM_STREAM = '/test/WindowedStreamStream'
+_ENDLESS_UNARY_STREAM = '/test/EndlessUnaryStream'
+
+_WRITE_WINDOW = 8
+
+
+def _handle_unary_unary(request, unused_servicer_context):
+    return _RESPONSE
+
+
+def _handle_stream_stream(request_iterator, unused_servicer_context):
+    for request in request_iterator:
+        yield _RESPONSE
+
+
+def _handle_unary_stream(request, unused_servicer_context):
+    for _ in range(test_constants.STREAM_LENGTH):
+        yield _RESPONSE
+
+
+def _handle_endless_unary_stream(request, servicer_context):
+    while servicer_context.is_active():
+        yield _RESPONSE
+
+
+def _handle_inline_failure(request, unused_servicer_context):
+    raise ValueError('Inline failure!')
+
+
+def _generic_handler():
+    return grpc.method_handlers_generic_handler('test', {
+        'UnaryUnary':
+        grpc.unary_unary_rpc_method_handler(_handle_unary_unary),
+        'StreamStream':
+        grpc.stream_stream_rpc_method_handler(_handle_stream_stream),
+        'Inline':
+        grpc.unary_unary_rpc_method_handler(_handle_unary_unary, inline=True),
+        'InlineFailure':
+        grpc.unary_unary_rpc_method_handler(
+            _handle_inline_failure, inline=True),
+        'WindowedUnaryStream':
+        grpc.unary_stream_rpc_method_handler(
+            _handle_unary_stream, write_window=_WRITE_WINDOW),
+        'WindowedStreamStream':
+        grpc.stream_stream_rpc_method_handler(
+            _handle_stream_stream, write_window=_WRITE_WINDOW),
+        'EndlessUnaryStream':
+        grpc.unary_stream_rpc_method_handler(
+            _handle_endless_unary_stream, write_window=_WRITE_WINDOW),
+    })
+
+
+class _DynamicHandler(grpc.GenericRpcHandler):
+
+    def __init__(self, method, response):
+        self._method = method
+        self._response = response
+
+    def service(self, handler_call_details):
+        if handler_call_details.method == self._method:
+            return grpc.unary_unary_rpc_method_handler(
+                lambda request, unused_context: self._response)
+        else:
+            return None
+
+
+class _ServicedHandler(grpc.GenericRpcHandler):
+
+    def __init__(self, method):
+        self._method = method
+        self.serviced = threading.Event()
+
+    def service(self, handler_call_details):
+        if handler_call_details.method == self._method:
+            self.serviced.set()
+            return grpc.unary_unary_rpc_method_handler(_handle_unary_unary)
+        else:
+            return None
+
+
+def _start_server(**kwargs):
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=test_constants.POOL_SIZE),
+        handlers=(_generic_handler(),),
+        **kwargs)
+    port = server.add_insecure_port('[::]:0')
+    server.start()
+    return server, grpc.insecure_channel('localhost:{}'.format(port))
+
+
+class PendingRequestCallsTest(unittest.TestCase):
+
+    def setUp(self):
+        self._server, self._channel = _start_server(pending_request_calls=8)
+
+    def tearDown(self):
+        self._server.stop(None)
+
+    def testConcurrentUnaryUnary(self):
+        multi_callable = self._channel.unary_unary(_UNARY_UNARY)
+        response_futures = [
+            multi_callable.future(_REQUEST)
+            for _ in range(test_constants.RPC_CONCURRENCY)
+        ]
+        for response_future in response_futures:
+            self.assertEqual(_RESPONSE, response_future.result())
+
+    def testStopWithOutstandingRequestCalls(self):
+        self._server.stop(None)
+        multi_callable = self._channel.unary_unary(_UNARY_UNARY)
+        with self.assertRaises(grpc.RpcError):
+            multi_callable(_REQUEST)
+
+    def testInvalidPendingRequestCalls(self):
+        with self.assertRaises(ValueError):
+            grpc.server(
+                futures.ThreadPoolExecutor(max_workers=1),
+                pending_request_calls=0)
+
+
+class CompletionQueueCountTest(unittest.TestCase):
+
+    def setUp(self):
+        self._server, self._channel = _start_server(
+            pending_request_calls=2, completion_queue_count=4)
+
+    def tearDown(self):
+        self._server.stop(None)
+
+    def testConcurrentUnaryUnary(self):
+        multi_callable = self._channel.unary_unary(_UNARY_UNARY)
+        response_futures = [
+            multi_callable.future(_REQUEST)
+            for _ in range(test_constants.RPC_CONCURRENCY)
+        ]
+        for response_future in response_futures:
+            self.assertEqual(_RESPONSE, response_future.result())
+
+    def testConcurrentStreamStream(self):
+        multi_callable = self._channel.stream_stream(_STREAM_STREAM)
+        response_iterators = [
+            multi_callable(iter([_REQUEST] * test_constants.STREAM_LENGTH))
+            for _ in range(test_constants.THREAD_CONCURRENCY)
+        ]
+        for response_iterator in response_iterators:
+            self.assertSequenceEqual([_RESPONSE] * test_constants.STREAM_LENGTH,
+                                     list(response_iterator))
+
+    def testGracefulStop(self):
+        multi_callable = self._channel.unary_unary(_UNARY_UNARY)
+        self.assertEqual(_RESPONSE, multi_callable(_REQUEST))
+        self.assertTrue(
+            self._server.stop(test_constants.SHORT_TIMEOUT).wait(
+                test_constants.TIME_ALLOWANCE))
+
+    def testInvalidCompletionQueueCount(self):
+        with self.assertRaises(ValueError):
+            grpc.server(
+                futures.ThreadPoolExecutor(max_workers=1),
+                completion_queue_count=0)
+
+
+class UnaryRequestTest(unittest.TestCase):
+
+    def testPoolThreadsDoNotWaitForRequests(self):
+        stalled_handler = _ServicedHandler('/test/Stalled')
+        server = grpc.server(
+            futures.ThreadPoolExecutor(max_workers=1),
+            handlers=(stalled_handler, _generic_handler(),))
+        port = server.add_insecure_port('[::]:0')
+        server.start()
+        target = 'localhost:{}'.format(port)
+
+        # Start an RPC that never sends its request message.
+        stalled_channel = cygrpc.Channel(
+            _common.encode(target), _common.channel_args(()), None)
+        completion_queue = cygrpc.CompletionQueue()
+        stalled_call = stalled_channel.create_call(
+            None, 0, completion_queue, b'/test/Stalled', None,
+            cygrpc.Timespec(float('+inf')))
+        stalled_call.start_client_batch(
+            cygrpc.Operations((cygrpc.operation_send_initial_metadata(
+                _common.EMPTY_METADATA, 0),)), None)
+        self.assertTrue(
+            stalled_handler.serviced.wait(test_constants.TIME_ALLOWANCE))
+
+        # The server's only pool thread must remain free to service other RPCs.
+        channel = grpc.insecure_channel(target)
+        response = channel.unary_unary(_UNARY_UNARY)(
+            _REQUEST, timeout=test_constants.SHORT_TIMEOUT)
+        self.assertEqual(_RESPONSE, response)
+
+        stalled_call.cancel()
+        completion_queue.poll()
+        server.stop(None)
+
+    def testThreadPoolRejection(self):
+        thread_pool = futures.ThreadPoolExecutor(max_workers=1)
+        server = grpc.server(
+            thread_pool,
+            handlers=(_generic_handler(),),
+            maximum_concurrent_rpcs=1)
+        port = server.add_insecure_port('[::]:0')
+        server.start()
+        thread_pool.shutdown()
+        channel = grpc.insecure_channel('localhost:{}'.format(port))
+        # Rejected RPCs must not keep counting against the concurrency limit.
+        for _ in range(2):
+            with self.assertRaises(grpc.RpcError) as exception_context:
+                channel.unary_unary(_UNARY_UNARY)(
+                    _REQUEST, timeout=test_constants.SHORT_TIMEOUT)
+            self.assertIs(grpc.StatusCode.UNAVAILABLE,
+                          exception_context.exception.code())
+        self.assertTrue(server.stop(None).wait(test_constants.TIME_ALLOWANCE))
+
+    def testMissingRequest(self):
+        server, channel = _start_server()
+        multi_callable = channel.stream_unary(_UNARY_UNARY)
+        with self.assertRaises(grpc.RpcError) as exception_context:
+            multi_callable(iter(()))
+        self.assertIs(grpc.StatusCode.UNIMPLEMENTED,
+                      exception_context.exception.code())
+        server.stop(None)
+
+
+class InlineHandlerTest(unittest.TestCase):
+
+    def setUp(self):
+        self._thread_pool = _thread_pool.RecordingThreadPool(
+            max_workers=test_constants.POOL_SIZE)
+        self._server = grpc.server(
+            self._thread_pool, handlers=(_generic_handler(),))
+        port = self._server.add_insecure_port('[::]:0')
+        self._server.start()
+        self._channel = grpc.insecure_channel('localhost:{}'.format(port))
+
+    def tearDown(self):
+        self._server.stop(None)
+
+    def testInlineUnaryUnary(self):
+        multi_callable = self._channel.unary_unary(_INLINE)
+        for _ in range(test_constants.STREAM_LENGTH):
+            self.assertEqual(_RESPONSE, multi_callable(_REQUEST))
+        self.assertFalse(self._thread_pool.was_used())
+
+    def testConcurrentInlineUnaryUnary(self):
+        multi_callable = self._channel.unary_unary(_INLINE)
+        response_futures = [
+            multi_callable.future(_REQUEST)
+            for _ in range(test_constants.RPC_CONCURRENCY)
+        ]
+        for response_future in response_futures:
+            self.assertEqual(_RESPONSE, response_future.result())
+        self.assertFalse(self._thread_pool.was_used())
+
+    def testInlineFailure(self):
+        multi_callable = self._channel.unary_unary(_INLINE_FAILURE)
+        with self.assertRaises(grpc.RpcError) as exception_context:
+            multi_callable(_REQUEST)
+        self.assertIs(grpc.StatusCode.UNKNOWN,
+                      exception_context.exception.code())
+        self.assertFalse(self._thread_pool.was_used())
+
+    def testInlineWithMaximumConcurrentRpcs(self):
+        server = grpc.server(
+            futures.ThreadPoolExecutor(max_workers=1),
+            handlers=(_generic_handler(),),
+            maximum_concurrent_rpcs=1)
+        port = server.add_insecure_port('[::]:0')
+        server.start()
+        channel = grpc.insecure_channel('localhost:{}'.format(port))
+        multi_callable = channel.unary_unary(_INLINE)
+        for _ in range(test_constants.STREAM_LENGTH):
+            self.assertEqual(_RESPONSE, multi_callable(_REQUEST))
+        server.stop(None)
+
+
+class WriteWindowTest(unittest.TestCase):
+
+    def setUp(self):
+        self._server, self._channel = _start_server()
+
+    def tearDown(self):
+        self._server.stop(None)
+
+    def testUnaryStream(self):
+        multi_callable = self._channel.unary_stream(_WINDOWED_UNARY_STREAM)
+        self.assertSequenceEqual([_RESPONSE] * test_constants.STREAM_LENGTH,
+                                 list(multi_callable(_REQUEST)))
+
+    def testStreamStream(self):
+        multi_callable = self._channel.stream_stream(_WINDOWED_STREAM_STREAM)
+        response_iterator = multi_callable(
+            iter([_REQUEST] * test_constants.STREAM_LENGTH))
+        self.assertSequenceEqual([_RESPONSE] * test_constants.STREAM_LENGTH,
+                                 list(response_iterator))
+
+    def testConcurrentUnaryStream(self):
+        multi_callable = self._channel.unary_stream(_WINDOWED_UNARY_STREAM)
+        response_iterators = [
+            multi_callable(_REQUEST)
+            for _ in range(test_constants.THREAD_CONCURRENCY)
+        ]
+        for response_iterator in response_iterators:
+            self.assertSequenceEqual([_RESPONSE] * test_constants.STREAM_LENGTH,
+                                     list(response_iterator))
+
+    def testCancelledEndlessUnaryStream(self):
+        multi_callable = self._channel.unary_stream(_ENDLESS_UNARY_STREAM)
+        response_iterator = multi_callable(_REQUEST)
+        for _ in range(test_constants.STREAM_LENGTH):
+            self.assertEqual(_RESPONSE, next(response_iterator))
+        response_iterator.cancel()
+        with self.assertRaises(grpc.RpcError) as exception_context:
+            list(response_iterator)
+        self.assertIs(grpc.StatusCode.CANCELLED,
+                      exception_context.exception.code())
+        # The server's handler must be released by the cancellation.
+        self.assertTrue(
+            self._server.stop(test_constants.SHORT_TIMEOUT).wait(
+                test_constants.TIME_ALLOWANCE))
+
+    def testInvalidWriteWindow(self):
+        with self.assertRaises(ValueError):
+            grpc.unary_stream_rpc_method_handler(
+                _handle_unary_stream, write_window=0)
+
+
+class MethodDispatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self._server = grpc.server(
+            futures.ThreadPoolExecutor(max_workers=test_constants.POOL_SIZE))
+        port = self._server.add_insecure_port('[::]:0')
+        self._channel = grpc.insecure_channel('localhost:{}'.format(port))
+
+    def tearDown(self):
+        self._server.stop(None)
+
+    def testDictionaryHandlerPrecedesDynamicHandler(self):
+        self._server.add_generic_rpc_handlers(
+            (_generic_handler(), _DynamicHandler(_UNARY_UNARY, b'dynamic'),))
+        self._server.start()
+        self.assertEqual(_RESPONSE,
+                         self._channel.unary_unary(_UNARY_UNARY)(_REQUEST))
+
+    def testDynamicHandlerPrecedesDictionaryHandler(self):
+        self._server.add_generic_rpc_handlers(
+            (_DynamicHandler(_UNARY_UNARY, b'dynamic'),))
+        self._server.add_generic_rpc_handlers((_generic_handler(),))
+        self._server.start()
+        self.assertEqual(b'dynamic',
+                         self._channel.unary_unary(_UNARY_UNARY)(_REQUEST))
+
+    def testFirstDictionaryHandlerPrecedesLaterDictionaryHandler(self):
+        later_handler = grpc.method_handlers_generic_handler('test', {
+            'UnaryUnary':
+            grpc.unary_unary_rpc_method_handler(
+                lambda request, unused_context: b'later')
+        })
+        self._server.add_generic_rpc_handlers(
+            (_generic_handler(), later_handler,))
+        self._server.start()
+        self.assertEqual(_RESPONSE,
+                         self._channel.unary_unary(_UNARY_UNARY)(_REQUEST))
+
+    def testFallBackToDynamicHandler(self):
+        self._server.add_generic_rpc_handlers(
+            (_generic_handler(), _DynamicHandler('/test/Dynamic', b'dynamic'),))
+        self._server.start()
+        self.assertEqual(b'dynamic',
+                         self._channel.unary_unary('/test/Dynamic')(_REQUEST))
+
+    def testUnknownMethod(self):
+        self._server.add_generic_rpc_handlers((_generic_handler(),))
+        self._server.start()
+        with self.assertRaises(grpc.RpcError) as exception_context:
+            self._channel.unary_unary('/test/Unknown')(_REQUEST)
+        self.assertIs(grpc.StatusCode.UNIMPLEMENTED,
+                      exception_context.exception.code())
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,206 @@
+# Copyright 2017, Google Inc.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#     * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+#     * Neither the name of Google Inc. nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Tests of RPCs conducted with gRPC Python's asyncio API."""
+
+import threading
+import unittest
+
+import six
+
+import grpc
+
+if six.PY3:
+    import asyncio
+    from grpc import aio
+
+_REQUEST = b'\x00\x00\x00'
+_RESPONSE = b'\x00\x00\x01'
+_STREAM_LENGTH = 7
+_CONCURRENT_RPC_COUNT = 200
+
+_UNARY_UNARY = '/test/UnaryUnary'
+_UNARY_STREAM = '/test/UnaryStream'
+_STREAM_UNARY = '/test/StreamUnary'
+_STREAM_STREAM = '/test/StreamStream'
+_FAILING = '/test/Failing'
+
+
+class _AsynchronousResponses(object):
+
+    def __init__(self, loop, count):
+        self._loop = loop
+        self._remaining = count
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        future = self._loop.create_future()
+        if self._remaining:
+            self._remaining -= 1
+            future.set_result(_RESPONSE)
+        else:
+            future.set_exception(StopAsyncIteration())
+        return future
+
+
+def _count_requests(loop, request_iterator):
+    count = loop.create_future()
+    requests = []
+
+    def on_request(request):
+        if request.cancelled() or request.exception() is not None:
+            count.set_result(len(requests))
+        else:
+            requests.append(request.result())
+            request_iterator.__anext__().add_done_callback(on_request)
+
+    request_iterator.__anext__().add_done_callback(on_request)
+    return count
+
+
+def _fail(unused_request, unused_servicer_context):
+    raise ValueError('Intentional failure!')
+
+
+class _GenericHandler(grpc.GenericRpcHandler):
+
+    def __init__(self, loop):
+        self._loop = loop
+
+    def _unary_stream(self, unused_request, unused_servicer_context):
+        return _AsynchronousResponses(self._loop, _STREAM_LENGTH)
+
+    def _stream_unary(self, request_iterator, unused_servicer_context):
+        return _count_requests(self._loop, request_iterator)
+
+    def service(self, handler_call_details):
+        if handler_call_details.method == _UNARY_UNARY:
+            return grpc.unary_unary_rpc_method_handler(
+                lambda request, context: asyncio.sleep(0.01, result=request))
+        elif handler_call_details.method == _UNARY_STREAM:
+            return grpc.unary_stream_rpc_method_handler(self._unary_stream)
+        elif handler_call_details.method == _STREAM_UNARY:
+            return grpc.stream_unary_rpc_method_handler(self._stream_unary)
+        elif handler_call_details.method == _STREAM_STREAM:
+            return grpc.stream_stream_rpc_method_handler(
+                lambda request_iterator, context: request_iterator)
+        elif handler_call_details.method == _FAILING:
+            return grpc.unary_unary_rpc_method_handler(_fail)
+        else:
+            return None
+
+
+def _responses(loop, response_iterator):
+    responses = []
+    while True:
+        try:
+            responses.append(
+                loop.run_until_complete(response_iterator.__anext__()))
+        except StopAsyncIteration:
+            return responses
+
+
+@unittest.skipIf(six.PY2, 'asyncio requires Python 3')
+class AioRpcTest(unittest.TestCase):
+
+    def setUp(self):
+        self._loop = asyncio.new_event_loop()
+        self._server = aio.server(
+            handlers=(_GenericHandler(self._loop),), loop=self._loop)
+        port = self._server.add_insecure_port('[::]:0')
+        self._server.start()
+        self._channel = aio.insecure_channel(
+            'localhost:{}'.format(port), loop=self._loop)
+
+    def tearDown(self):
+        self._channel.close()
+        self._loop.run_until_complete(self._server.stop(None))
+        self._loop.close()
+
+    def testUnaryUnary(self):
+        call = self._channel.unary_unary(_UNARY_UNARY)(_REQUEST)
+        response = self._loop.run_until_complete(call)
+        self.assertEqual(_REQUEST, response)
+        self.assertIs(grpc.StatusCode.OK,
+                      self._loop.run_until_complete(call.code()))
+
+    def testUnaryStream(self):
+        call = self._channel.unary_stream(_UNARY_STREAM)(_REQUEST)
+        self.assertEqual([_RESPONSE] * _STREAM_LENGTH,
+                         _responses(self._loop, call))
+
+    def testStreamUnary(self):
+        call = self._channel.stream_unary(_STREAM_UNARY)(
+            iter([_REQUEST] * _STREAM_LENGTH))
+        self.assertEqual(_STREAM_LENGTH, self._loop.run_until_complete(call))
+
+    def testStreamStream(self):
+        requests = _AsynchronousResponses(self._loop, _STREAM_LENGTH)
+        call = self._channel.stream_stream(_STREAM_STREAM)(requests)
+        self.assertEqual([_RESPONSE] * _STREAM_LENGTH,
+                         _responses(self._loop, call))
+
+    def testUnimplemented(self):
+        call = self._channel.unary_unary('/test/Unimplemented')(_REQUEST)
+        with self.assertRaises(aio.AioRpcError) as exception_context:
+            self._loop.run_until_complete(call)
+        self.assertIs(grpc.StatusCode.UNIMPLEMENTED,
+                      exception_context.exception.code())
+
+    def testApplicationFailure(self):
+        call = self._channel.unary_unary(_FAILING)(_REQUEST)
+        with self.assertRaises(aio.AioRpcError) as exception_context:
+            self._loop.run_until_complete(call)
+        self.assertIs(grpc.StatusCode.UNKNOWN,
+                      exception_context.exception.code())
+
+    def testCancellation(self):
+        call = self._channel.unary_stream(_UNARY_STREAM)(_REQUEST)
+        self.assertTrue(call.cancel())
+        self.assertTrue(call.cancelled())
+        self.assertIs(grpc.StatusCode.CANCELLED,
+                      self._loop.run_until_complete(call.code()))
+
+    def testConcurrentRpcsWithoutThreads(self):
+        thread_count = threading.active_count()
+        multi_callable = self._channel.unary_stream(_UNARY_STREAM)
+        calls = tuple(
+            multi_callable(_REQUEST) for _ in range(_CONCURRENT_RPC_COUNT))
+        first_responses = self._loop.run_until_complete(
+            asyncio.gather(*(call.__anext__() for call in calls)))
+        self.assertEqual([_RESPONSE] * _CONCURRENT_RPC_COUNT, first_responses)
+        self.assertEqual(thread_count, threading.active_count())
+        for call in calls:
+            self.assertEqual([_RESPONSE] * (_STREAM_LENGTH - 1),
+                             _responses(self._loop, call))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)